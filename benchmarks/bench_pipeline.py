@@ -0,0 +1,287 @@
+"""
+Benchmark suite for the load -> summarize -> analyze pipeline.
+
+Every benchmark case runs a single pipeline stage several times on a synthetic
+dataset and reports throughput, latency percentiles and the peak resident set
+size of the process. Results are written as JSON, so runs made on different
+commits can be compared with `--compare`.
+
+Usage:
+    python -m benchmarks.bench_pipeline --scale 10k --repeat 5 --output bench_results/10k.json
+    python -m benchmarks.bench_pipeline --scale 10k --compare bench_results/10k.json
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.dataset import SCALES, generate_dataset
+from src.converter import CustomerConverter, OrderConverter, ProductConverter
+from src.file_service import CustomerJsonFileReader, OrderJsonFileReader, ProductJsonFileReader
+from src.model import CustomerDataDict, OrderDataDict, ProductDataDict
+from src.repository import (
+    CustomerDataRepository,
+    OrderDataRepository,
+    ProductDataRepository,
+    PurchaseSummaryRepository
+)
+from src.service import PurchasesSummaryService
+from src.validator import CustomerDataDictValidator, OrderDataDictValidator, ProductDataDictValidator
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    A single benchmarked pipeline stage.
+
+    Attributes:
+        name (str): The name of the case, used as a key in the JSON report.
+        func (Callable[[], Any]): The measured callable.
+        rows (int): The number of rows processed by one call of `func`.
+    """
+    name: str
+    func: Callable[[], Any]
+    rows: int
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Timings collected for a single benchmark case.
+
+    Attributes:
+        name (str): The name of the case.
+        rows (int): The number of rows processed by one call.
+        durations (list[float]): Duration of every repetition in seconds.
+        peak_rss_mb (float): Peak resident set size of the process after the case, in MiB.
+    """
+    name: str
+    rows: int
+    durations: list[float] = field(default_factory=list)
+    peak_rss_mb: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the result to a JSON serializable dictionary.
+
+        Returns:
+            dict[str, Any]: Latency percentiles, throughput and memory usage of the case.
+        """
+        median = percentile(self.durations, 50)
+        return {
+            "rows": self.rows,
+            "repeat": len(self.durations),
+            "min_s": min(self.durations),
+            "mean_s": sum(self.durations) / len(self.durations),
+            "p50_s": median,
+            "p90_s": percentile(self.durations, 90),
+            "p99_s": percentile(self.durations, 99),
+            "max_s": max(self.durations),
+            "rows_per_s": self.rows / median if median > 0 else float("inf"),
+            "peak_rss_mb": self.peak_rss_mb
+        }
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Compute a percentile using the nearest-rank method.
+
+    Args:
+        values (list[float]): The measured values.
+        pct (float): The percentile in the range [0, 100].
+
+    Returns:
+        float: The value at the requested percentile.
+    """
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def peak_rss_mb() -> float:
+    """
+    Return the peak resident set size of the current process in MiB.
+    """
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def run_case(case: BenchmarkCase, repeat: int) -> BenchmarkResult:
+    """
+    Run a benchmark case and collect its timings.
+
+    Args:
+        case (BenchmarkCase): The case to run.
+        repeat (int): The number of measured repetitions.
+
+    Returns:
+        BenchmarkResult: The collected timings.
+    """
+    result = BenchmarkResult(name=case.name, rows=case.rows)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.func()
+        result.durations.append(time.perf_counter() - start)
+    result.peak_rss_mb = peak_rss_mb()
+    return result
+
+
+def build_cases(paths: dict[str, str]) -> list[BenchmarkCase]:
+    """
+    Build the benchmark cases for a generated dataset.
+
+    Args:
+        paths (dict[str, str]): Paths of the products, customers and orders files.
+
+    Returns:
+        list[BenchmarkCase]: Cases covering reading, processing, summary build and analytics.
+    """
+    order_reader = OrderJsonFileReader()
+    product_repo = ProductDataRepository(
+        file_reader=ProductJsonFileReader(),
+        validator=ProductDataDictValidator(),
+        converter=ProductConverter(),
+        file_name=paths["products"]
+    )
+    customer_repo = CustomerDataRepository(
+        file_reader=CustomerJsonFileReader(),
+        validator=CustomerDataDictValidator(),
+        converter=CustomerConverter(),
+        file_name=paths["customers"]
+    )
+    order_repo = OrderDataRepository(
+        file_reader=order_reader,
+        validator=OrderDataDictValidator(),
+        converter=OrderConverter(),
+        file_name=paths["orders"]
+    )
+    summary_repo = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](
+        customer_repo=customer_repo,
+        product_repo=product_repo,
+        order_repo=order_repo
+    )
+    service = PurchasesSummaryService(repository=summary_repo, cache=None)
+    summary = summary_repo.purchase_summary()
+
+    orders = len(order_repo.get_data())
+    customers = len(summary)
+
+    def calculate_total_spent_all() -> None:
+        for purchases in summary.values():
+            service.calculate_total_spent(purchases)
+
+    return [
+        BenchmarkCase("file_reader.read", lambda: order_reader.read(paths["orders"]), orders),
+        BenchmarkCase("data_repository.process_data", lambda: order_repo._process_data(paths["orders"]), orders),
+        BenchmarkCase("purchase_summary.build", summary_repo._build_purchase_summary, orders),
+        BenchmarkCase("purchase_summary.build_by_id", summary_repo._build_summary_by_id, orders),
+        BenchmarkCase("service.calculate_avarage_spending_per_customer",
+                      service.calculate_avarage_spending_per_customer, customers),
+        BenchmarkCase("service.find_most_popular_products", service.find_most_popular_products, customers),
+        BenchmarkCase("service.find_highest_and_lowest_spenders",
+                      service.find_highest_and_lowest_spenders, customers),
+        BenchmarkCase("service.calculate_total_spent", calculate_total_spent_all, customers)
+    ]
+
+
+def git_commit() -> str | None:
+    """
+    Return the current git commit hash, or None when it cannot be determined.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """
+    Compare a report against a baseline report.
+
+    Args:
+        current (dict[str, Any]): The current report.
+        baseline (dict[str, Any]): The baseline report.
+        threshold (float): Allowed relative slowdown of the median latency, e.g. 0.1 for 10%.
+
+    Returns:
+        list[str]: Descriptions of the cases which regressed beyond the threshold.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["p50_s"] / base["p50_s"] if base["p50_s"] > 0 else 1.0
+        print(f"{name:<50} {base['p50_s']:>10.4f}s -> {result['p50_s']:>10.4f}s ({ratio - 1:+.1%})")
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {ratio - 1:+.1%}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the benchmark suite from the command line.
+
+    Args:
+        argv (list[str] | None): Command line arguments, defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: The process exit code, 1 when a regression against the baseline is detected.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES.keys(), default="10k", help="Number of orders to generate.")
+    parser.add_argument("--repeat", type=int, default=5, help="Measured repetitions of every case.")
+    parser.add_argument("--data-dir", default="bench_data", help="Directory for the generated datasets.")
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative slowdown.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    paths = generate_dataset(os.path.join(args.data_dir, args.scale), SCALES[args.scale])
+
+    results = {}
+    for case in build_cases(paths):
+        result = run_case(case, args.repeat).to_dict()
+        results[case.name] = result
+        print(f"{case.name:<50} p50={result['p50_s']:.4f}s p99={result['p99_s']:.4f}s "
+              f"{result['rows_per_s']:>14,.0f} rows/s rss={result['peak_rss_mb']:.1f}MiB")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        },
+        "results": results
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=4)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            regressions = compare(report, json.load(file), args.threshold)
+        if regressions:
+            print("Regressions detected:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Synthetic dataset used by the benchmark suite.
+
+The files are produced by `src.data_generator`, so they follow the
+`ProductDataDict`, `CustomerDataDict` and `OrderDataDict` layouts and can be
+loaded by the regular repositories.
+"""
+import os
+
+from src.data_generator import DatasetConfig, write_dataset
+
+SCALES: dict[str, int] = {
+    "10k": 10_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+
+def dataset_config(orders: int, seed: int = 42) -> DatasetConfig:
+    """
+    Build the dataset configuration for a given number of orders.
+
+    Args:
+        orders (int): The number of orders to generate.
+        seed (int): The seed of the random number generator.
+
+    Returns:
+        DatasetConfig: A configuration with one product per 100 orders and one customer per 10 orders.
+    """
+    return DatasetConfig(
+        products=max(10, orders // 100),
+        customers=max(10, orders // 10),
+        orders=orders,
+        seed=seed
+    )
+
+
+def generate_dataset(directory: str, orders: int, seed: int = 42) -> dict[str, str]:
+    """
+    Write products, customers and orders JSON files into a directory.
+
+    A dataset which already exists in the directory is reused, so repeated
+    benchmark runs on the same scale do not pay for data generation again.
+
+    Args:
+        directory (str): The directory where the files are written.
+        orders (int): The number of orders to generate.
+        seed (int): The seed of the random number generator.
+
+    Returns:
+        dict[str, str]: A mapping of dataset name ("products", "customers", "orders") to file path.
+    """
+    paths = {name: os.path.join(directory, f"{name}.json") for name in ("products", "customers", "orders")}
+    if all(os.path.exists(path) for path in paths.values()):
+        return paths
+    return write_dataset(directory, dataset_config(orders, seed))
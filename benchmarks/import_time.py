@@ -0,0 +1,97 @@
+"""
+Import-time benchmark with a budget.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters, reports the
+median cumulative import time of the module and its slowest dependencies, and fails
+when the median exceeds the budget or when a module which must be imported lazily
+was loaded.
+
+Usage:
+    python -m benchmarks.import_time --module src.service --budget-ms 150
+"""
+from dataclasses import dataclass
+import argparse
+import statistics
+import subprocess
+import sys
+
+LAZY_MODULES = ("email_validator", "concurrent.futures.process", "socket")
+
+
+@dataclass
+class ImportTiming:
+    """
+    Import time of a single module as reported by `-X importtime`.
+
+    Attributes:
+        module (str): The name of the module.
+        self_us (int): Time spent in the module itself, in microseconds.
+        cumulative_us (int): Time including the imports of the module, in microseconds.
+    """
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def measure_import(module: str) -> list[ImportTiming]:
+    """
+    Import a module in a fresh interpreter and collect the `-X importtime` report.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        list[ImportTiming]: The timing of every imported module.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    timings = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        timings.append(ImportTiming(name.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the import-time benchmark from the command line.
+
+    Args:
+        argv (list[str] | None): Command line arguments, defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: The process exit code, 1 when the budget is exceeded or a lazy module was imported.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="src.service", help="The module to import.")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Allowed median import time.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of fresh interpreters.")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest modules to report.")
+    args = parser.parse_args(argv)
+
+    runs = [measure_import(args.module) for _ in range(args.repeat)]
+    totals = [next(timing.cumulative_us for timing in run if timing.module == args.module) for run in runs]
+    median_ms = statistics.median(totals) / 1000
+
+    print(f"import {args.module}: median {median_ms:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    for timing in sorted(runs[-1], key=lambda timing: timing.self_us, reverse=True)[:args.top]:
+        print(f"  {timing.module:<40} self {timing.self_us / 1000:>7.1f} ms  "
+              f"cumulative {timing.cumulative_us / 1000:>7.1f} ms")
+
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f"median import time {median_ms:.1f} ms exceeds the budget of {args.budget_ms:.1f} ms")
+    imported = {timing.module for timing in runs[-1]}
+    failures.extend(f"{module} must be imported lazily" for module in LAZY_MODULES if module in imported)
+    if failures:
+        print("Import budget failed:\n  " + "\n  ".join(failures))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Memory report of loaded repositories with and without shared values.
+
+Loads the customers, products and orders of a synthetic dataset twice, once with
+plain converters and once with interned strings and pooled discounts, and reports
+the memory retained by every repository as measured by `tracemalloc`.
+
+Usage:
+    python -m benchmarks.memory_report --scale 1m
+"""
+from typing import Any, Callable
+import argparse
+import gc
+import logging
+import os
+import tracemalloc
+
+from benchmarks.dataset import SCALES, generate_dataset
+from src.converter import CustomerConverter, OrderConverter, ProductConverter
+from src.file_service import CustomerJsonFileReader, OrderJsonFileReader, ProductJsonFileReader
+from src.repository import CustomerDataRepository, DataRepository, OrderDataRepository, ProductDataRepository
+from src.validator import CustomerDataDictValidator, OrderDataDictValidator, ProductDataDictValidator
+
+
+def retained_bytes(load: Callable[[], DataRepository[Any, Any]]) -> tuple[DataRepository[Any, Any], int]:
+    """
+    Load a repository and measure the memory it retains.
+
+    Args:
+        load (Callable[[], DataRepository]): Creates and loads the repository.
+
+    Returns:
+        tuple[DataRepository, int]: The repository, kept alive by the caller, and the retained bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        repository = load()
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return repository, retained
+
+
+def measure_repositories(paths: dict[str, str], shared: bool) -> dict[str, int]:
+    """
+    Measure the memory retained by the customer, product and order repositories.
+
+    Args:
+        paths (dict[str, str]): Paths of the products, customers and orders files.
+        shared (bool): If True, intern strings and pool discounts during conversion.
+
+    Returns:
+        dict[str, int]: Retained bytes by repository name.
+    """
+    loaders: dict[str, Callable[[], DataRepository[Any, Any]]] = {
+        "customers": lambda: CustomerDataRepository(
+            file_reader=CustomerJsonFileReader(),
+            validator=CustomerDataDictValidator(),
+            converter=CustomerConverter(intern_strings=shared),
+            file_name=paths["customers"]
+        ),
+        "products": lambda: ProductDataRepository(
+            file_reader=ProductJsonFileReader(),
+            validator=ProductDataDictValidator(),
+            converter=ProductConverter(intern_strings=shared),
+            file_name=paths["products"]
+        ),
+        "orders": lambda: OrderDataRepository(
+            file_reader=OrderJsonFileReader(),
+            validator=OrderDataDictValidator(),
+            converter=OrderConverter(pool_values=shared),
+            file_name=paths["orders"]
+        )
+    }
+    repositories = []
+    report = {}
+    for name, load in loaders.items():
+        repository, report[name] = retained_bytes(load)
+        repositories.append(repository)
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Print the memory report from the command line.
+
+    Args:
+        argv (list[str] | None): Command line arguments, defaults to `sys.argv[1:]`.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES.keys(), default="10k", help="Number of orders to generate.")
+    parser.add_argument("--data-dir", default="bench_data", help="Directory for the generated datasets.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    paths = generate_dataset(os.path.join(args.data_dir, args.scale), SCALES[args.scale])
+    plain = measure_repositories(paths, shared=False)
+    shared = measure_repositories(paths, shared=True)
+
+    print(f"{'repository':<12} {'plain MiB':>12} {'shared MiB':>12} {'saved':>8}")
+    for name in plain:
+        saved = 1 - shared[name] / plain[name] if plain[name] else 0.0
+        print(f"{name:<12} {plain[name] / 2 ** 20:>12.1f} {shared[name] / 2 ** 20:>12.1f} {saved:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+from array import array
+from dataclasses import dataclass, field
+from decimal import Decimal
+from itertools import compress
+from operator import attrgetter
+from typing import Iterable, Iterator, Sequence
+
+from src.model import Order, Product, ProductCategory, ShippingMethod
+
+# Positions are split into chunks of 2**16; a chunk keeps its low 16 bits in a sorted
+# array up to ARRAY_LIMIT positions and in a 65536-bit integer above, as in Roaring bitmaps
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+ARRAY_LIMIT = 4096
+DISCOUNT_BUCKETS = 10
+
+CATEGORIES = list(ProductCategory)
+SHIPPING_METHODS = list(ShippingMethod)
+
+Container = array | int
+
+_UNKNOWN = 255
+_MASK_TO_ASCII = bytes.maketrans(b"\x00\x01", b"01")
+_ASCII_TO_MASK = bytes.maketrans(b"01", b"\x00\x01")
+_shipping_method = attrgetter("shipping_method")
+_product_id = attrgetter("product_id")
+_discount = attrgetter("discount")
+
+
+def _mask_to_int(mask: bytes | bytearray) -> int:
+    """
+    Pack a mask of 0 and 1 bytes into an integer with bit `i` set for byte `i`.
+    """
+    return int(mask.translate(_MASK_TO_ASCII)[::-1] or b"0", 2)
+
+
+def _int_to_positions(bits: int, base: int) -> Iterator[int]:
+    """
+    Return the positions of the set bits of an integer, offset by `base`, in ascending order.
+    """
+    mask = bin(bits)[:1:-1].encode("ascii").translate(_ASCII_TO_MASK)
+    return compress(range(base, base + len(mask)), mask)
+
+
+def _optimize(container: Container) -> Container | None:
+    """
+    Return the compact representation of a container, None when it is empty.
+    """
+    if isinstance(container, int):
+        if container.bit_count() > ARRAY_LIMIT:
+            return container
+        return array('H', _int_to_positions(container, 0)) or None
+    if len(container) > ARRAY_LIMIT:
+        mask = bytearray(CHUNK_SIZE)
+        for value in container:
+            mask[value] = 1
+        return _mask_to_int(mask)
+    return container or None
+
+
+def _as_int(container: Container) -> int:
+    """
+    Return a container as a 65536-bit integer.
+    """
+    if isinstance(container, int):
+        return container
+    mask = bytearray(CHUNK_SIZE)
+    for value in container:
+        mask[value] = 1
+    return _mask_to_int(mask)
+
+
+def _intersect(left: Container, right: Container) -> Container | None:
+    """
+    Return the intersection of two containers of the same chunk.
+    """
+    if isinstance(left, int):
+        if isinstance(right, int):
+            return _optimize(left & right)
+        return array('H', (value for value in right if left >> value & 1)) or None
+    if isinstance(right, int):
+        return array('H', (value for value in left if right >> value & 1)) or None
+    return array('H', sorted(set(left).intersection(right))) or None
+
+
+def _union(left: Container, right: Container) -> Container:
+    """
+    Return the union of two containers of the same chunk.
+    """
+    if isinstance(left, int) or isinstance(right, int):
+        return _as_int(left) | _as_int(right)
+    merged = _optimize(array('H', sorted(set(left).union(right))))
+    return merged if merged is not None else array('H')
+
+
+@dataclass
+class CompressedBitmap:
+    """
+    Compressed set of order positions, a small Roaring bitmap.
+
+    Positions are grouped into chunks of 65536 by their high bits. A sparse chunk
+    keeps its low bits in a sorted `array('H')` of two bytes per position, a dense
+    chunk in a 65536-bit integer whose `&` and `|` run in C. Intersections and unions
+    are computed chunk by chunk and never materialize the positions.
+
+    Attributes:
+        containers (dict[int, array | int]): The non-empty chunks by their high bits.
+
+    Methods:
+        from_mask(mask: bytes) -> CompressedBitmap:
+            Build the bitmap of the positions of the 1 bytes of a mask.
+        from_positions(positions: Iterable[int]) -> CompressedBitmap:
+            Build the bitmap of ascending positions.
+        __and__ / __or__ (other: CompressedBitmap) -> CompressedBitmap:
+            Intersect or unite two bitmaps.
+        __iter__() -> Iterator[int]:
+            Return the positions in ascending order.
+    """
+    containers: dict[int, Container] = field(default_factory=dict)
+
+    @classmethod
+    def from_mask(cls, mask: bytes) -> "CompressedBitmap":
+        """
+        Build the bitmap of the positions of the 1 bytes of a mask.
+
+        Args:
+            mask (bytes): One 0 or 1 byte per position, e.g. an `IntegrityReport.valid` mask.
+
+        Returns:
+            CompressedBitmap: The positions whose byte is 1.
+        """
+        containers: dict[int, Container] = {}
+        for key, start in enumerate(range(0, len(mask), CHUNK_SIZE)):
+            chunk = mask[start:start + CHUNK_SIZE]
+            count = chunk.count(1)
+            if count > ARRAY_LIMIT:
+                containers[key] = _mask_to_int(chunk)
+            elif count:
+                containers[key] = array('H', compress(range(len(chunk)), chunk))
+        return cls(containers)
+
+    @classmethod
+    def from_positions(cls, positions: Iterable[int]) -> "CompressedBitmap":
+        """
+        Build the bitmap of ascending positions.
+
+        Args:
+            positions (Iterable[int]): Non-negative positions in ascending order.
+
+        Returns:
+            CompressedBitmap: The positions.
+        """
+        chunks: dict[int, array] = {}
+        for position in positions:
+            key = position >> CHUNK_BITS
+            values = chunks.get(key)
+            if values is None:
+                values = chunks[key] = array('H')
+            values.append(position & (CHUNK_SIZE - 1))
+        containers: dict[int, Container] = {}
+        for key, values in chunks.items():
+            container = _optimize(values)
+            if container is not None:
+                containers[key] = container
+        return cls(containers)
+
+    def __and__(self, other: "CompressedBitmap") -> "CompressedBitmap":
+        containers: dict[int, Container] = {}
+        for key in self.containers.keys() & other.containers.keys():
+            container = _intersect(self.containers[key], other.containers[key])
+            if container is not None:
+                containers[key] = container
+        return CompressedBitmap(containers)
+
+    def __or__(self, other: "CompressedBitmap") -> "CompressedBitmap":
+        containers = dict(self.containers)
+        for key, container in other.containers.items():
+            containers[key] = _union(containers[key], container) if key in containers else container
+        return CompressedBitmap(containers)
+
+    def __len__(self) -> int:
+        return sum(container.bit_count() if isinstance(container, int) else len(container)
+                   for container in self.containers.values())
+
+    def __contains__(self, position: int) -> bool:
+        container = self.containers.get(position >> CHUNK_BITS)
+        if container is None:
+            return False
+        low = position & (CHUNK_SIZE - 1)
+        if isinstance(container, int):
+            return bool(container >> low & 1)
+        return low in container
+
+    def __iter__(self) -> Iterator[int]:
+        for key in sorted(self.containers):
+            container, base = self.containers[key], key << CHUNK_BITS
+            if isinstance(container, int):
+                yield from _int_to_positions(container, base)
+            else:
+                yield from (base + value for value in container)
+
+
+def union(bitmaps: Iterable[CompressedBitmap]) -> CompressedBitmap:
+    """
+    Return the union of bitmaps, empty for no bitmaps.
+
+    Args:
+        bitmaps (Iterable[CompressedBitmap]): The bitmaps.
+
+    Returns:
+        CompressedBitmap: The positions contained in any bitmap.
+    """
+    result = CompressedBitmap()
+    for bitmap in bitmaps:
+        result = result | bitmap
+    return result
+
+
+def discount_bucket(discount: Decimal) -> int:
+    """
+    Return the bucket of a discount in [0, 1]; bucket `i` holds discounts in [i / 10, (i + 1) / 10).
+
+    Args:
+        discount (Decimal): The discount.
+
+    Returns:
+        int: The bucket index, discounts of 1 fall into the last bucket.
+    """
+    return min(max(int(discount * DISCOUNT_BUCKETS), 0), DISCOUNT_BUCKETS - 1)
+
+
+@dataclass
+class OrderBitmapIndex:
+    """
+    Bitmap indexes over the positions of orders for filtered queries.
+
+    Every shipping method, product category and discount bucket has a compressed
+    bitmap of the positions of its orders. A filter is answered by OR-ing the bitmaps
+    of the accepted values of every dimension and AND-ing the dimensions with the
+    bitmap of orders with valid references; the aggregation then only visits the
+    selected orders.
+
+    Attributes:
+        orders (Sequence[Order]): The indexed orders, positions refer to this sequence.
+        valid (CompressedBitmap): Orders whose customer and product exist.
+        shipping_methods (dict[ShippingMethod, CompressedBitmap]): Orders by shipping method.
+        categories (dict[ProductCategory, CompressedBitmap]): Orders by product category.
+        discount_buckets (list[CompressedBitmap]): Orders by discount bucket, see `discount_bucket`.
+
+    Methods:
+        from_orders(orders, products, valid) -> OrderBitmapIndex:
+            Build the indexes in one pass per dimension.
+        select(categories, shipping_methods, discount_range) -> CompressedBitmap:
+            Return the positions of the valid orders matching every given condition.
+    """
+    orders: Sequence[Order]
+    valid: CompressedBitmap
+    shipping_methods: dict[ShippingMethod, CompressedBitmap]
+    categories: dict[ProductCategory, CompressedBitmap]
+    discount_buckets: list[CompressedBitmap]
+
+    @classmethod
+    def from_orders(cls, orders: Sequence[Order], products: dict[int, Product], valid: bytes) -> "OrderBitmapIndex":
+        """
+        Build the indexes in one pass per dimension.
+
+        Every dimension is first encoded as one byte per order with C-level `map`
+        calls; the mask of a value is a `translate` of that column.
+
+        Args:
+            orders (Sequence[Order]): The orders.
+            products (dict[int, Product]): Known products by id.
+            valid (bytes): 1 for every order with valid references, see `check_order_references`.
+
+        Returns:
+            OrderBitmapIndex: The indexes.
+        """
+        product_codes = {product_id: CATEGORIES.index(product.category) for product_id, product in products.items()}
+        discounts = list(map(_discount, orders))
+        bucket_codes = {discount: discount_bucket(discount) for discount in set(discounts)}
+
+        # list.index compares enum members by identity in C, hashing them runs Python code
+        shipping_column = bytes(map(SHIPPING_METHODS.index, map(_shipping_method, orders)))
+        category_column = bytes(map(product_codes.get, map(_product_id, orders), [_UNKNOWN] * len(orders)))
+        discount_column = bytes(map(bucket_codes.__getitem__, discounts))
+        return cls(
+            orders=orders,
+            valid=CompressedBitmap.from_mask(valid),
+            shipping_methods={method: _value_bitmap(shipping_column, code)
+                              for code, method in enumerate(SHIPPING_METHODS)},
+            categories={category: _value_bitmap(category_column, code) for code, category in enumerate(CATEGORIES)},
+            discount_buckets=[_value_bitmap(discount_column, bucket) for bucket in range(DISCOUNT_BUCKETS)]
+        )
+
+    def select(
+            self,
+            categories: Iterable[ProductCategory] | None = None,
+            shipping_methods: Iterable[ShippingMethod] | None = None,
+            discount_range: Sequence[Decimal] | None = None) -> CompressedBitmap:
+        """
+        Return the positions of the valid orders matching every given condition.
+
+        Args:
+            categories (Iterable[ProductCategory] | None): Accepted product categories, all when None.
+            shipping_methods (Iterable[ShippingMethod] | None): Accepted shipping methods, all when None.
+            discount_range (Sequence[Decimal] | None): Inclusive (low, high) discount range, all when None.
+
+        Returns:
+            CompressedBitmap: The selected order positions.
+        """
+        selected = self.valid
+        if categories is not None:
+            selected = selected & union(self.categories[category] for category in categories)
+        if shipping_methods is not None:
+            selected = selected & union(self.shipping_methods[method] for method in shipping_methods)
+        if discount_range is not None:
+            selected = selected & self._discounts(*discount_range)
+        return selected
+
+    def _discounts(self, low: Decimal, high: Decimal) -> CompressedBitmap:
+        """
+        Return the positions of the orders with a discount in [low, high].
+
+        Buckets inside the range are taken whole; the orders of the buckets at its
+        edges are checked individually.
+        """
+        if high < low:
+            return CompressedBitmap()
+        first, last = discount_bucket(low), discount_bucket(high)
+        inner = union(self.discount_buckets[bucket] for bucket in range(first + 1, last))
+        orders = self.orders
+        edges = sorted({first, last})
+        for bucket in edges:
+            inner = inner | CompressedBitmap.from_positions(
+                position for position in self.discount_buckets[bucket]
+                if low <= orders[position].discount <= high
+            )
+        return inner
+
+
+def _value_bitmap(column: bytes, code: int) -> CompressedBitmap:
+    """
+    Return the bitmap of the positions of a code in a column of one byte per order.
+    """
+    table = bytearray(256)
+    table[code] = 1
+    return CompressedBitmap.from_mask(column.translate(table))
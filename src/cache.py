@@ -0,0 +1,165 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import wraps
+from collections.abc import Iterator
+from typing import Any, Callable, Hashable, Protocol
+
+from src.metrics import get_metrics_sink
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Snapshot of the statistics of a result cache.
+
+    Attributes:
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups which had to compute the result.
+        evictions (int): The number of entries dropped to respect the size cap.
+        size (int): The number of cached entries.
+        max_size (int): The size cap.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Return the fraction of lookups answered from the cache.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class ResultCache:
+    """
+    Least recently used cache of query results.
+
+    Keys are expected to contain everything the result depends on, including the
+    versions of the underlying data, so entries never have to be invalidated
+    explicitly: a change of data produces new keys and the stale entries are
+    evicted once the cache is full.
+
+    Attributes:
+        max_size (int): The maximum number of cached entries.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups which had to compute the result.
+        evictions (int): The number of entries dropped to respect the size cap.
+
+    Methods:
+        get_or_compute(key: Hashable, compute: Callable[[], Any], key_after: Callable[[], Hashable]) -> Any:
+            Return the cached result of a key or compute and store it.
+        stats() -> CacheStats:
+            Return a snapshot of the cache statistics.
+        clear() -> None:
+            Drop all entries and reset the statistics.
+    """
+    max_size: int = 128
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    _entries: OrderedDict[Hashable, Any] = field(default_factory=OrderedDict, init=False, repr=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], key_after: Callable[[], Hashable]) -> Any:
+        """
+        Return the cached result of a key or compute and store it.
+
+        Computing a result may itself change data versions, e.g. by building a missing
+        summary, so the result is stored under the key taken after the computation.
+
+        Args:
+            key (Hashable): The key of the lookup.
+            compute (Callable[[], Any]): Computes the result on a miss.
+            key_after (Callable[[], Hashable]): Returns the key of the computed result.
+
+        Returns:
+            Any: The cached or computed result, shared between callers.
+        """
+        sink = get_metrics_sink()
+        if key in self._entries:
+            self.hits += 1
+            if sink.enabled:
+                sink.increment("result_cache.hits")
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        if sink.enabled:
+            sink.increment("result_cache.misses")
+        result = compute()
+        self._entries[key_after()] = result
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def stats(self) -> CacheStats:
+        """
+        Return a snapshot of the cache statistics.
+        """
+        return CacheStats(self.hits, self.misses, self.evictions, len(self._entries), self.max_size)
+
+    def clear(self) -> None:
+        """
+        Drop all entries and reset the statistics.
+        """
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+class VersionedCacheOwner(Protocol):
+    """
+    Object whose method results can be cached with `cached_result`.
+
+    Attributes:
+        cache (ResultCache | None): The cache, caching is disabled when None.
+
+    Methods:
+        cache_versions() -> Hashable:
+            Return the versions of the data the results depend on.
+    """
+    cache: ResultCache | None
+
+    def cache_versions(self) -> Hashable:
+        ...
+
+
+def cached_result[F: Callable[..., Any]](name: str) -> Callable[[F], F]:
+    """
+    Decorator caching method results by (name, arguments, data versions).
+
+    Positional and keyword arguments must be hashable; lists and iterators, e.g. generators,
+    are converted to tuples, which are also passed to the method.
+
+    Args:
+        name (str): The name of the cached query.
+
+    Returns:
+        Callable[[F], F]: The decorator.
+    """
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(self: VersionedCacheOwner, *args: Any, **kwargs: Any) -> Any:
+            if self.cache is None:
+                return func(self, *args, **kwargs)
+            args = tuple(map(_key_argument, args))
+            kwargs = {key: _key_argument(value) for key, value in kwargs.items()}
+            arguments = (args, tuple(sorted(kwargs.items())))
+            return self.cache.get_or_compute(
+                (name, arguments, self.cache_versions()),
+                lambda: func(self, *args, **kwargs),
+                lambda: (name, arguments, self.cache_versions())
+            )
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def _key_argument(value: Any) -> Any:
+    """
+    Convert a list or an iterator, which cannot key a cached result, to a tuple.
+    """
+    return tuple(value) if isinstance(value, (list, Iterator)) else value
@@ -0,0 +1,88 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Protocol
+
+OPERATION_FIELD = "op"
+
+
+class Identified(Protocol):
+    """
+    Domain object with an integer id and a raw dictionary form, e.g. `Product`, `Customer` or `Order`.
+    """
+    @property
+    def id(self) -> int: ...
+
+    def to_dict(self) -> Any: ...
+
+
+class ChangeOperation(Enum):
+    """
+    Operation of a change-set record.
+
+    An upsert record carries a full raw entry, e.g. an `OrderDataDict`, which replaces
+    the entry with the same id or is added when the id is new. A delete record only
+    needs the id.
+    """
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+@dataclass
+class AppliedChanges[U]:
+    """
+    Outcome of applying a change set to a repository.
+
+    Attributes:
+        inserted (list[U]): Entries added under a new id.
+        updated (list[tuple[U, U]]): Replaced entries as (previous, current) pairs.
+        deleted (list[U]): Removed entries.
+        rejected (int): The number of invalid records and deletes of unknown ids.
+
+    Methods:
+        removed() -> list[U]:
+            Return the entries which are no longer in the repository.
+        added() -> list[U]:
+            Return the entries which are new in the repository.
+    """
+    inserted: list[U] = field(default_factory=list)
+    updated: list[tuple[U, U]] = field(default_factory=list)
+    deleted: list[U] = field(default_factory=list)
+    rejected: int = 0
+
+    def __bool__(self) -> bool:
+        """
+        Return True if the repository was changed.
+        """
+        return bool(self.inserted or self.updated or self.deleted)
+
+    def removed(self) -> list[U]:
+        """
+        Return the deleted entries and the previous version of the updated ones.
+        """
+        return self.deleted + [previous for previous, _ in self.updated]
+
+    def added(self) -> list[U]:
+        """
+        Return the inserted entries and the current version of the updated ones.
+        """
+        return self.inserted + [current for _, current in self.updated]
+
+
+def split_change(record: dict[str, Any]) -> tuple[ChangeOperation, dict[str, Any]]:
+    """
+    Split a change-set record into its operation and its raw entry.
+
+    Args:
+        record (dict[str, Any]): The record, a raw entry with an additional `op` field.
+
+    Returns:
+        tuple[ChangeOperation, dict[str, Any]]: The operation and the entry without the `op` field.
+
+    Raises:
+        ValueError: If the operation is missing or unknown, or a delete has no integer id.
+    """
+    entry = dict(record)
+    operation = ChangeOperation(entry.pop(OPERATION_FIELD, None))
+    if operation is ChangeOperation.DELETE and (not isinstance(entry.get("id"), int) or isinstance(entry["id"], bool)):
+        raise ValueError(f"Delete without an integer id: {record!r}")
+    return operation, entry
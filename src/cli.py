@@ -0,0 +1,518 @@
+"""
+Command line interface of the purchase analytics pipeline.
+
+Commands:
+    load      Load and validate the dataset and print the number of records.
+    summary   Print the purchased quantities by customer and product.
+    report    Print every `PurchasesSummaryService` metric.
+    export    Write the validated dataset and the purchase summary as JSON.
+    bench     Run the pipeline several times and print the median duration of every stage.
+
+Usage:
+    python -m src --data-dir data report
+    python -m src --data-dir bench_data/1m --engine sparse --profile --trace-memory report --json
+    python -m src --data-dir data export data_out
+    python -m src --data-dir data --category Electronics --shipping-method Express report
+"""
+from collections.abc import Mapping
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, field, replace
+from decimal import Decimal
+from enum import Enum
+from itertools import islice
+from typing import Any, Callable, Literal, get_args
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+
+from src.converter import CustomerConverter, OrderConverter, ProductConverter, ProjectedOrderConverter
+from src.file_service import (
+    CustomerJsonFileReader,
+    CustomerJsonFileWriter,
+    OrderJsonFileReader,
+    OrderJsonFileWriter,
+    ProductJsonFileReader,
+    ProductJsonFileWriter
+)
+from src.metrics import InMemoryMetricsRegistry, get_metrics_sink, measure, set_metrics_sink
+from src.integrity import IdMembership, check_order_references
+from src.filters import OrderFilter
+from src.model import Customer, OrderDataDict, Product, ProductCategory, ShippingMethod, SUMMARY_ORDER_FIELDS
+from src.profiling import StageProfiler, profiling, profiling_from_env
+from src.repository import (
+    CustomerDataRepository,
+    CustomerProductQuantitiesView,
+    OrderDataRepository,
+    ProductDataRepository,
+    ProjectedOrderDataRepository,
+    PurchaseSummaryRepository
+)
+from src.service import PurchasesSummaryService
+from src.sparse_summary import SparsePurchaseSummaryRepository
+from src.streaming import StreamingAnalyticsResult, StreamingPurchaseAnalytics
+from src.validator import CustomerDataDictValidator, OrderDataDictValidator, ProductDataDictValidator
+
+Engine = Literal["python", "sparse", "streaming"]
+DATASETS = ("products", "customers", "orders")
+FORMATS = {"json": ".json", "jsonl": ".jsonl"}
+
+
+@dataclass
+class Pipeline:
+    """
+    Repositories and analytics selected by the command line options.
+
+    The `python` engine builds the dictionary based purchase summary, optionally sharded
+    over `workers` processes. The `sparse` engine builds the array backed purchase matrix
+    of `SparsePurchaseSummaryRepository`. The `streaming` engine never loads the orders:
+    it answers the report in one pass over the order file, so it does not support the
+    `summary` and `export` commands.
+
+    Attributes:
+        paths (dict[str, str]): Paths of the products, customers and orders files.
+        engine (Engine): The summary engine.
+        workers (int): The number of worker processes of the `python` engine.
+        fixed_point (bool): If True, money is parsed and summed as integer minor units.
+        prefilter_references (bool): If True, order references are checked in one bulk pass
+            before the summary build of the `python` engine.
+        order_filter (OrderFilter | None): When set, orders it rejects are skipped while
+            the order file is read, before validation and conversion, by every engine.
+        project_orders (bool): If True, only the order fields of the purchase summary are
+            validated and converted, into `ProjectedOrder` records; only `load` and
+            `summary` can use such orders.
+        customer_repo, product_repo, order_repo: The loaded repositories, None before `load()`.
+        summary_repo (PurchaseSummaryRepository | None): The summary repository, None before `summarize()`.
+
+    Methods:
+        load() -> dict[str, int]:
+            Load the repositories and return the number of valid records of every dataset.
+        summarize() -> CustomerProductQuantitiesView:
+            Build the purchase summary keyed by customer and product id.
+        report() -> dict[str, Any]:
+            Compute every service metric.
+    """
+    paths: dict[str, str]
+    engine: Engine = "python"
+    workers: int = 1
+    fixed_point: bool = False
+    prefilter_references: bool = False
+    order_filter: OrderFilter | None = None
+    project_orders: bool = False
+    customer_repo: CustomerDataRepository | None = field(default=None, init=False)
+    product_repo: ProductDataRepository | None = field(default=None, init=False)
+    order_repo: OrderDataRepository | ProjectedOrderDataRepository | None = field(default=None, init=False)
+    summary_repo: PurchaseSummaryRepository | None = field(default=None, init=False)
+
+    def load(self) -> dict[str, int]:
+        """
+        Load the repositories and return the number of valid records of every dataset.
+
+        Engines which load the orders also check their customer and product references
+        in one bulk pass and count the orders with invalid references.
+
+        Returns:
+            dict[str, int]: Valid records by dataset name and, for engines which load
+            the orders, the number of orders with invalid references.
+        """
+        self.product_repo = ProductDataRepository(
+            file_reader=ProductJsonFileReader(),
+            validator=ProductDataDictValidator(),
+            converter=ProductConverter(fixed_point=self.fixed_point),
+            file_name=self.paths["products"]
+        )
+        self.customer_repo = CustomerDataRepository(
+            file_reader=CustomerJsonFileReader(),
+            validator=CustomerDataDictValidator(),
+            converter=CustomerConverter(),
+            file_name=self.paths["customers"]
+        )
+        counts = {"products": len(self.product_repo.get_data()), "customers": len(self.customer_repo.get_data())}
+        if self.engine != "streaming" and self.project_orders:
+            self.order_repo = ProjectedOrderDataRepository(
+                file_reader=OrderJsonFileReader(),
+                validator=OrderDataDictValidator(required_fields=list(SUMMARY_ORDER_FIELDS)),
+                converter=ProjectedOrderConverter(SUMMARY_ORDER_FIELDS),
+                file_name=self.paths["orders"],
+                row_filter=self._row_filter()
+            )
+        elif self.engine != "streaming":
+            self.order_repo = OrderDataRepository(
+                file_reader=OrderJsonFileReader(),
+                validator=OrderDataDictValidator(),
+                converter=OrderConverter(fixed_point=self.fixed_point),
+                file_name=self.paths["orders"],
+                row_filter=self._row_filter()
+            )
+        if self.order_repo is not None:
+            counts["orders"] = len(self.order_repo.get_data())
+            with measure("cli.check_integrity"):
+                report = check_order_references(
+                    self.order_repo.get_data(),
+                    IdMembership.from_ids(customer.id for customer in self.customer_repo.get_data()),
+                    IdMembership.from_ids(product.id for product in self.product_repo.get_data())
+                )
+            report.log_summary(self.paths["orders"])
+            counts["invalid_references"] = report.invalid_orders
+        return counts
+
+    def summarize(self) -> CustomerProductQuantitiesView:
+        """
+        Build the purchase summary keyed by customer and product id.
+
+        Returns:
+            CustomerProductQuantitiesView: Purchased quantities by customer id and product id.
+
+        Raises:
+            ValueError: If the engine does not materialize the summary.
+        """
+        if self.engine == "streaming":
+            raise ValueError("The streaming engine does not build a purchase summary.")
+        if self.customer_repo is None or self.product_repo is None or self.order_repo is None:
+            self.load()
+        assert self.customer_repo is not None and self.product_repo is not None and self.order_repo is not None
+        repository_type = SparsePurchaseSummaryRepository if self.engine == "sparse" else PurchaseSummaryRepository
+        self.summary_repo = repository_type(
+            customer_repo=self.customer_repo,
+            product_repo=self.product_repo,
+            order_repo=self.order_repo,
+            workers=self.workers,
+            prefilter_references=self.prefilter_references
+        )
+        return self.summary_repo.purchase_summary_by_id()
+
+    def report(self) -> dict[str, Any]:
+        """
+        Compute every service metric.
+
+        The `streaming` engine reports the metrics of `StreamingAnalyticsResult`, which
+        has no rollups and no cube.
+
+        Returns:
+            dict[str, Any]: Metric values by metric name.
+        """
+        if self.customer_repo is None or self.product_repo is None:
+            self.load()
+        assert self.customer_repo is not None and self.product_repo is not None
+        if self.engine == "streaming":
+            result = StreamingPurchaseAnalytics(
+                customer_repo=self.customer_repo,
+                product_repo=self.product_repo,
+                order_reader=OrderJsonFileReader(),
+                order_validator=OrderDataDictValidator(),
+                order_converter=OrderConverter(fixed_point=self.fixed_point),
+                fixed_point=self.fixed_point,
+                order_filter=self.order_filter
+            ).run(self.paths["orders"])
+            return _core_metrics(result)
+
+        if self.summary_repo is None:
+            self.summarize()
+        assert self.summary_repo is not None
+        service = PurchasesSummaryService(repository=self.summary_repo, cache=None, fixed_point=self.fixed_point)
+        report = _core_metrics(service)
+        report.update({
+            "units_by_category": service.units_by_category(),
+            "revenue_by_category": service.revenue_by_category(),
+            "distinct_buyers_by_category": service.distinct_buyers_by_category(),
+            "units_by_shipping_method": service.units_by_shipping_method(),
+            "revenue_by_shipping_method": service.revenue_by_shipping_method(),
+            "distinct_buyers_by_shipping_method": service.distinct_buyers_by_shipping_method(),
+            "popular_products_by_category": {category: service.popular_products(category)
+                                             for category in ProductCategory},
+            "sales_by_age_band": {f"{low}-{high}": sales
+                                  for (low, high), sales in service.sales_by_age_band().items()}
+        })
+        return report
+
+
+    def _row_filter(self) -> Callable[[OrderDataDict], bool] | None:
+        """
+        Return the raw order test of the order filter, None when orders are not filtered.
+        """
+        if self.order_filter is None or self.order_filter.unrestricted:
+            return None
+        assert self.customer_repo is not None and self.product_repo is not None
+        return self.order_filter.row_predicate(self.customer_repo.get_data(), self.product_repo.get_data())
+
+
+def _core_metrics(source: PurchasesSummaryService | StreamingAnalyticsResult) -> dict[str, Any]:
+    """
+    Compute the metrics answered by both the service and the streaming result.
+    """
+    highest, lowest = source.find_highest_and_lowest_spenders()
+    return {
+        "average_spending_per_customer": source.calculate_avarage_spending_per_customer(),
+        "most_popular_products": source.find_most_popular_products(),
+        "highest_spenders": highest,
+        "lowest_spenders": lowest,
+        "spending_quantiles": source.spending_quantiles(),
+        "order_quantity_quantiles": source.order_quantity_quantiles()
+    }
+
+
+def to_json(value: Any) -> Any:
+    """
+    Convert a metric value to a JSON serializable value.
+
+    Customers and products are replaced by their ids, decimals by strings and enums
+    by their values; dictionary keys are converted to strings.
+
+    Args:
+        value (Any): The metric value.
+
+    Returns:
+        Any: The JSON serializable value.
+    """
+    if isinstance(value, (Customer, Product)):
+        return value.id
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Mapping):
+        return {str(to_json(key)): to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    return value
+
+
+def print_metrics(metrics: dict[str, Any], limit: int) -> None:
+    """
+    Print metrics as text, at most `limit` entries of every mapping or list.
+
+    Args:
+        metrics (dict[str, Any]): JSON serializable metric values by name.
+        limit (int): The maximum number of printed entries per metric.
+    """
+    for name, value in metrics.items():
+        if isinstance(value, Mapping):
+            print(f"{name}:")
+            for key, item in islice(value.items(), limit):
+                print(f"  {key}: {item}")
+            if len(value) > limit:
+                print(f"  ... {len(value) - limit} more")
+        elif isinstance(value, list) and len(value) > limit:
+            print(f"{name}: {value[:limit]} ... {len(value) - limit} more")
+        else:
+            print(f"{name}: {value}")
+
+
+def dataset_paths(args: argparse.Namespace) -> dict[str, str]:
+    """
+    Resolve the dataset files from the data directory, the format and the explicit paths.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+        dict[str, str]: A mapping of dataset name ("products", "customers", "orders") to file path.
+    """
+    return {name: getattr(args, name) or os.path.join(args.data_dir, f"{name}{FORMATS[args.format]}")
+            for name in DATASETS}
+
+
+def order_filter(args: argparse.Namespace) -> OrderFilter | None:
+    """
+    Build the order filter of the filter options, None when no filter option is given.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+        OrderFilter | None: The order filter.
+    """
+    result = OrderFilter(
+        categories=None if args.category is None else [ProductCategory(value) for value in args.category],
+        shipping_methods=None if args.shipping_method is None else [ShippingMethod(value) for value in args.shipping_method],
+        age_range=args.age_range,
+        customer_ids=args.customer_id,
+        product_ids=args.product_id,
+        discount_range=args.discount_range
+    )
+    return None if result.unrestricted else result
+
+
+def run_load(pipeline: Pipeline, args: argparse.Namespace) -> int:
+    """
+    Load the dataset and print the number of valid records.
+    """
+    with measure("cli.load"):
+        counts = pipeline.load()
+    for name, count in counts.items():
+        print(f"{name}: {count}")
+    return 0
+
+
+def run_summary(pipeline: Pipeline, args: argparse.Namespace) -> int:
+    """
+    Print the purchased quantities by customer and product.
+    """
+    with measure("cli.load"):
+        pipeline.load()
+    with measure("cli.summary"):
+        summary = pipeline.summarize()
+    if args.json:
+        json.dump(to_json(summary), sys.stdout, indent=4)
+        print()
+    else:
+        print_metrics({"purchase_summary": summary}, args.limit)
+    return 0
+
+
+def run_report(pipeline: Pipeline, args: argparse.Namespace) -> int:
+    """
+    Print every service metric.
+    """
+    with measure("cli.load"):
+        pipeline.load()
+    if pipeline.engine != "streaming":
+        with measure("cli.summary"):
+            pipeline.summarize()
+    with measure("cli.report"):
+        report = to_json(pipeline.report())
+    if args.json:
+        json.dump(report, sys.stdout, indent=4)
+        print()
+    else:
+        print_metrics(report, args.limit)
+    return 0
+
+
+def run_export(pipeline: Pipeline, args: argparse.Namespace) -> int:
+    """
+    Write the validated dataset and the purchase summary as JSON files.
+    """
+    with measure("cli.load"):
+        pipeline.load()
+    with measure("cli.summary"):
+        summary = pipeline.summarize()
+    assert pipeline.product_repo is not None and pipeline.customer_repo is not None
+    assert isinstance(pipeline.order_repo, OrderDataRepository)
+    with measure("cli.export"):
+        os.makedirs(args.output_dir, exist_ok=True)
+        ProductJsonFileWriter().write(os.path.join(args.output_dir, "products.json"),
+                                      [product.to_dict() for product in pipeline.product_repo.get_data()])
+        CustomerJsonFileWriter().write(os.path.join(args.output_dir, "customers.json"),
+                                       [customer.to_dict() for customer in pipeline.customer_repo.get_data()])
+        OrderJsonFileWriter().write(os.path.join(args.output_dir, "orders.json"),
+                                    [order.to_dict() for order in pipeline.order_repo.get_data()])
+        with open(os.path.join(args.output_dir, "purchase_summary.json"), 'w', encoding='utf-8') as file:
+            json.dump(to_json(summary), file, indent=4)
+    print(f"Exported {len(summary)} customers to {args.output_dir}")
+    return 0
+
+
+def run_bench(pipeline: Pipeline, args: argparse.Namespace) -> int:
+    """
+    Run load, summary and report several times and print the median duration of every stage.
+
+    The stage metrics are collected by the `InMemoryMetricsRegistry` installed by `main`.
+    """
+    for _ in range(args.repeat):
+        run = replace(pipeline)
+        with measure("cli.load"):
+            run.load()
+        if run.engine != "streaming":
+            with measure("cli.summary"):
+                run.summarize()
+        with measure("cli.report"):
+            run.report()
+    sink = get_metrics_sink()
+    registry = sink.delegate if isinstance(sink, StageProfiler) else sink
+    assert isinstance(registry, InMemoryMetricsRegistry)
+    for name, durations in sorted(registry.timings.items()):
+        stage = name.removesuffix(".duration")
+        print(f"{stage:<50} calls={registry.counters[f'{stage}.calls']:>6} "
+              f"p50={statistics.median(durations):.4f}s")
+    return 0
+
+
+COMMANDS = {"load": run_load, "summary": run_summary, "report": run_report, "export": run_export, "bench": run_bench}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command line parser.
+
+    Returns:
+        argparse.ArgumentParser: The parser of the global options and the subcommands.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--data-dir", default="data", help="Directory with the products, customers and orders files.")
+    parser.add_argument("--format", choices=FORMATS.keys(), default="json",
+                        help="File format of the dataset in the data directory.")
+    for name in DATASETS:
+        parser.add_argument(f"--{name}", help=f"Path of the {name} file, overrides the data directory.")
+    parser.add_argument("--engine", choices=get_args(Engine), default="python", help="The summary engine.")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes of the python engine.")
+    parser.add_argument("--fixed-point", action="store_true", help="Compute money as integer minor units.")
+    parser.add_argument("--project-orders", action="store_true",
+                        help="Validate and convert only the order fields of the purchase summary (load, summary).")
+    parser.add_argument("--prefilter-references", action="store_true",
+                        help="Check order references in one bulk pass before the summary build.")
+    filters = parser.add_argument_group("order filters", "Only orders matching every given filter are loaded.")
+    filters.add_argument("--category", action="append", choices=[category.value for category in ProductCategory])
+    filters.add_argument("--shipping-method", action="append", choices=[method.value for method in ShippingMethod])
+    filters.add_argument("--age-range", type=int, nargs=2, metavar=("MIN", "MAX"), help="Inclusive customer ages.")
+    filters.add_argument("--discount-range", type=Decimal, nargs=2, metavar=("MIN", "MAX"), help="Inclusive discounts.")
+    filters.add_argument("--customer-id", type=int, action="append", help="Accepted customer id, repeatable.")
+    filters.add_argument("--product-id", type=int, action="append", help="Accepted product id, repeatable.")
+    parser.add_argument("--profile", action="store_true", help="Write cProfile statistics of every stage.")
+    parser.add_argument("--trace-memory", action="store_true", help="Write the top allocations of every stage.")
+    parser.add_argument("--profile-dir", default="profiles", help="Directory of the profiling reports.")
+    parser.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("load", help="Load and validate the dataset.")
+    for name, help_text in (("summary", "Print the purchase summary."), ("report", "Print all service metrics.")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--json", action="store_true", help="Print JSON instead of text.")
+        command.add_argument("--limit", type=int, default=10, help="Printed entries per metric in text output.")
+    export = commands.add_parser("export", help="Write the validated dataset and the purchase summary.")
+    export.add_argument("output_dir")
+    bench = commands.add_parser("bench", help="Print the median duration of every pipeline stage.")
+    bench.add_argument("--repeat", type=int, default=3, help="Number of pipeline runs.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the command line interface.
+
+    Profiling is enabled by `--profile` and `--trace-memory`, or by the environment
+    variables read by `profiling_from_env`.
+
+    Args:
+        argv (list[str] | None): Command line arguments, defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: The process exit code.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level)
+    if args.engine == "streaming" and args.command in ("summary", "export"):
+        parser.error(f"the streaming engine does not support the {args.command} command")
+    if args.project_orders and args.command not in ("load", "summary"):
+        parser.error(f"--project-orders does not support the {args.command} command")
+    pipeline = Pipeline(dataset_paths(args), args.engine, args.workers, args.fixed_point, args.prefilter_references,
+                        order_filter(args), args.project_orders)
+
+    previous = get_metrics_sink()
+    if args.command == "bench":
+        set_metrics_sink(InMemoryMetricsRegistry())
+    try:
+        context: AbstractContextManager[StageProfiler | None]
+        if args.profile or args.trace_memory:
+            context = profiling(args.profile_dir, cpu=args.profile, trace_memory=args.trace_memory)
+        else:
+            context = profiling_from_env()
+        with context:
+            return COMMANDS[args.command](pipeline, args)
+    finally:
+        set_metrics_sink(previous)
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
 from decimal import Decimal
+from typing import Callable, Iterable
+import sys
+from src.money import Discount, Money
 from src.model import (ProductDataDict, CustomerDataDict, OrderDataDict, 
-                       Product, Customer, Order,
-                       ProductCategory, ShippingMethod)
+                       Product, Customer, Order, ProjectedOrder,
+                       ProductCategory, ShippingMethod, ORDER_FIELDS, SUMMARY_ORDER_FIELDS)
 
 class AbstractConverter[T, U](ABC):
     """
@@ -64,6 +67,67 @@ class AbstractConverter[T, U](ABC):
         """
         pass
 
+class ValuePool[T]:
+    """
+    Bounded table sharing one immutable value per distinct raw string.
+
+    Repeated raw values, such as the discounts of orders, are converted once and the
+    same object is returned for every record, so the loaded data holds one object per
+    distinct value instead of one per record. Once `max_size` values are pooled, new
+    values are converted without being pooled, which bounds the memory of the table.
+
+    Attributes:
+        factory (Callable[[str], T]): Converts a raw string to a value.
+        max_size (int): The maximum number of pooled values.
+
+    Methods:
+        get(raw: str) -> T:
+            Return the shared value of a raw string.
+    """
+
+    def __init__(self, factory: Callable[[str], T], max_size: int = 4096) -> None:
+        """
+        Initialize an empty pool.
+
+        Args:
+            factory (Callable[[str], T]): Converts a raw string to a value.
+            max_size (int): The maximum number of pooled values.
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self._values: dict[str, T] = {}
+
+    def __len__(self) -> int:
+        """
+        Return the number of pooled values.
+        """
+        return len(self._values)
+
+    def get(self, raw: str) -> T:
+        """
+        Return the shared value of a raw string, converting and pooling it on first use.
+
+        Args:
+            raw (str): The raw string.
+
+        Returns:
+            T: The converted value.
+        """
+        value = self._values.get(raw)
+        if value is None:
+            value = self.factory(raw)
+            if len(self._values) < self.max_size:
+                self._values[raw] = value
+        return value
+
+
+def _keep(value: str) -> str:
+    """
+    Return a string unchanged, used when interning is disabled.
+    """
+    return value
+
+
 class ProductConverter(AbstractConverter[ProductDataDict, Product]):
     """
     A converter class responsible for transforming JSON-like dictionary data 
@@ -73,6 +137,11 @@ class ProductConverter(AbstractConverter[ProductDataDict, Product]):
     for converting `ProductDataDict` (a dictionary representation of a product) 
     into a `Product` object.
 
+    Attributes:
+        fixed_point (bool): If True, the price is parsed as fixed-point `Money`, stored in
+            minor units on the product, and the `Decimal` price is rounded to two decimal places.
+        intern_strings (bool): If True, product names are interned with `sys.intern`.
+
     Methods:
         - convert(data: ProductDataDict) -> Product:
             Converts a dictionary containing product data into a `Product` object.
@@ -90,6 +159,18 @@ class ProductConverter(AbstractConverter[ProductDataDict, Product]):
         Product(id=101, name='Laptop', category=<ProductCategory.ELECTRONICS: 'Electronics'>, price=Decimal('1500.00'))
     """
 
+    def __init__(self, fixed_point: bool = False, intern_strings: bool = True) -> None:
+        """
+        Initialize the converter.
+
+        Args:
+            fixed_point (bool): If True, parse money values as fixed-point integers.
+            intern_strings (bool): If True, intern repeated strings.
+        """
+        self.fixed_point = fixed_point
+        self.intern_strings = intern_strings
+        self._intern = sys.intern if intern_strings else _keep
+
     def convert(self, data: ProductDataDict) -> Product:
         """
         Convert the JSON-like dictionary data into a `Product` object.
@@ -124,9 +205,18 @@ class ProductConverter(AbstractConverter[ProductDataDict, Product]):
             >>> print(product)
             Product(id=101, name='Laptop', category=<ProductCategory.ELECTRONICS: 'Electronics'>, price=Decimal('1500.00'))
         """
+        if self.fixed_point:
+            money = Money.parse(data["price"])
+            return Product(
+                id= data["id"],
+                name= self._intern(data["name"]),
+                category=ProductCategory(data["category"]),
+                price=money.to_decimal(),
+                price_minor=money.minor
+            )
         return Product(
             id= data["id"],
-            name= data["name"],
+            name= self._intern(data["name"]),
             category=ProductCategory(data["category"]),
             price=Decimal(data["price"])
         )
@@ -159,6 +249,17 @@ class CustomerConverter(AbstractConverter[CustomerDataDict, Customer]):
         Customer(id=1, first_name='John', last_name='Doe', age=30, email='john.doe@example.com')
     """
 
+    def __init__(self, intern_strings: bool = True) -> None:
+        """
+        Initialize the converter.
+
+        Args:
+            intern_strings (bool): If True, first and last names, which repeat across
+                customers, are interned with `sys.intern`. Emails are unique and kept as read.
+        """
+        self.intern_strings = intern_strings
+        self._intern = sys.intern if intern_strings else _keep
+
     def convert(self, data: CustomerDataDict) -> Customer:
         """
         Convert the JSON-like dictionary data into a `Customer` object.
@@ -194,8 +295,8 @@ class CustomerConverter(AbstractConverter[CustomerDataDict, Customer]):
         """
         return Customer(
             id= data["id"],
-            first_name= data["first_name"],
-            last_name= data["last_name"],
+            first_name= self._intern(data["first_name"]),
+            last_name= self._intern(data["last_name"]),
             age= data["age"],
             email= data["email"]   
         )
@@ -209,6 +310,12 @@ class OrderConverter(AbstractConverter[OrderDataDict, Order]):
     for converting `OrderDataDict` (a dictionary representation of an order) 
     into an `Order` object.
 
+    Attributes:
+        fixed_point (bool): If True, the discount is parsed as a fixed-point `Discount`, stored in
+            basis points on the order, and the `Decimal` discount is rounded to four decimal places.
+        pool_values (bool): If True, orders with the same discount string share one `Decimal`
+            (or `Discount`) object from a bounded `ValuePool`.
+
     Methods:
         - convert(data: OrderDataDict) -> Order:
             Converts a dictionary containing order data into an `Order` object.
@@ -228,6 +335,21 @@ class OrderConverter(AbstractConverter[OrderDataDict, Order]):
         Order(id=1001, customer_id=1, product_id=101, quantity=2, discount=Decimal('0.10'), shipping_method=<ShippingMethod.STANDARD: 'Standard'>)
     """
 
+    def __init__(self, fixed_point: bool = False, pool_values: bool = True) -> None:
+        """
+        Initialize the converter.
+
+        Args:
+            fixed_point (bool): If True, parse money values as fixed-point integers.
+            pool_values (bool): If True, share the objects of repeated discounts.
+        """
+        self.fixed_point = fixed_point
+        self.pool_values = pool_values
+        self._discounts: Callable[[str], Decimal] = ValuePool(Decimal).get if pool_values else Decimal
+        self._discount_rates: Callable[[str], Discount] = (
+            ValuePool(Discount.parse).get if pool_values else Discount.parse
+        )
+
     def convert(self, data: OrderDataDict) -> Order:
         """
         Convert the JSON-like dictionary data into an `Order` object.
@@ -266,11 +388,93 @@ class OrderConverter(AbstractConverter[OrderDataDict, Order]):
             >>> print(order)
             Order(id=1001, customer_id=1, product_id=101, quantity=2, discount=Decimal('0.10'), shipping_method=<ShippingMethod.STANDARD: 'Standard'>)
         """
+        if self.fixed_point:
+            discount = self._discount_rates(data["discount"])
+            return Order(
+                id= data["id"],
+                customer_id= data["customer_id"],
+                product_id= data["product_id"],
+                quantity= data["quantity"],
+                discount= discount.to_decimal(),
+                shipping_method=ShippingMethod(data["shipping_method"]),
+                discount_basis_points=discount.basis_points
+            )
         return Order(
             id= data["id"],
             customer_id= data["customer_id"],
             product_id= data["product_id"],
             quantity= data["quantity"],
-            discount= Decimal(data["discount"]),
+            discount= self._discounts(data["discount"]),
             shipping_method=ShippingMethod(data["shipping_method"])
-        )
\ No newline at end of file
+        )
+
+class ProjectedOrderConverter(AbstractConverter[OrderDataDict, ProjectedOrder]):
+    """
+    A converter transforming JSON-like order data into a `ProjectedOrder` holding only declared fields.
+
+    The id, references and quantity are always projected; the discount and the
+    shipping method are only parsed when declared. Use it together with an
+    `OrderDataDictValidator` whose `required_fields` are the same fields, so the
+    undeclared fields are neither validated nor converted.
+
+    Attributes:
+        fields (tuple[str, ...]): The projected fields.
+        pool_values (bool): If True, orders with the same discount string share one `Decimal`.
+
+    Methods:
+        - convert(data: OrderDataDict) -> ProjectedOrder:
+            Converts the declared fields of an order into a `ProjectedOrder`.
+
+    Example Usage:
+        >>> converter = ProjectedOrderConverter(SUMMARY_ORDER_FIELDS)
+        >>> converter.convert({"id": 1001, "customer_id": 1, "product_id": 101, "quantity": 2,
+        ...                    "discount": "0.10", "shipping_method": "Standard"})
+        ProjectedOrder(id=1001, customer_id=1, product_id=101, quantity=2, discount=None, shipping_method=None)
+    """
+
+    def __init__(self, fields: Iterable[str] = SUMMARY_ORDER_FIELDS, pool_values: bool = True) -> None:
+        """
+        Initialize the converter.
+
+        Args:
+            fields (Iterable[str]): The projected fields, a superset of `SUMMARY_ORDER_FIELDS`.
+            pool_values (bool): If True, share the objects of repeated discounts.
+
+        Raises:
+            ValueError: If a field is not an order field or a summary field is missing.
+        """
+        self.fields = tuple(fields)
+        unknown = [name for name in self.fields if name not in ORDER_FIELDS]
+        missing = [name for name in SUMMARY_ORDER_FIELDS if name not in self.fields]
+        if unknown or missing:
+            raise ValueError(f"Invalid order projection, unknown fields {unknown}, missing fields {missing}.")
+        self.pool_values = pool_values
+        self._discounts: Callable[[str], Decimal] | None = None
+        if "discount" in self.fields:
+            self._discounts = ValuePool(Decimal).get if pool_values else Decimal
+        self._shipping_methods = "shipping_method" in self.fields
+
+    def convert(self, data: OrderDataDict) -> ProjectedOrder:
+        """
+        Convert the declared fields of an order into a `ProjectedOrder`.
+
+        Args:
+            data (OrderDataDict): A dictionary containing at least the projected fields.
+
+        Returns:
+            ProjectedOrder: The projected order, undeclared fields are None.
+
+        Raises:
+            KeyError: If a projected field is missing from the input dictionary.
+            ValueError: If a projected `shipping_method` is not a `ShippingMethod` value.
+        """
+        if self._discounts is None and not self._shipping_methods:
+            return ProjectedOrder(data["id"], data["customer_id"], data["product_id"], data["quantity"])
+        return ProjectedOrder(
+            data["id"],
+            data["customer_id"],
+            data["product_id"],
+            data["quantity"],
+            self._discounts(data["discount"]) if self._discounts is not None else None,
+            ShippingMethod(data["shipping_method"]) if self._shipping_methods else None
+        )
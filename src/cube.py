@@ -0,0 +1,205 @@
+from array import array
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Iterable, Literal
+import math
+
+from src.model import Customer, Order, Product, ProductCategory, ShippingMethod
+
+CubeDimension = Literal["age_band", "category", "shipping_method"]
+CubeKey = int | ProductCategory | ShippingMethod
+
+CATEGORIES = list(ProductCategory)
+SHIPPING_METHODS = list(ShippingMethod)
+
+
+@dataclass
+class PurchaseCube:
+    """
+    Dense aggregate cube of order quantity and revenue over age band x category x shipping method.
+
+    The cells are stored in flat row-major arrays, `quantities` as a typed `array('q')`
+    and `revenue` as a list of `Decimal`, so slices and roll-ups touch only the cells
+    and never the orders. Age bands split the range `[min_age, max_age]` into intervals
+    of `band_width` years; band `i` starts at `min_age + i * band_width`.
+
+    Attributes:
+        min_age (int): The lowest age of the first band.
+        max_age (int): The highest age of the last band.
+        band_width (int): The number of ages in one band.
+        quantities (array[int]): Ordered quantity of every cell.
+        revenue (list[Decimal]): Revenue of every cell.
+
+    Methods:
+        from_orders(orders, customers, products, min_age, max_age, band_width) -> PurchaseCube:
+            Build the cube in one pass over orders.
+        band_of(age: int) -> int:
+            Return the age band of an age.
+        band_range(band: int) -> tuple[int, int]:
+            Return the lowest and highest age of a band.
+        slice(age_band, category, shipping_method) -> tuple[int, Decimal]:
+            Return the quantity and revenue of the cells matching the fixed coordinates.
+        rollup(*dimensions: CubeDimension) -> dict[tuple[CubeKey, ...], tuple[int, Decimal]]:
+            Aggregate the cube to the given dimensions.
+    """
+    min_age: int
+    max_age: int
+    band_width: int = 10
+    quantities: array = field(default_factory=lambda: array('q'))
+    revenue: list[Decimal] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        """
+        Allocate empty cells.
+
+        Raises:
+            ValueError: If the age range or the band width is invalid.
+        """
+        if self.max_age < self.min_age or self.band_width < 1:
+            raise ValueError("Invalid age range or band width.")
+        cells = self.bands * len(CATEGORIES) * len(SHIPPING_METHODS)
+        if not self.quantities:
+            self.quantities = array('q', bytes(8 * cells))
+            self.revenue = [Decimal("0.0")] * cells
+
+    @property
+    def bands(self) -> int:
+        """
+        Return the number of age bands.
+        """
+        return math.ceil((self.max_age - self.min_age + 1) / self.band_width)
+
+    @classmethod
+    def from_orders(
+            cls,
+            orders: Iterable[Order],
+            customers: dict[int, Customer],
+            products: dict[int, Product],
+            min_age: int,
+            max_age: int,
+            band_width: int = 10) -> "PurchaseCube":
+        """
+        Build the cube in one pass over orders.
+
+        Age bands, category and price are resolved once per customer and product,
+        so every order only costs an index computation and two additions.
+
+        Args:
+            orders (Iterable[Order]): Orders with valid customer and product references.
+            customers (dict[int, Customer]): Known customers by id.
+            products (dict[int, Product]): Known products by id.
+            min_age (int): The lowest age of the first band.
+            max_age (int): The highest age of the last band.
+            band_width (int): The number of ages in one band.
+
+        Returns:
+            PurchaseCube: The built cube.
+        """
+        cube = cls(min_age, max_age, band_width)
+        shipping_count = len(SHIPPING_METHODS)
+        band_stride = len(CATEGORIES) * shipping_count
+        customer_offsets = {customer_id: cube.band_of(customer.age) * band_stride
+                            for customer_id, customer in customers.items()}
+        product_cells = {product_id: (CATEGORIES.index(product.category) * shipping_count, product.price)
+                         for product_id, product in products.items()}
+        shipping_offsets = {method: index for index, method in enumerate(SHIPPING_METHODS)}
+
+        quantities, revenue = cube.quantities, cube.revenue
+        for order in orders:
+            category_offset, price = product_cells[order.product_id]
+            cell = customer_offsets[order.customer_id] + category_offset + shipping_offsets[order.shipping_method]
+            quantities[cell] += order.quantity
+            revenue[cell] += price * order.quantity
+        return cube
+
+    def band_of(self, age: int) -> int:
+        """
+        Return the age band of an age; ages outside the range fall into the edge bands.
+
+        Args:
+            age (int): The age.
+
+        Returns:
+            int: The band index.
+        """
+        return min(max(age - self.min_age, 0) // self.band_width, self.bands - 1)
+
+    def band_range(self, band: int) -> tuple[int, int]:
+        """
+        Return the lowest and highest age of a band.
+
+        Args:
+            band (int): The band index.
+
+        Returns:
+            tuple[int, int]: The inclusive age range.
+        """
+        start = self.min_age + band * self.band_width
+        return start, min(start + self.band_width - 1, self.max_age)
+
+    def slice(
+            self,
+            age_band: int | None = None,
+            category: ProductCategory | None = None,
+            shipping_method: ShippingMethod | None = None) -> tuple[int, Decimal]:
+        """
+        Return the quantity and revenue of the cells matching the fixed coordinates.
+
+        Args:
+            age_band (int | None): The band index, all bands when None.
+            category (ProductCategory | None): The category, all categories when None.
+            shipping_method (ShippingMethod | None): The shipping method, all methods when None.
+
+        Returns:
+            tuple[int, Decimal]: The total quantity and revenue of the slice.
+        """
+        quantity, revenue = 0, Decimal("0.0")
+        for cell in self._cells(age_band, category, shipping_method):
+            quantity += self.quantities[cell]
+            revenue += self.revenue[cell]
+        return quantity, revenue
+
+    def rollup(self, *dimensions: CubeDimension) -> dict[tuple[CubeKey, ...], tuple[int, Decimal]]:
+        """
+        Aggregate the cube to the given dimensions.
+
+        Args:
+            *dimensions (CubeDimension): The kept dimensions, in key order. All other
+                dimensions are summed out; no dimensions give the grand total.
+
+        Returns:
+            dict[tuple[CubeKey, ...], tuple[int, Decimal]]: Quantity and revenue by the
+            coordinates of the kept dimensions, only for non-empty groups.
+        """
+        totals: dict[tuple[CubeKey, ...], tuple[int, Decimal]] = {}
+        for band in range(self.bands):
+            for category in CATEGORIES:
+                for method in SHIPPING_METHODS:
+                    cell = self._cell(band, category, method)
+                    if not self.quantities[cell]:
+                        continue
+                    coordinates: dict[str, CubeKey] = {"age_band": band, "category": category, "shipping_method": method}
+                    key = tuple(coordinates[dimension] for dimension in dimensions)
+                    quantity, revenue = totals.get(key, (0, Decimal("0.0")))
+                    totals[key] = quantity + self.quantities[cell], revenue + self.revenue[cell]
+        return totals
+
+    def _cell(self, band: int, category: ProductCategory, shipping_method: ShippingMethod) -> int:
+        """
+        Return the flat index of a cell.
+        """
+        return ((band * len(CATEGORIES) + CATEGORIES.index(category)) * len(SHIPPING_METHODS)
+                + SHIPPING_METHODS.index(shipping_method))
+
+    def _cells(
+            self,
+            age_band: int | None,
+            category: ProductCategory | None,
+            shipping_method: ShippingMethod | None) -> Iterable[int]:
+        """
+        Return the flat indices of the cells matching the fixed coordinates.
+        """
+        bands = range(self.bands) if age_band is None else [age_band]
+        categories = CATEGORIES if category is None else [category]
+        methods = SHIPPING_METHODS if shipping_method is None else [shipping_method]
+        return [self._cell(band, cat, method) for band in bands for cat in categories for method in methods]
@@ -0,0 +1,240 @@
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Any, Iterable, Iterator
+import argparse
+import json
+import os
+import random
+
+from src.model import (
+    ProductDataDict,
+    CustomerDataDict,
+    OrderDataDict,
+    ProductCategory,
+    ShippingMethod
+)
+
+FIRST_NAMES = ["John", "Jane", "Adam", "Eva", "Piotr", "Anna", "Marek", "Kasia", "Tom", "Lucy"]
+LAST_NAMES = ["Doe", "Smith", "Kowalski", "Nowak", "Brown", "Wilson", "Lewandowski", "Taylor"]
+EMAIL_DOMAINS = ["example.com", "mail.com", "shop.pl", "post.org"]
+
+
+@dataclass(frozen=True)
+class DatasetConfig:
+    """
+    Configuration of a synthetic dataset.
+
+    Attributes:
+        products (int): The number of products.
+        customers (int): The number of customers.
+        orders (int): The number of orders.
+        product_skew (float): Exponent of the Zipf distribution of product popularity (0 means uniform).
+        customer_skew (float): Shape of the Pareto distribution of customer activity,
+            lower values give a heavier tail.
+        invalid_rate (float): Fraction of rows in every file which fail validation.
+        dangling_rate (float): Fraction of orders referencing a customer or product which does not exist.
+        min_age (int): The minimum age of a valid customer.
+        max_age (int): The maximum age of a valid customer.
+        seed (int): The seed which makes the generated data deterministic.
+        chunk_size (int): The number of orders sampled at once.
+    """
+    products: int = 1_000
+    customers: int = 10_000
+    orders: int = 100_000
+    product_skew: float = 1.1
+    customer_skew: float = 1.5
+    invalid_rate: float = 0.0
+    dangling_rate: float = 0.0
+    min_age: int = 18
+    max_age: int = 65
+    seed: int = 0
+    chunk_size: int = 10_000
+
+
+def generate_products(config: DatasetConfig) -> Iterator[ProductDataDict]:
+    """
+    Generate product records.
+
+    Args:
+        config (DatasetConfig): The dataset configuration.
+
+    Yields:
+        ProductDataDict: Product records, a fraction `config.invalid_rate` of them invalid.
+    """
+    rng = random.Random(f"{config.seed}-products")
+    categories = [category.value for category in ProductCategory]
+    for product_id in range(1, config.products + 1):
+        category = rng.choice(categories)
+        product: ProductDataDict = {
+            "id": product_id,
+            "name": f"{category} item {rng.randint(1, max(1, config.products // 10))}",
+            "category": category,
+            "price": f"{rng.randint(100, 500_000) / 100:.2f}"
+        }
+        if rng.random() < config.invalid_rate:
+            _corrupt(rng, product, {"price": ["-10.00", "0", "abc"]})
+        yield product
+
+
+def generate_customers(config: DatasetConfig) -> Iterator[CustomerDataDict]:
+    """
+    Generate customer records.
+
+    Args:
+        config (DatasetConfig): The dataset configuration.
+
+    Yields:
+        CustomerDataDict: Customer records, a fraction `config.invalid_rate` of them invalid.
+    """
+    rng = random.Random(f"{config.seed}-customers")
+    for customer_id in range(1, config.customers + 1):
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        customer: CustomerDataDict = {
+            "id": customer_id,
+            "first_name": first_name,
+            "last_name": last_name,
+            "age": rng.randint(config.min_age, config.max_age),
+            "email": f"{first_name.lower()}.{last_name.lower()}{customer_id}@{rng.choice(EMAIL_DOMAINS)}"
+        }
+        if rng.random() < config.invalid_rate:
+            _corrupt(rng, customer, {"age": [config.min_age - 100, config.max_age + 1, config.max_age + 50]})
+        yield customer
+
+
+def generate_orders(config: DatasetConfig) -> Iterator[OrderDataDict]:
+    """
+    Generate order records.
+
+    Product popularity follows a Zipf distribution over a random ranking of products
+    and customer activity follows Pareto distributed weights, so a few products and
+    customers account for most orders. Only the cumulative weights are kept in memory,
+    orders are sampled in chunks of `config.chunk_size`.
+
+    Args:
+        config (DatasetConfig): The dataset configuration.
+
+    Yields:
+        OrderDataDict: Order records, a fraction `config.invalid_rate` of them invalid and
+        a fraction `config.dangling_rate` of them referencing missing customers or products.
+    """
+    rng = random.Random(f"{config.seed}-orders")
+    product_ids = list(range(1, config.products + 1))
+    rng.shuffle(product_ids)
+    product_weights = list(accumulate(1 / rank ** config.product_skew for rank in range(1, config.products + 1)))
+    customer_ids = list(range(1, config.customers + 1))
+    customer_weights = list(accumulate(rng.paretovariate(config.customer_skew) for _ in customer_ids))
+    shipping_methods = [method.value for method in ShippingMethod]
+
+    order_id = 0
+    while order_id < config.orders:
+        size = min(config.chunk_size, config.orders - order_id)
+        products = rng.choices(product_ids, cum_weights=product_weights, k=size)
+        customers = rng.choices(customer_ids, cum_weights=customer_weights, k=size)
+        for customer_id, product_id in zip(customers, products):
+            order_id += 1
+            order: OrderDataDict = {
+                "id": order_id,
+                "customer_id": customer_id,
+                "product_id": product_id,
+                "quantity": rng.randint(1, 10),
+                "discount": f"{rng.randint(0, 50) / 100:.2f}",
+                "shipping_method": rng.choice(shipping_methods)
+            }
+            if rng.random() < config.dangling_rate:
+                if rng.random() < 0.5:
+                    order["customer_id"] = config.customers + rng.randint(1, config.customers)
+                else:
+                    order["product_id"] = config.products + rng.randint(1, config.products)
+            if rng.random() < config.invalid_rate:
+                _corrupt(rng, order, {"discount": ["1.50", "-0.10", "abc"]})
+            yield order
+
+
+def write_json_array(file_name: str, records: Iterable[Any]) -> int:
+    """
+    Stream records into a JSON array file without building the list in memory.
+
+    Args:
+        file_name (str): The name of the file to write to.
+        records (Iterable[Any]): JSON serializable records.
+
+    Returns:
+        int: The number of written records.
+    """
+    count = 0
+    with open(file_name, 'w', encoding='utf-8') as file:
+        file.write("[")
+        for record in records:
+            file.write(",\n" if count else "\n")
+            file.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+        file.write("\n]\n")
+    return count
+
+
+def write_dataset(directory: str, config: DatasetConfig) -> dict[str, str]:
+    """
+    Write products.json, customers.json and orders.json into a directory.
+
+    Args:
+        directory (str): The output directory, created when missing.
+        config (DatasetConfig): The dataset configuration.
+
+    Returns:
+        dict[str, str]: A mapping of dataset name ("products", "customers", "orders") to file path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {name: os.path.join(directory, f"{name}.json") for name in ("products", "customers", "orders")}
+    write_json_array(paths["products"], generate_products(config))
+    write_json_array(paths["customers"], generate_customers(config))
+    write_json_array(paths["orders"], generate_orders(config))
+    return paths
+
+
+def _corrupt(rng: random.Random, record: Any, invalid_values: dict[str, list[Any]]) -> None:
+    """
+    Make a record invalid by removing a required key or setting an out of range value.
+    """
+    if rng.random() < 0.5:
+        del record[rng.choice([key for key in record if key != "id"])]
+    else:
+        key, values = rng.choice(list(invalid_values.items()))
+        record[key] = rng.choice(values)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Generate a dataset from the command line.
+
+    Args:
+        argv (list[str] | None): Command line arguments, defaults to `sys.argv[1:]`.
+    """
+    defaults = DatasetConfig()
+    parser = argparse.ArgumentParser(description="Generate a synthetic products/customers/orders dataset.")
+    parser.add_argument("directory", help="Output directory.")
+    parser.add_argument("--products", type=int, default=defaults.products)
+    parser.add_argument("--customers", type=int, default=defaults.customers)
+    parser.add_argument("--orders", type=int, default=defaults.orders)
+    parser.add_argument("--product-skew", type=float, default=defaults.product_skew)
+    parser.add_argument("--customer-skew", type=float, default=defaults.customer_skew)
+    parser.add_argument("--invalid-rate", type=float, default=defaults.invalid_rate)
+    parser.add_argument("--dangling-rate", type=float, default=defaults.dangling_rate)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args(argv)
+    config = DatasetConfig(
+        products=args.products,
+        customers=args.customers,
+        orders=args.orders,
+        product_skew=args.product_skew,
+        customer_skew=args.customer_skew,
+        invalid_rate=args.invalid_rate,
+        dangling_rate=args.dangling_rate,
+        seed=args.seed
+    )
+    for name, path in write_dataset(args.directory, config).items():
+        print(f"{name}: {path}")
+
+
+if __name__ == "__main__":
+    main()
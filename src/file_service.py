@@ -1,8 +1,12 @@
-from typing import override
+from typing import Iterator, override
 import json
 from abc import ABC
 
 from src.model import ProductDataDict, CustomerDataDict, OrderDataDict
+from src.metrics import instrumented
+
+JSON_LINES_SUFFIXES = (".jsonl", ".ndjson")
+JSON_WHITESPACE = " \t\n\r"
 
 class FileReader[T]:
     """
@@ -17,6 +21,8 @@ class FileReader[T]:
     Methods:
         - read(file_name: str) -> list[T]:
             Reads data from a file and returns it as a list of objects of type `T`.
+        - stream(file_name: str, chunk_size: int = 65536) -> Iterator[T]:
+            Reads data from a file one object at a time.
 
     Example Usage:
         To create a concrete file reader, subclass `FileReader` and specify the type `T`.
@@ -25,10 +31,14 @@ class FileReader[T]:
         ...     pass
     """
 
+    @instrumented("file_reader.read")
     def read(self, file_name: str) -> list[T]:
         """
         Read data from a file and return it as a list of objects.
 
+        Files with a `.jsonl` or `.ndjson` extension are read as JSON Lines,
+        one object per line, other files as a single JSON array.
+
         Args:
             file_name (str): The name of the file to read.
 
@@ -40,7 +50,63 @@ class FileReader[T]:
             JSONDecodeError: If the file contains invalid JSON.
         """
         with open(file_name, 'r', encoding='utf-8') as file:
+            if file_name.endswith(JSON_LINES_SUFFIXES):
+                return [json.loads(line) for line in file if line.strip()]
             return json.load(file)    
+
+    def stream(self, file_name: str, chunk_size: int = 64 * 1024) -> Iterator[T]:
+        """
+        Read data from a file one object at a time.
+
+        JSON arrays are decoded incrementally from chunks of the file, so only
+        the current chunk is kept in memory, regardless of the file size.
+
+        Args:
+            file_name (str): The name of the file to read.
+            chunk_size (int): The number of characters read at once.
+
+        Yields:
+            T: Objects of type `T` in file order.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            JSONDecodeError: If the file contains invalid JSON.
+        """
+        with open(file_name, 'r', encoding='utf-8') as file:
+            if file_name.endswith(JSON_LINES_SUFFIXES):
+                for line in file:
+                    if line.strip():
+                        yield json.loads(line)
+                return
+
+            decoder = json.JSONDecoder()
+            buffer = ""
+            while not buffer and (chunk := file.read(chunk_size)):
+                buffer = chunk.lstrip(JSON_WHITESPACE)
+            if not buffer.startswith("["):
+                raise json.JSONDecodeError("Expecting '['", buffer, 0)
+            position = 1
+            eof = False
+            while True:
+                while position < len(buffer) and buffer[position] in JSON_WHITESPACE + ",":
+                    position += 1
+                if position < len(buffer) and buffer[position] == "]":
+                    return
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                    complete = end < len(buffer) or eof
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    complete = False
+                if complete:
+                    yield item
+                    position = end
+                    continue
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
         
 class ProductJsonFileReader(FileReader[ProductDataDict]):
     """
@@ -0,0 +1,176 @@
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Collection, Iterable, Sequence
+
+from src.model import Customer, Order, OrderDataDict, Product, ProductCategory, ShippingMethod
+
+
+@dataclass(frozen=True)
+class OrderFilter:
+    """
+    Conditions selecting the orders a query is computed over.
+
+    Every condition left as None accepts all orders; the given conditions must all
+    hold. Any collection can be passed, e.g. a list of categories or a set of ids;
+    collections are stored as frozensets and ranges as tuples, so a filter is hashable
+    and can be part of a result cache key.
+
+    Conditions on customers and products, i.e. the age range and the categories, are
+    resolved to sets of accepted ids once per query, so orders are tested by integer
+    membership only. `row_predicate` applies them to raw order entries, which lets a
+    repository or a stream skip rejected orders before validating and converting them.
+
+    Attributes:
+        categories (Collection[ProductCategory] | None): Accepted product categories.
+        shipping_methods (Collection[ShippingMethod] | None): Accepted shipping methods.
+        age_range (Sequence[int] | None): Inclusive range of accepted customer ages, a (low, high) pair.
+        customer_ids (Collection[int] | None): Accepted customer ids.
+        product_ids (Collection[int] | None): Accepted product ids.
+        discount_range (Sequence[Decimal] | None): Inclusive range of accepted discounts, a (low, high) pair.
+
+    Methods:
+        unrestricted -> bool:
+            True if the filter accepts every order.
+        accepted_customers(customers: Iterable[Customer]) -> Collection[int] | None:
+            Return the ids of the accepted customers, None when all are accepted.
+        accepted_products(products: Iterable[Product]) -> Collection[int] | None:
+            Return the ids of the accepted products, None when all are accepted.
+        order_predicate(customers, products) -> Callable[[Order], bool]:
+            Return a test of converted orders.
+        row_predicate(customers, products) -> Callable[[OrderDataDict], bool]:
+            Return a test of raw order entries, applied before validation and conversion.
+    """
+    categories: Collection[ProductCategory] | None = None
+    shipping_methods: Collection[ShippingMethod] | None = None
+    age_range: Sequence[int] | None = None
+    customer_ids: Collection[int] | None = None
+    product_ids: Collection[int] | None = None
+    discount_range: Sequence[Decimal] | None = None
+
+    def __post_init__(self) -> None:
+        """
+        Store the collections as frozensets and the ranges as tuples.
+        """
+        for name in ("categories", "shipping_methods", "customer_ids", "product_ids"):
+            value = getattr(self, name)
+            if value is not None:
+                object.__setattr__(self, name, frozenset(value))
+        for name in ("age_range", "discount_range"):
+            value = getattr(self, name)
+            if value is not None:
+                object.__setattr__(self, name, tuple(value))
+
+    @property
+    def unrestricted(self) -> bool:
+        """
+        Return True if the filter accepts every order.
+        """
+        return all(value is None for value in (
+            self.categories, self.shipping_methods, self.age_range,
+            self.customer_ids, self.product_ids, self.discount_range
+        ))
+
+    def accepted_customers(self, customers: Iterable[Customer]) -> Collection[int] | None:
+        """
+        Return the ids of the accepted customers.
+
+        Args:
+            customers (Iterable[Customer]): The known customers.
+
+        Returns:
+            Collection[int] | None: The accepted ids, None when customers are not restricted.
+        """
+        if self.age_range is None:
+            return self.customer_ids
+        low, high = self.age_range
+        return frozenset(
+            customer.id for customer in customers
+            if low <= customer.age <= high and (self.customer_ids is None or customer.id in self.customer_ids)
+        )
+
+    def accepted_products(self, products: Iterable[Product]) -> Collection[int] | None:
+        """
+        Return the ids of the accepted products.
+
+        Args:
+            products (Iterable[Product]): The known products.
+
+        Returns:
+            Collection[int] | None: The accepted ids, None when products are not restricted.
+        """
+        if self.categories is None:
+            return self.product_ids
+        return frozenset(
+            product.id for product in products
+            if product.category in self.categories and (self.product_ids is None or product.id in self.product_ids)
+        )
+
+    def order_predicate(self, customers: Iterable[Customer], products: Iterable[Product]) -> Callable[[Order], bool]:
+        """
+        Return a test of converted orders.
+
+        Args:
+            customers (Iterable[Customer]): The known customers.
+            products (Iterable[Product]): The known products.
+
+        Returns:
+            Callable[[Order], bool]: Returns True for the accepted orders.
+        """
+        customer_ids = self.accepted_customers(customers)
+        product_ids = self.accepted_products(products)
+        methods = self.shipping_methods
+        low, high = self.discount_range or (None, None)
+
+        def accepts(order: Order) -> bool:
+            return ((customer_ids is None or order.customer_id in customer_ids)
+                    and (product_ids is None or order.product_id in product_ids)
+                    and (methods is None or order.shipping_method in methods)
+                    and (low is None or high is None or low <= order.discount <= high))
+        return accepts
+
+    def row_predicate(
+            self,
+            customers: Iterable[Customer],
+            products: Iterable[Product]) -> Callable[[OrderDataDict], bool]:
+        """
+        Return a test of raw order entries, applied before validation and conversion.
+
+        Only well-formed values are tested: an entry whose tested field is missing or
+        malformed is accepted, so it still reaches the validator and is reported as invalid.
+
+        Args:
+            customers (Iterable[Customer]): The known customers.
+            products (Iterable[Product]): The known products.
+
+        Returns:
+            Callable[[OrderDataDict], bool]: Returns False for the entries of rejected orders.
+        """
+        customer_ids = self.accepted_customers(customers)
+        product_ids = self.accepted_products(products)
+        methods = None if self.shipping_methods is None else {method.value for method in self.shipping_methods}
+        known_methods = {method.value for method in ShippingMethod}
+        discount_range = self.discount_range
+
+        def accepts(entry: OrderDataDict) -> bool:
+            if customer_ids is not None and _is_id(entry.get("customer_id")) and entry["customer_id"] not in customer_ids:
+                return False
+            if product_ids is not None and _is_id(entry.get("product_id")) and entry["product_id"] not in product_ids:
+                return False
+            method = entry.get("shipping_method")
+            if methods is not None and isinstance(method, str) and method in known_methods and method not in methods:
+                return False
+            if discount_range is not None:
+                try:
+                    discount = Decimal(entry["discount"])
+                except (KeyError, TypeError, ValueError, InvalidOperation):
+                    return True
+                return discount.is_nan() or discount_range[0] <= discount <= discount_range[1]
+            return True
+        return accepts
+
+
+def _is_id(value: Any) -> bool:
+    """
+    Return True if a raw value is an integer id.
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
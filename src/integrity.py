@@ -0,0 +1,195 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import compress
+from operator import attrgetter
+from typing import Iterable, Sequence
+import logging
+
+from src.model import SummaryOrder
+
+# Ids are stored in a bitmap when the largest id is below this many times the number of ids
+DENSE_ID_RATIO = 8
+
+_INVERT = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+_customer_id = attrgetter("customer_id")
+_product_id = attrgetter("product_id")
+
+
+@dataclass
+class IdMembership:
+    """
+    Bulk membership test of integer ids against a known id set.
+
+    Compact non-negative ids, e.g. 1..n, are stored in a dense `bytearray` bitmap with
+    one byte per possible id; sparse ids fall back to a `set`. `mask` tests a whole
+    column of ids in one `map` over a C-level lookup, without a Python loop per id.
+
+    Attributes:
+        bitmap (bytearray | None): 1 at the position of every known id, None for sparse ids.
+        ids (frozenset[int]): The known ids when they are sparse, empty otherwise.
+
+    Methods:
+        from_ids(ids: Iterable[int]) -> IdMembership:
+            Choose the representation for a set of ids.
+        mask(values: Sequence[int]) -> bytes:
+            Return 1 for every value which is a known id, 0 otherwise.
+    """
+    bitmap: bytearray | None = None
+    ids: frozenset[int] = field(default_factory=frozenset)
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> "IdMembership":
+        """
+        Choose the representation for a set of ids.
+
+        Args:
+            ids (Iterable[int]): The known ids.
+
+        Returns:
+            IdMembership: A bitmap for compact non-negative ids, a set otherwise.
+        """
+        known = list(ids)
+        if known and min(known) >= 0 and max(known) < DENSE_ID_RATIO * len(known):
+            bitmap = bytearray(max(known) + 1)
+            for id_ in known:
+                bitmap[id_] = 1
+            return cls(bitmap=bitmap)
+        return cls(ids=frozenset(known))
+
+    def __contains__(self, value: object) -> bool:
+        if self.bitmap is None:
+            return value in self.ids
+        return type(value) is int and 0 <= value < len(self.bitmap) and self.bitmap[value] == 1
+
+    def mask(self, values: Sequence[int]) -> bytes:
+        """
+        Return 1 for every value which is a known id, 0 otherwise.
+
+        Non-negative int values within the bitmap are looked up in one `map`; any other
+        value, e.g. an id beyond the largest known id or a non-int id, is a miss and the
+        values are then tested one by one, so the bitmap never grows with the values.
+
+        Args:
+            values (Sequence[int]): The tested values.
+
+        Returns:
+            bytes: One byte per value, in order.
+        """
+        if self.bitmap is None:
+            return bytes(map(self.ids.__contains__, values))
+        if not values:
+            return b""
+        try:
+            if min(values) >= 0:
+                return bytes(map(self.bitmap.__getitem__, values))
+        except (IndexError, TypeError):
+            pass
+        mask = bytearray(len(values))
+        for position, value in enumerate(values):
+            if value in self:
+                mask[position] = 1
+        return bytes(mask)
+
+
+@dataclass
+class IntegrityReport:
+    """
+    Result of checking the customer and product references of all orders at once.
+
+    Attributes:
+        valid (bytes): 1 for every order, by position, whose customer and product exist.
+        dangling_customers (Counter[int]): Number of orders by unknown customer id.
+        dangling_products (Counter[int]): Number of orders by unknown product id.
+
+    Methods:
+        orders / invalid_orders -> int:
+            The number of checked orders and of orders with a dangling reference.
+        valid_orders(orders: Sequence[O]) -> list[O]:
+            Return the checked orders with valid references.
+        invalid_positions() -> list[int]:
+            Return the positions of the orders with a dangling reference.
+        log_summary(source: str) -> None:
+            Log the number of invalid orders and the most frequent offending ids.
+    """
+    valid: bytes
+    dangling_customers: Counter[int] = field(default_factory=Counter)
+    dangling_products: Counter[int] = field(default_factory=Counter)
+
+    @property
+    def orders(self) -> int:
+        """
+        Return the number of checked orders.
+        """
+        return len(self.valid)
+
+    @property
+    def invalid_orders(self) -> int:
+        """
+        Return the number of orders with a dangling customer or product reference.
+        """
+        return len(self.valid) - self.valid.count(1)
+
+    def valid_orders[O: SummaryOrder](self, orders: Sequence[O]) -> list[O]:
+        """
+        Return the checked orders with valid references, in order.
+
+        Args:
+            orders (Sequence[O]): The orders the report was computed for.
+
+        Returns:
+            list[O]: The orders whose customer and product exist.
+        """
+        return list(compress(orders, self.valid))
+
+    def invalid_positions(self) -> list[int]:
+        """
+        Return the positions of the orders with a dangling reference.
+        """
+        return list(compress(range(len(self.valid)), self.valid.translate(_INVERT)))
+
+    def log_summary(self, source: str, top: int = 10) -> None:
+        """
+        Log the number of invalid orders and the most frequent offending ids in one line.
+
+        Args:
+            source (str): A description of the checked orders.
+            top (int): The number of offending ids listed per reference.
+        """
+        if not self.invalid_orders:
+            return
+        logging.warning(
+            "%s: %d of %d orders have invalid references; unknown customers %s, unknown products %s.",
+            source, self.invalid_orders, self.orders,
+            self.dangling_customers.most_common(top), self.dangling_products.most_common(top)
+        )
+
+
+def check_order_references(
+        orders: Sequence[SummaryOrder],
+        customers: IdMembership,
+        products: IdMembership) -> IntegrityReport:
+    """
+    Check the customer and product references of all orders in one bulk pass.
+
+    Each foreign key column is extracted and tested with a single `map`, so the
+    cost per order is a few C-level calls instead of Python bytecode.
+
+    Args:
+        orders (Sequence[SummaryOrder]): The orders to check.
+        customers (IdMembership): The known customer ids.
+        products (IdMembership): The known product ids.
+
+    Returns:
+        IntegrityReport: The validity mask and the offending ids.
+    """
+    customer_ids = list(map(_customer_id, orders))
+    product_ids = list(map(_product_id, orders))
+    customer_mask = customers.mask(customer_ids)
+    product_mask = products.mask(product_ids)
+    # Both masks hold only 0 and 1 bytes, so a bitwise AND of them as big integers is a bytewise AND
+    valid = (int.from_bytes(customer_mask) & int.from_bytes(product_mask)).to_bytes(len(customer_mask))
+    report = IntegrityReport(valid)
+    if report.invalid_orders:
+        report.dangling_customers.update(compress(customer_ids, customer_mask.translate(_INVERT)))
+        report.dangling_products.update(compress(product_ids, product_mask.translate(_INVERT)))
+    return report
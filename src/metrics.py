@@ -0,0 +1,359 @@
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Callable, Sized
+import os
+import re
+import time
+
+if TYPE_CHECKING:
+    import socket
+
+
+class AbstractMetricsSink(ABC):
+    """
+    Abstract base class for metrics sinks.
+
+    A sink receives counters, timings and gauges recorded by the instrumented
+    pipeline stages. Stages check `enabled` before measuring anything, so a
+    disabled sink costs a single attribute lookup per stage.
+
+    Attributes:
+        enabled (bool): Whether the instrumented stages should record metrics.
+
+    Methods:
+        increment(name: str, value: int = 1) -> None:
+            Increase a counter.
+        timing(name: str, seconds: float) -> None:
+            Record a duration.
+        gauge(name: str, value: float) -> None:
+            Set a gauge to the given value.
+        flush() -> None:
+            Push buffered metrics to their destination.
+        stage_started(stage: str) -> None / stage_finished(stage: str) -> None:
+            Hooks called when a measured stage is entered and left.
+    """
+    enabled: bool = True
+
+    @abstractmethod
+    def increment(self, name: str, value: int = 1) -> None:
+        """
+        Increase a counter.
+        """
+        pass
+
+    @abstractmethod
+    def timing(self, name: str, seconds: float) -> None:
+        """
+        Record a duration in seconds.
+        """
+        pass
+
+    @abstractmethod
+    def gauge(self, name: str, value: float) -> None:
+        """
+        Set a gauge to the given value.
+        """
+        pass
+
+    def flush(self) -> None:
+        """
+        Push buffered metrics to their destination.
+        """
+        pass
+
+    def stage_started(self, stage: str) -> None:
+        """
+        Called when a measured stage is entered, before its timer starts.
+        """
+        pass
+
+    def stage_finished(self, stage: str) -> None:
+        """
+        Called when a measured stage is left, after its metrics are recorded.
+        """
+        pass
+
+
+class NullMetricsSink(AbstractMetricsSink):
+    """
+    Sink which discards everything. Used when instrumentation is disabled.
+    """
+    enabled = False
+
+    def increment(self, name: str, value: int = 1) -> None:
+        pass
+
+    def timing(self, name: str, seconds: float) -> None:
+        pass
+
+    def gauge(self, name: str, value: float) -> None:
+        pass
+
+
+@dataclass
+class InMemoryMetricsRegistry(AbstractMetricsSink):
+    """
+    Sink which keeps all metrics in memory.
+
+    Attributes:
+        counters (Counter[str]): Counter values by name.
+        timings (dict[str, list[float]]): Recorded durations by name.
+        gauges (dict[str, float]): Last gauge values by name.
+
+    Methods:
+        snapshot() -> dict[str, Any]:
+            Return a copy of all recorded metrics.
+        reset() -> None:
+            Remove all recorded metrics.
+    """
+    counters: Counter[str] = field(default_factory=Counter)
+    timings: dict[str, list[float]] = field(default_factory=dict)
+    gauges: dict[str, float] = field(default_factory=dict)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def timing(self, name: str, seconds: float) -> None:
+        self.timings.setdefault(name, []).append(seconds)
+
+    def gauge(self, name: str, value: float) -> None:
+        self.gauges[name] = value
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Return a copy of all recorded metrics.
+
+        Returns:
+            dict[str, Any]: Counters, timings and gauges keyed by metric name.
+        """
+        return {
+            "counters": dict(self.counters),
+            "timings": {name: list(values) for name, values in self.timings.items()},
+            "gauges": dict(self.gauges)
+        }
+
+    def reset(self) -> None:
+        """
+        Remove all recorded metrics.
+        """
+        self.counters.clear()
+        self.timings.clear()
+        self.gauges.clear()
+
+
+@dataclass
+class PrometheusTextFileSink(InMemoryMetricsRegistry):
+    """
+    Sink which writes metrics in the Prometheus text exposition format.
+
+    Metrics are aggregated in memory and written on `flush`. The file is replaced
+    atomically, so it can be scraped by the node_exporter textfile collector.
+
+    Attributes:
+        file_name (str): The name of the exposition file.
+        prefix (str): The prefix of every metric name.
+    """
+    file_name: str = "metrics.prom"
+    prefix: str = "pipeline"
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            metric = self._metric_name(name) + "_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, values in sorted(self.timings.items()):
+            metric = self._metric_name(name) + "_seconds"
+            lines += [
+                f"# TYPE {metric} summary",
+                f"{metric}_count {len(values)}",
+                f"{metric}_sum {sum(values)}"
+            ]
+        for name, gauge in sorted(self.gauges.items()):
+            metric = self._metric_name(name)
+            lines += [f"# TYPE {metric} gauge", f"{metric} {gauge}"]
+        return "\n".join(lines) + "\n"
+
+    def flush(self) -> None:
+        """
+        Write the exposition file.
+        """
+        tmp_file_name = f"{self.file_name}.tmp"
+        with open(tmp_file_name, 'w', encoding='utf-8') as file:
+            file.write(self.render())
+        os.replace(tmp_file_name, self.file_name)
+
+    def _metric_name(self, name: str) -> str:
+        return re.sub(r"[^a-zA-Z0-9_:]", "_", f"{self.prefix}_{name}")
+
+
+@dataclass
+class StatsDSink(AbstractMetricsSink):
+    """
+    Sink which sends metrics to a StatsD daemon over UDP.
+
+    Sending is fire-and-forget, a missing daemon never breaks the pipeline.
+
+    Attributes:
+        host (str): The StatsD host.
+        port (int): The StatsD port.
+        prefix (str): The prefix of every metric name.
+    """
+    host: str = "127.0.0.1"
+    port: int = 8125
+    prefix: str = "pipeline"
+    _socket: "socket.socket" = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """
+        Open the UDP socket.
+        """
+        import socket
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self._send(f"{self.prefix}.{name}:{value}|c")
+
+    def timing(self, name: str, seconds: float) -> None:
+        self._send(f"{self.prefix}.{name}:{seconds * 1000:.3f}|ms")
+
+    def gauge(self, name: str, value: float) -> None:
+        self._send(f"{self.prefix}.{name}:{value}|g")
+
+    def close(self) -> None:
+        """
+        Close the UDP socket.
+        """
+        self._socket.close()
+
+    def _send(self, packet: str) -> None:
+        try:
+            self._socket.sendto(packet.encode("utf-8"), (self.host, self.port))
+        except OSError:
+            pass
+
+
+_sink: AbstractMetricsSink = NullMetricsSink()
+
+
+def set_metrics_sink(sink: AbstractMetricsSink | None) -> None:
+    """
+    Set the sink used by all instrumented stages.
+
+    Args:
+        sink (AbstractMetricsSink | None): The new sink, None disables instrumentation.
+    """
+    global _sink
+    _sink = sink if sink is not None else NullMetricsSink()
+
+
+def get_metrics_sink() -> AbstractMetricsSink:
+    """
+    Return the sink used by all instrumented stages.
+    """
+    return _sink
+
+
+class StageTimer:
+    """
+    Context manager measuring a single execution of a pipeline stage.
+
+    On exit it records `<stage>.calls`, `<stage>.duration` and, when `rows`
+    was set inside the block, `<stage>.rows` and `<stage>.rows_per_second`.
+
+    Attributes:
+        sink (AbstractMetricsSink): The sink receiving the metrics.
+        stage (str): The name of the stage.
+        rows (int | None): The number of rows processed by the stage.
+    """
+
+    def __init__(self, sink: AbstractMetricsSink, stage: str) -> None:
+        self.sink = sink
+        self.stage = stage
+        self.rows: int | None = None
+        self._start = 0.0
+
+    def __enter__(self) -> "StageTimer":
+        self.sink.stage_started(self.stage)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        elapsed = time.perf_counter() - self._start
+        self.sink.increment(f"{self.stage}.calls")
+        self.sink.timing(f"{self.stage}.duration", elapsed)
+        if self.rows is not None:
+            self.sink.increment(f"{self.stage}.rows", self.rows)
+            if elapsed > 0:
+                self.sink.gauge(f"{self.stage}.rows_per_second", self.rows / elapsed)
+        self.sink.stage_finished(self.stage)
+
+
+class _NullStageTimer(StageTimer):
+    """
+    Stage timer which records nothing, shared by all stages while instrumentation is disabled.
+    """
+
+    def __enter__(self) -> StageTimer:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.rows = None
+
+
+_NULL_TIMER = _NullStageTimer(NullMetricsSink(), "")
+
+
+def measure(stage: str) -> StageTimer:
+    """
+    Measure a pipeline stage.
+
+    Args:
+        stage (str): The name of the stage.
+
+    Returns:
+        StageTimer: A context manager recording the stage metrics, or a shared no-op timer
+        when instrumentation is disabled.
+
+    Example:
+        >>> with measure("purchase_summary.build") as stage:
+        ...     stage.rows = 10
+    """
+    sink = _sink
+    if not sink.enabled:
+        return _NULL_TIMER
+    return StageTimer(sink, stage)
+
+
+def instrumented[F: Callable[..., Any]](stage: str) -> Callable[[F], F]:
+    """
+    Decorator measuring every call of a function as a pipeline stage.
+
+    When the result is sized, its length is recorded as the number of processed rows.
+
+    Args:
+        stage (str): The name of the stage.
+
+    Returns:
+        Callable[[F], F]: The decorator.
+    """
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            sink = _sink
+            if not sink.enabled:
+                return func(*args, **kwargs)
+            with StageTimer(sink, stage) as timer:
+                result = func(*args, **kwargs)
+                if isinstance(result, Sized):
+                    timer.rows = len(result)
+            return result
+        return wrapper  # type: ignore[return-value]
+    return decorator
@@ -1,7 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import TypedDict
+from typing import Any, NamedTuple, Protocol, TypedDict
 from enum import Enum
+from src.money import Discount, Money
 
 class ProductDataDict(TypedDict):
     """
@@ -89,17 +90,23 @@ class Product:
         name (str): The name of the product.
         category (ProductCategory): The category of the product.
         price (Decimal): The price of the product.
+        price_minor (int | None): The price in minor units, set by a fixed-point converter.
 
     Methods:
         total_price(quantity: int) -> Decimal:
             Calculate the total price for a given quantity of the product.
+        money -> Money:
+            Return the price as fixed-point `Money`.
         to_dict() -> ProductDataDict:
             Convert the product instance to a dictionary.
+        __hash__() -> int:
+            Hash the product by its id.
     """
     id: int
     name: str
     category: ProductCategory
     price: Decimal
+    price_minor: int | None = field(default=None, compare=False, repr=False)
 
     def total_price(self, quantity: int) -> Decimal:
         """
@@ -113,6 +120,27 @@ class Product:
         """
         return self.price * quantity
 
+    @property
+    def money(self) -> Money:
+        """
+        Return the price as fixed-point `Money`, converting the `Decimal` price when no
+        minor-unit price was stored.
+        """
+        return Money(self.price_minor) if self.price_minor is not None else Money.from_decimal(self.price)
+
+    def __hash__(self) -> int:
+        """
+        Hash the product by its id.
+
+        Equal products always have equal ids, so this is consistent with the generated
+        `__eq__`, while avoiding hashing the name, category and `Decimal` price on every
+        dictionary lookup.
+
+        Returns:
+            int: The hash of the product id.
+        """
+        return hash(self.id)
+
     def to_dict(self) -> ProductDataDict:
         """
         Convert the product to a dictionary.
@@ -142,12 +170,23 @@ class Customer:
     Methods:
         to_dict() -> CustomerDataDict:
             Convert the customer instance to a dictionary.
+        __hash__() -> int:
+            Hash the customer by its id.
     """
     id: int
     first_name: str
     last_name: str
     age: int
     email: str
+
+    def __hash__(self) -> int:
+        """
+        Hash the customer by its id, equal customers always share it.
+
+        Returns:
+            int: The hash of the customer id.
+        """
+        return hash(self.id)
     
     def to_dict(self) -> CustomerDataDict:
         """
@@ -177,8 +216,11 @@ class Order:
         quantity (int): The quantity of the product ordered.
         discount (Decimal): The discount applied to the order.
         shipping_method (ShippingMethod): The shipping method for the order.
+        discount_basis_points (int | None): The discount in basis points, set by a fixed-point converter.
 
     Methods:
+        discount_rate -> Discount:
+            Return the discount as a fixed-point `Discount`.
         to_dict() -> OrderDataDict:
             Convert the order instance to a dictionary.
     """
@@ -188,6 +230,17 @@ class Order:
     quantity: int
     discount: Decimal
     shipping_method: ShippingMethod
+    discount_basis_points: int | None = field(default=None, compare=False, repr=False)
+
+    @property
+    def discount_rate(self) -> Discount:
+        """
+        Return the discount as a fixed-point `Discount`, converting the `Decimal` discount
+        when no basis points were stored.
+        """
+        if self.discount_basis_points is not None:
+            return Discount(self.discount_basis_points)
+        return Discount.from_decimal(self.discount)
 
     def to_dict(self) -> OrderDataDict:
         """
@@ -203,4 +256,73 @@ class Order:
             "quantity": self.quantity,
             "discount": str(self.discount),
             "shipping_method": self.shipping_method.value
-        }
\ No newline at end of file
+        }
+
+ORDER_FIELDS = tuple(OrderDataDict.__annotations__)
+SUMMARY_ORDER_FIELDS = ("id", "customer_id", "product_id", "quantity")
+
+
+class SummaryOrder(Protocol):
+    """
+    The fields of an order a purchase summary is built from, `SUMMARY_ORDER_FIELDS`.
+
+    Both `Order` and `ProjectedOrder` provide them.
+    """
+    @property
+    def id(self) -> int: ...
+
+    @property
+    def customer_id(self) -> int: ...
+
+    @property
+    def product_id(self) -> int: ...
+
+    @property
+    def quantity(self) -> int: ...
+
+    def to_dict(self) -> Any: ...
+
+
+class ProjectedOrder(NamedTuple):
+    """
+    Lightweight order holding only the fields declared by a projection.
+
+    The id, references and quantity are always present, they are copied from the raw
+    entry without conversion. `discount` and `shipping_method` are None unless they
+    were declared, so a summary-only load never parses them. Being a tuple, a
+    projected order has no instance dictionary and is cheaper to create than `Order`.
+
+    Attributes:
+        id (int): The unique identifier of the order.
+        customer_id (int): The ID of the customer who placed the order.
+        product_id (int): The ID of the product in the order.
+        quantity (int): The quantity of the product ordered.
+        discount (Decimal | None): The discount, None when not projected.
+        shipping_method (ShippingMethod | None): The shipping method, None when not projected.
+
+    Methods:
+        to_dict() -> dict[str, Any]:
+            Convert the projected fields to a dictionary in the raw `OrderDataDict` format.
+    """
+    id: int
+    customer_id: int
+    product_id: int
+    quantity: int
+    discount: Decimal | None = None
+    shipping_method: ShippingMethod | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the projected fields to a dictionary in the raw `OrderDataDict` format.
+
+        Returns:
+            dict[str, Any]: The fields which were projected.
+        """
+        data: dict[str, Any] = {
+            "id": self.id, "customer_id": self.customer_id, "product_id": self.product_id, "quantity": self.quantity
+        }
+        if self.discount is not None:
+            data["discount"] = str(self.discount)
+        if self.shipping_method is not None:
+            data["shipping_method"] = self.shipping_method.value
+        return data
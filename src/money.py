@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+import re
+
+MONEY_SCALE = 2
+DISCOUNT_SCALE = 4
+
+_PLAIN_NUMBER = re.compile(r"(-?)(\d+)(?:\.(\d*))?")
+
+
+def parse_scaled(text: str, scale: int) -> int:
+    """
+    Parse a decimal string to an integer number of `10 ** -scale` units.
+
+    Plain numbers are parsed with integer arithmetic only; other notations go through
+    `Decimal`. Digits beyond the scale are rounded half to even.
+
+    Args:
+        text (str): The decimal string, e.g. "1500.00".
+        scale (int): The number of decimal places of one unit.
+
+    Returns:
+        int: The value in units.
+
+    Raises:
+        ValueError: If the string is not a finite number.
+    """
+    match = _PLAIN_NUMBER.fullmatch(text.strip())
+    if match is not None:
+        sign, whole, fraction = match.group(1), match.group(2), match.group(3) or ""
+        digits = int(whole + fraction.ljust(scale, "0")[:scale])
+        rest = fraction[scale:]
+        if rest.strip("0"):
+            half = "5".ljust(len(rest), "0")
+            if rest > half or (rest == half and digits % 2):
+                digits += 1
+        return -digits if sign else digits
+    try:
+        value = Decimal(text)
+    except InvalidOperation as e:
+        raise ValueError(f"Invalid decimal value: {text!r}") from e
+    return scale_decimal(value, scale)
+
+
+def scale_decimal(value: Decimal, scale: int) -> int:
+    """
+    Convert a `Decimal` to an integer number of `10 ** -scale` units, rounding half to even.
+
+    Args:
+        value (Decimal): The value.
+        scale (int): The number of decimal places of one unit.
+
+    Returns:
+        int: The value in units.
+
+    Raises:
+        ValueError: If the value is not finite.
+    """
+    if not value.is_finite():
+        raise ValueError(f"Invalid decimal value: {value}")
+    return int(value.scaleb(scale).to_integral_value(ROUND_HALF_EVEN))
+
+
+def format_scaled(units: int, scale: int) -> str:
+    """
+    Format an integer number of `10 ** -scale` units as a decimal string.
+    """
+    sign = "-" if units < 0 else ""
+    whole, fraction = divmod(abs(units), 10 ** scale)
+    return f"{sign}{whole}.{fraction:0{scale}d}"
+
+
+@dataclass(frozen=True, order=True, slots=True)
+class Discount:
+    """
+    Discount rate stored as an integer number of basis points (1/10000).
+
+    Attributes:
+        basis_points (int): The rate in basis points, e.g. 1000 for "0.1".
+
+    Methods:
+        parse(text: str) -> Discount:
+            Parse the string discount of an `OrderDataDict`.
+        from_decimal(value: Decimal) -> Discount / to_decimal() -> Decimal:
+            Convert from and to `Decimal`.
+    """
+    basis_points: int
+
+    @classmethod
+    def parse(cls, text: str) -> "Discount":
+        """
+        Parse the string discount of an `OrderDataDict`, rounding to basis points half to even.
+        """
+        return cls(parse_scaled(text, DISCOUNT_SCALE))
+
+    @classmethod
+    def from_decimal(cls, value: Decimal) -> "Discount":
+        """
+        Convert a `Decimal` rate, rounding to basis points half to even.
+        """
+        return cls(scale_decimal(value, DISCOUNT_SCALE))
+
+    def to_decimal(self) -> Decimal:
+        """
+        Return the rate as a `Decimal` with four decimal places.
+        """
+        return Decimal(self.basis_points).scaleb(-DISCOUNT_SCALE)
+
+    def __str__(self) -> str:
+        """
+        Format the rate with four decimal places, e.g. "0.1000".
+        """
+        return format_scaled(self.basis_points, DISCOUNT_SCALE)
+
+
+@dataclass(frozen=True, order=True, slots=True)
+class Money:
+    """
+    Amount of money stored as an integer number of minor units (cents).
+
+    Addition, subtraction and multiplication by an integer quantity are exact.
+    Conversions from values with more than two decimal places, and applying a
+    discount, round half to even, which is also the `Decimal` default.
+
+    Attributes:
+        minor (int): The amount in minor units, e.g. 150000 for "1500.00".
+
+    Methods:
+        parse(text: str) -> Money:
+            Parse the string price of a `ProductDataDict`.
+        from_decimal(value: Decimal) -> Money / to_decimal() -> Decimal:
+            Convert from and to `Decimal`.
+        apply_discount(discount: Discount) -> Money:
+            Return the amount reduced by a discount rate.
+    """
+    minor: int
+
+    @classmethod
+    def parse(cls, text: str) -> "Money":
+        """
+        Parse the string price of a `ProductDataDict`, rounding to minor units half to even.
+        """
+        return cls(parse_scaled(text, MONEY_SCALE))
+
+    @classmethod
+    def from_decimal(cls, value: Decimal) -> "Money":
+        """
+        Convert a `Decimal` amount, rounding to minor units half to even.
+        """
+        return cls(scale_decimal(value, MONEY_SCALE))
+
+    def to_decimal(self) -> Decimal:
+        """
+        Return the amount as a `Decimal` with two decimal places.
+        """
+        return Decimal(self.minor).scaleb(-MONEY_SCALE)
+
+    def apply_discount(self, discount: Discount) -> "Money":
+        """
+        Return the amount reduced by a discount rate, rounded half to even.
+
+        Args:
+            discount (Discount): The discount rate.
+
+        Returns:
+            Money: The discounted amount.
+        """
+        numerator = self.minor * (10 ** DISCOUNT_SCALE - discount.basis_points)
+        quotient, remainder = divmod(numerator, 10 ** DISCOUNT_SCALE)
+        twice = 2 * remainder
+        if twice > 10 ** DISCOUNT_SCALE or (twice == 10 ** DISCOUNT_SCALE and quotient % 2):
+            quotient += 1
+        return Money(quotient)
+
+    def __add__(self, other: "Money") -> "Money":
+        """
+        Add two amounts.
+        """
+        return Money(self.minor + other.minor)
+
+    def __sub__(self, other: "Money") -> "Money":
+        """
+        Subtract an amount.
+        """
+        return Money(self.minor - other.minor)
+
+    def __mul__(self, quantity: int) -> "Money":
+        """
+        Multiply the amount by an integer quantity.
+        """
+        return Money(self.minor * quantity)
+
+    __rmul__ = __mul__
+
+    def __str__(self) -> str:
+        """
+        Format the amount with two decimal places, e.g. "1500.00".
+        """
+        return format_scaled(self.minor, MONEY_SCALE)
@@ -0,0 +1,338 @@
+from dataclasses import dataclass, field
+from typing import Iterable, TypedDict
+import argparse
+import json
+import logging
+
+from src.converter import OrderConverter
+from src.file_service import OrderJsonFileReader
+from src.changes import AppliedChanges
+from src.model import Order
+from src.repository import OrderDataRepository, OrderSource, PurchaseSummaryRepository, CustomerProductQuantities
+from src.validator import OrderDataDictValidator
+
+PARTIAL_SUMMARY_VERSION = 1
+NO_ORDERS_MESSAGE = ("The orders were summarized on other nodes, only the purchase summary "
+                     "of a merged partial summary is available.")
+
+
+class PartialSummaryDataDict(TypedDict):
+    """
+    Typed dictionary for a serialized partial purchase summary.
+
+    Attributes:
+        version (int): The version of the format.
+        quantities (dict[str, dict[str, int]]): Quantities by customer id and product id.
+    """
+    version: int
+    quantities: dict[str, dict[str, int]]
+
+
+@dataclass
+class PartialPurchaseSummary:
+    """
+    Partial aggregate of orders which can be merged with other partial aggregates.
+
+    Every ingestion node summarizes its own slice of orders; merging the partial
+    summaries of all slices, in any grouping and order, gives the summary of all
+    orders. References are not checked on the nodes, the final
+    `PartialPurchaseSummaryRepository` skips unknown customers and products.
+
+    Attributes:
+        quantities (CustomerProductQuantities): Quantities by customer id and product id.
+
+    Methods:
+        add(customer_id: int, product_id: int, quantity: int) -> None:
+            Add the quantity of one order.
+        merge(other: PartialPurchaseSummary) -> PartialPurchaseSummary:
+            Return a new summary combining both summaries.
+        update(other: PartialPurchaseSummary) -> None:
+            Add the quantities of another summary in place.
+        from_orders(orders: Iterable[Order]) -> PartialPurchaseSummary:
+            Summarize orders.
+        to_dict() -> PartialSummaryDataDict / from_dict(data) -> PartialPurchaseSummary:
+            Convert to and from the serialized format.
+        write(file_name: str) -> None / read(file_name: str) -> PartialPurchaseSummary:
+            Store and load the summary as a JSON file.
+    """
+    quantities: CustomerProductQuantities = field(default_factory=dict)
+
+    def add(self, customer_id: int, product_id: int, quantity: int) -> None:
+        """
+        Add the quantity of one order.
+
+        Args:
+            customer_id (int): The id of the customer.
+            product_id (int): The id of the product.
+            quantity (int): The ordered quantity.
+        """
+        purchases = self.quantities.get(customer_id)
+        if purchases is None:
+            purchases = self.quantities[customer_id] = {}
+        purchases[product_id] = purchases.get(product_id, 0) + quantity
+
+    def merge(self, other: "PartialPurchaseSummary") -> "PartialPurchaseSummary":
+        """
+        Return a new summary combining both summaries.
+
+        The operation is associative and commutative, and the empty summary is its identity.
+
+        Args:
+            other (PartialPurchaseSummary): The summary to merge with.
+
+        Returns:
+            PartialPurchaseSummary: The merged summary, neither operand is modified.
+        """
+        merged = PartialPurchaseSummary(
+            quantities={customer_id: dict(purchases) for customer_id, purchases in self.quantities.items()}
+        )
+        merged.update(other)
+        return merged
+
+    def update(self, other: "PartialPurchaseSummary") -> None:
+        """
+        Add the quantities of another summary in place.
+
+        Unlike `merge`, nothing is copied, so folding N summaries into one accumulator
+        costs time proportional to their total size.
+
+        Args:
+            other (PartialPurchaseSummary): The summary to add, it is not modified.
+        """
+        for customer_id, purchases in other.quantities.items():
+            target = self.quantities.get(customer_id)
+            if target is None:
+                self.quantities[customer_id] = dict(purchases)
+                continue
+            for product_id, quantity in purchases.items():
+                target[product_id] = target.get(product_id, 0) + quantity
+
+    @classmethod
+    def from_orders(cls, orders: Iterable[Order]) -> "PartialPurchaseSummary":
+        """
+        Summarize orders.
+
+        Args:
+            orders (Iterable[Order]): The orders of one slice.
+
+        Returns:
+            PartialPurchaseSummary: The partial summary of the orders.
+        """
+        summary = cls()
+        for order in orders:
+            summary.add(order.customer_id, order.product_id, order.quantity)
+        return summary
+
+    def to_dict(self) -> PartialSummaryDataDict:
+        """
+        Convert the summary to the serialized format.
+
+        Returns:
+            PartialSummaryDataDict: A JSON serializable dictionary.
+        """
+        return {
+            "version": PARTIAL_SUMMARY_VERSION,
+            "quantities": {
+                str(customer_id): {str(product_id): quantity for product_id, quantity in purchases.items()}
+                for customer_id, purchases in self.quantities.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: PartialSummaryDataDict) -> "PartialPurchaseSummary":
+        """
+        Create a summary from the serialized format.
+
+        Args:
+            data (PartialSummaryDataDict): The serialized summary.
+
+        Returns:
+            PartialPurchaseSummary: The deserialized summary.
+
+        Raises:
+            ValueError: If the format version is not supported.
+        """
+        if data.get("version") != PARTIAL_SUMMARY_VERSION:
+            raise ValueError(f"Unsupported partial summary version: {data.get('version')}")
+        return cls(
+            quantities={
+                int(customer_id): {int(product_id): quantity for product_id, quantity in purchases.items()}
+                for customer_id, purchases in data["quantities"].items()
+            }
+        )
+
+    def write(self, file_name: str) -> None:
+        """
+        Store the summary as a JSON file.
+
+        Args:
+            file_name (str): The name of the file to write to.
+        """
+        with open(file_name, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def read(cls, file_name: str) -> "PartialPurchaseSummary":
+        """
+        Load a summary from a JSON file.
+
+        Args:
+            file_name (str): The name of the file to read.
+
+        Returns:
+            PartialPurchaseSummary: The loaded summary.
+        """
+        with open(file_name, 'r', encoding='utf-8') as file:
+            return cls.from_dict(json.load(file))
+
+
+def build_partial_summary_file(orders_file: str, output_file: str) -> PartialPurchaseSummary:
+    """
+    Load, validate and convert an orders file and store its partial summary.
+
+    Args:
+        orders_file (str): The orders file of one slice.
+        output_file (str): The file receiving the partial summary.
+
+    Returns:
+        PartialPurchaseSummary: The partial summary of the slice.
+    """
+    order_repo = OrderDataRepository(
+        file_reader=OrderJsonFileReader(),
+        validator=OrderDataDictValidator(),
+        converter=OrderConverter(),
+        file_name=orders_file
+    )
+    summary = PartialPurchaseSummary.from_orders(order_repo.get_data())
+    summary.write(output_file)
+    return summary
+
+
+def merge_partial_summary_files(file_names: Iterable[str]) -> PartialPurchaseSummary:
+    """
+    Merge partial summary files.
+
+    Args:
+        file_names (Iterable[str]): The partial summary files.
+
+    Returns:
+        PartialPurchaseSummary: The merged summary.
+    """
+    merged = PartialPurchaseSummary()
+    for file_name in file_names:
+        merged.update(PartialPurchaseSummary.read(file_name))
+    return merged
+
+
+class NoOrders:
+    """
+    Order source of a repository which only has a merged partial summary.
+
+    Every access to the orders raises a `ValueError`, so queries which need the
+    orders fail explicitly instead of being computed from missing data.
+
+    Attributes:
+        version (int): Always 0, the orders never change.
+    """
+    version: int = 0
+
+    def get_data(self) -> list[Order]:
+        """
+        Raise, the orders were summarized on other nodes.
+
+        Raises:
+            ValueError: Always.
+        """
+        raise ValueError(NO_ORDERS_MESSAGE)
+
+    def append(self, item: Order) -> None:
+        """
+        Raise, orders cannot be added to a merged partial summary.
+
+        Raises:
+            ValueError: Always.
+        """
+        raise ValueError(NO_ORDERS_MESSAGE)
+
+    def apply_changes(self, file_name: str) -> AppliedChanges[Order]:
+        """
+        Raise, order changes cannot be applied to a merged partial summary.
+
+        Raises:
+            ValueError: Always.
+        """
+        raise ValueError(NO_ORDERS_MESSAGE)
+
+
+@dataclass
+class PartialPurchaseSummaryRepository[C, P, O](PurchaseSummaryRepository[C, P, O]):
+    """
+    Purchase summary repository serving a merged partial summary.
+
+    The orders were summarized on other nodes, so no order repository is needed.
+    Customers and products are resolved from their repositories and pairs referencing
+    an unknown customer or product are skipped, so `PurchasesSummaryService` can consume
+    this repository like the single-node one for the purchase summary queries.
+
+    Queries which need the individual orders, i.e. the rollups, the order quantity
+    quantiles, the cube, the order index, the filtered queries and adding or changing
+    orders, raise a `ValueError`.
+
+    Attributes:
+        order_repo (OrderSource): A `NoOrders` source, raising on every access.
+        partial (PartialPurchaseSummary): The merged partial summary.
+    """
+    order_repo: OrderSource = field(default_factory=NoOrders)
+    partial: PartialPurchaseSummary = field(default_factory=PartialPurchaseSummary)
+
+    def _build_summary_by_id(self) -> CustomerProductQuantities:
+        """
+        Internal method to resolve the partial summary against known customers and products.
+
+        Returns:
+            CustomerProductQuantities: A dictionary mapping customer ids to product ids and quantities.
+        """
+        customer_ids = {customer.id for customer in self.customer_repo.get_data()}
+        product_ids = {product.id for product in self.product_repo.get_data()}
+        summary: CustomerProductQuantities = {}
+        dangling = 0
+        for customer_id, purchases in self.partial.quantities.items():
+            for product_id, quantity in purchases.items():
+                if customer_id in customer_ids and product_id in product_ids:
+                    summary.setdefault(customer_id, {})[product_id] = quantity
+                else:
+                    dangling += 1
+                    logging.warning("Customer %s and product %s: invalid customer or product reference.",
+                                    customer_id, product_id)
+        self._finish_invalid_references(dangling)
+        return summary
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Build or merge partial summaries from the command line.
+
+    Args:
+        argv (list[str] | None): Command line arguments, defaults to `sys.argv[1:]`.
+    """
+    parser = argparse.ArgumentParser(description="Build and merge partial purchase summaries.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Summarize an orders file.")
+    build.add_argument("orders_file")
+    build.add_argument("-o", "--output", required=True)
+    merge = commands.add_parser("merge", help="Merge partial summary files.")
+    merge.add_argument("partial_files", nargs="+")
+    merge.add_argument("-o", "--output", required=True)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "build":
+        summary = build_partial_summary_file(args.orders_file, args.output)
+    else:
+        summary = merge_partial_summary_files(args.partial_files)
+        summary.write(args.output)
+    print(f"{args.output}: {len(summary.quantities)} customers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+import cProfile
+import logging
+import os
+import tracemalloc
+
+from src.metrics import AbstractMetricsSink, NullMetricsSink, get_metrics_sink, set_metrics_sink
+
+PROFILE_DIR_ENV = "PIPELINE_PROFILE_DIR"
+TRACE_MEMORY_ENV = "PIPELINE_TRACE_MEMORY"
+
+_IGNORED_FILES = (tracemalloc.__file__, cProfile.__file__, __file__, "<frozen importlib._bootstrap>")
+
+
+@dataclass
+class StageProfiler(AbstractMetricsSink):
+    """
+    Metrics sink which profiles every measured pipeline stage with cProfile and tracemalloc.
+
+    Every stage measured with `measure` or `instrumented` gets its own `cProfile.Profile`.
+    Nested stages pause the profile of the enclosing stage, so the time of a stage is
+    attributed to the innermost stage only, e.g. `file_reader.read` is not part of
+    `data_repository.process_data`. With `trace_memory`, a tracemalloc snapshot is taken
+    when a stage is entered and left, and the differences are summed by source line;
+    they include nested stages. Counters, timings and gauges are passed to `delegate`.
+
+    Attributes:
+        output_dir (str): The directory of the reports.
+        cpu (bool): If True, profile the stages with cProfile.
+        trace_memory (bool): If True, trace the allocations of the stages with tracemalloc.
+        top (int): The number of source lines in every allocation report.
+        delegate (AbstractMetricsSink): The sink receiving the stage metrics.
+
+    Methods:
+        write_reports() -> list[str]:
+            Write `<stage>.pstats` and `<stage>.allocations.txt` files and return their paths.
+    """
+    output_dir: str = "profiles"
+    cpu: bool = True
+    trace_memory: bool = False
+    top: int = 20
+    delegate: AbstractMetricsSink = field(default_factory=NullMetricsSink)
+    _profiles: dict[str, cProfile.Profile] = field(default_factory=dict, init=False, repr=False)
+    _stack: list[tuple[str, tracemalloc.Snapshot | None]] = field(default_factory=list, init=False, repr=False)
+    _allocations: dict[str, dict[str, list[int]]] = field(default_factory=dict, init=False, repr=False)
+    _started_tracing: bool = field(default=False, init=False, repr=False)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self.delegate.increment(name, value)
+
+    def timing(self, name: str, seconds: float) -> None:
+        self.delegate.timing(name, seconds)
+
+    def gauge(self, name: str, value: float) -> None:
+        self.delegate.gauge(name, value)
+
+    def flush(self) -> None:
+        """
+        Flush the delegate sink and write the reports.
+        """
+        self.delegate.flush()
+        self.write_reports()
+
+    def stage_started(self, stage: str) -> None:
+        """
+        Pause the profile of the enclosing stage and start profiling the entered stage.
+        """
+        if self.cpu and self._stack:
+            self._profiles[self._stack[-1][0]].disable()
+        snapshot = None
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            snapshot = tracemalloc.take_snapshot()
+        self._stack.append((stage, snapshot))
+        if self.cpu:
+            self._profiles.setdefault(stage, cProfile.Profile()).enable()
+
+    def stage_finished(self, stage: str) -> None:
+        """
+        Stop profiling the left stage and resume the profile of the enclosing stage.
+        """
+        if self.cpu:
+            self._profiles[stage].disable()
+        _, before = self._stack.pop()
+        if before is not None:
+            allocations = self._allocations.setdefault(stage, {})
+            for difference in tracemalloc.take_snapshot().compare_to(before, "lineno"):
+                frame = difference.traceback[0]
+                if frame.filename in _IGNORED_FILES:
+                    continue
+                totals = allocations.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+                totals[0] += difference.size_diff
+                totals[1] += difference.count_diff
+        if self.cpu and self._stack:
+            self._profiles[self._stack[-1][0]].enable()
+
+    def write_reports(self) -> list[str]:
+        """
+        Write the profile of every stage seen so far.
+
+        Returns:
+            list[str]: The paths of the written `.pstats` and `.allocations.txt` files.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        paths = []
+        for stage, profile in self._profiles.items():
+            paths.append(os.path.join(self.output_dir, f"{stage}.pstats"))
+            profile.dump_stats(paths[-1])
+        for stage, allocations in self._allocations.items():
+            paths.append(os.path.join(self.output_dir, f"{stage}.allocations.txt"))
+            ranked = sorted(allocations.items(), key=lambda item: abs(item[1][0]), reverse=True)[:self.top]
+            with open(paths[-1], 'w', encoding='utf-8') as file:
+                for line, (size_diff, count_diff) in ranked:
+                    file.write(f"{line}: size={size_diff / 1024:+.1f} KiB, count={count_diff:+d}\n")
+        if self._started_tracing and not self._stack:
+            tracemalloc.stop()
+            self._started_tracing = False
+        logging.info("Wrote %d profiling reports to %s.", len(paths), self.output_dir)
+        return paths
+
+
+@contextmanager
+def profiling(output_dir: str = "profiles", cpu: bool = True, trace_memory: bool = False) -> Iterator[StageProfiler]:
+    """
+    Profile every measured pipeline stage inside the block.
+
+    The current metrics sink keeps receiving the stage metrics. The reports are
+    written and the previous sink is restored when the block is left.
+
+    Args:
+        output_dir (str): The directory of the reports.
+        cpu (bool): If True, profile the stages with cProfile.
+        trace_memory (bool): If True, trace the allocations of the stages with tracemalloc.
+
+    Yields:
+        StageProfiler: The installed profiler.
+
+    Example:
+        >>> with profiling("profiles", trace_memory=True):
+        ...     repository.purchase_summary()
+    """
+    previous = get_metrics_sink()
+    profiler = StageProfiler(output_dir, cpu, trace_memory, delegate=previous)
+    set_metrics_sink(profiler)
+    try:
+        yield profiler
+    finally:
+        set_metrics_sink(previous)
+        profiler.write_reports()
+
+
+@contextmanager
+def profiling_from_env() -> Iterator[StageProfiler | None]:
+    """
+    Profile the block when the `PIPELINE_PROFILE_DIR` environment variable is set.
+
+    `PIPELINE_PROFILE_DIR` sets the report directory and enables cProfile;
+    `PIPELINE_TRACE_MEMORY=1` additionally enables tracemalloc.
+
+    Yields:
+        StageProfiler | None: The installed profiler, None when profiling is disabled.
+    """
+    output_dir = os.environ.get(PROFILE_DIR_ENV)
+    if not output_dir:
+        yield None
+        return
+    with profiling(output_dir, trace_memory=os.environ.get(TRACE_MEMORY_ENV, "") not in ("", "0")) as profiler:
+        yield profiler
@@ -0,0 +1,147 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, TextIO
+import json
+import logging
+
+REJECT_RULE_KEY = "_reject_rule"
+REJECT_SOURCE_KEY = "_reject_source"
+
+
+@dataclass
+class QuarantineWriter:
+    """
+    Dead-letter writer streaming rejected records to a JSON Lines file.
+
+    Every rejected record is written as one line: the original fields plus
+    `_reject_rule` (the failing validation rule) and `_reject_source` (the file
+    the record was read from). Validators and converters ignore the extra keys,
+    so a quarantine file can be corrected and re-ingested with
+    `DataRepository.refresh_data(file_name, append=True)`.
+
+    Records are written through a buffered file handle opened in append mode,
+    so memory usage does not depend on the number of rejects.
+
+    Attributes:
+        file_name (str): The name of the quarantine file.
+        buffer_size (int): The size of the write buffer in bytes.
+        written (int): The number of records written so far.
+
+    Methods:
+        write(record: Any, rule: str, source: str | None = None) -> None:
+            Write a rejected record.
+        flush() -> None:
+            Flush the write buffer to the file.
+        close() -> None:
+            Close the file.
+    """
+    file_name: str
+    buffer_size: int = 64 * 1024
+    written: int = 0
+    _file: TextIO | None = field(default=None, init=False, repr=False)
+
+    def write(self, record: Any, rule: str, source: str | None = None) -> None:
+        """
+        Write a rejected record.
+
+        Args:
+            record (Any): The rejected, JSON serializable record.
+            rule (str): The failing validation rule.
+            source (str | None): The name of the file the record was read from.
+        """
+        if self._file is None:
+            self._file = open(self.file_name, 'a', encoding='utf-8', buffering=self.buffer_size)
+        line = dict(record) if isinstance(record, dict) else {"record": record}
+        line[REJECT_RULE_KEY] = rule
+        line[REJECT_SOURCE_KEY] = source
+        self._file.write(json.dumps(line, ensure_ascii=False))
+        self._file.write("\n")
+        self.written += 1
+
+    def flush(self) -> None:
+        """
+        Flush the write buffer to the file.
+        """
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        """
+        Close the file. A later `write` opens it again in append mode.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "QuarantineWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+@dataclass
+class RejectCollector:
+    """
+    Collector aggregating rejected records instead of logging each of them.
+
+    Rejects are counted by reason and a bounded sample is kept for every reason.
+    `log_summary` emits a single log line per load.
+
+    Attributes:
+        sample_size (int): The maximum number of sample records kept per reason.
+        counts (Counter[str]): The number of rejects by reason.
+        samples (dict[str, list[Any]]): Sample rejected records by reason.
+
+    Methods:
+        reject(record: Any, reason: str) -> None:
+            Register a rejected record.
+        log_summary(source: str) -> dict[str, int]:
+            Log a single summary of collected rejects and start a new collection.
+    """
+    sample_size: int = 5
+    counts: Counter[str] = field(default_factory=Counter)
+    samples: dict[str, list[Any]] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        """
+        Return the number of collected rejects.
+        """
+        return self.counts.total()
+
+    def reject(self, record: Any, reason: str) -> None:
+        """
+        Register a rejected record.
+
+        Args:
+            record (Any): The rejected record.
+            reason (str): The reason of the rejection, e.g. the failing validation rule.
+        """
+        self.counts[reason] += 1
+        sample = self.samples.setdefault(reason, [])
+        if len(sample) < self.sample_size:
+            sample.append(record)
+
+    def log_summary(self, source: str) -> dict[str, int]:
+        """
+        Log a single summary of collected rejects and start a new collection.
+
+        Args:
+            source (str): The name of the processed source, used in the log message.
+
+        Returns:
+            dict[str, int]: The number of rejects by reason.
+        """
+        counts = dict(self.counts)
+        if counts:
+            logging.warning(
+                "Rejected %d entries from %s: %s; samples: %s",
+                self.total,
+                source,
+                ", ".join(f"{reason}={count}" for reason, count in counts.items()),
+                self.samples
+            )
+        self.counts.clear()
+        self.samples.clear()
+        return counts
@@ -1,22 +1,41 @@
 from abc import ABC
+from array import array
 from dataclasses import dataclass, field
-from collections import defaultdict
+from operator import attrgetter
+from collections.abc import Mapping, Sequence
+from typing import Callable, Protocol, cast, runtime_checkable
+from src.changes import AppliedChanges, ChangeOperation, Identified, split_change
 from src.file_service import FileReader
-from src.validator import Validator
+from src.validator import CustomerDataDictValidator, Validator
 from src.converter import AbstractConverter
+from src.metrics import get_metrics_sink, measure
+from src.rejects import QuarantineWriter, RejectCollector
+from src.rollups import PurchaseRollups
+from src.integrity import IdMembership, IntegrityReport, check_order_references
+from src.cube import PurchaseCube
+from src.bitmap_index import OrderBitmapIndex
+from src.filters import OrderFilter
 from src.model import (
     ProductDataDict,
     CustomerDataDict,
     OrderDataDict,
     Product,
     Customer,
-    Order
+    Order,
+    ProjectedOrder,
+    SummaryOrder,
+    SUMMARY_ORDER_FIELDS
 )
 import logging
 
-logging.basicConfig(level=logging.INFO)
-
 CustomersWithPurchesdProducts = dict[Customer, dict[Product, int]]
+CustomerProductQuantities = dict[int, dict[int, int]]
+# Read-only summary keyed by ids, a `CustomerProductQuantities` or a view answered from another structure
+CustomerProductQuantitiesView = Mapping[int, dict[int, int]]
+
+# Below this many orders per worker process, starting the pool and sending the orders
+# costs more than the parallel work saves, so fewer workers or the serial build are used
+MIN_ORDERS_PER_WORKER = 250_000
 
 @dataclass
 class DataRepository[T, U]:
@@ -28,13 +47,30 @@ class DataRepository[T, U]:
         validator (Validator[T]): The validator used to validate raw data.
         converter (AbstractConverter[T, U]): The converter used to transform raw data into domain objects.
         file_name (str | None): The name of the file containing the data.
+        reject_collector (RejectCollector | None): When set, invalid entries are aggregated by
+            the failing validation rule and summarized in a single log line instead of being
+            logged one by one.
+        quarantine (QuarantineWriter | None): When set, invalid entries are streamed to a
+            JSON Lines quarantine file together with the failing validation rule.
+        row_filter (Callable[[T], bool] | None): When set, raw entries for which it returns False
+            are skipped before validation and conversion, e.g. `OrderFilter.row_predicate`.
         _data (list[U]): Cached list of domain objects.
+        _index (dict[int, int]): Position of every cached domain object in `_data`, by id.
+        version (int): Incremented every time the cached data is refreshed or changed.
 
     Methods:
         get_data() -> list[U]:
             Retrieve cached data from the repository.
-        refresh_data(file_name: str | None = None) -> list[U]:
-            Refresh the data by re-reading and processing the file.
+        refresh_data(file_name: str | None = None, append: bool = False) -> list[U]:
+            Refresh the data by re-reading and processing the file, or append data from another file.
+        append(item: U) -> None:
+            Add a single domain object to the cached data.
+        get_by_id(item_id: int) -> U | None:
+            Return the cached domain object with the given id.
+        upsert(item: U) -> U | None / delete(item_id: int) -> U | None:
+            Replace, add or remove a single domain object by id.
+        apply_changes(file_name: str) -> AppliedChanges[U]:
+            Apply a change set of upsert and delete records.
         _process_data(file_name: str) -> list[U]:
             Internal method to read, validate, and convert raw data.
     """
@@ -42,7 +78,12 @@ class DataRepository[T, U]:
     validator: Validator[T]
     converter: AbstractConverter[T, U]
     file_name: str | None = None
+    reject_collector: RejectCollector | None = None
+    quarantine: QuarantineWriter | None = None
+    row_filter: Callable[[T], bool] | None = None
     _data: list[U] = field(default_factory=list)
+    _index: dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    version: int = field(default=0, init=False)
     
     def __post_init__(self) -> None:
         """
@@ -66,25 +107,160 @@ class DataRepository[T, U]:
         return self._data
 
     
-    def refresh_data(self, file_name: str | None = None) -> list[U]:
+    def refresh_data(self, file_name: str | None = None, append: bool = False) -> list[U]:
         """
         Refresh the data by re-reading and processing the file.
 
+        With `append=True` the entries read from `file_name` are added to the cached
+        data instead of replacing it, and the default file name is kept. This is used
+        to re-ingest corrected records from a quarantine file without re-reading the
+        whole source.
+
         Args:
             file_name (str | None): The name of the file to read. If None, the default file name is used.
+            append (bool): If True, append the processed entries to the cached data.
 
         Returns:
             list[U]: A list of refreshed domain objects.
+
+        Raises:
+            ValueError: If `append` is True and no file name is provided.
         """
+        if append:
+            if file_name is None:
+                raise ValueError("No filename to append from.")
+            logging.info("Appending data from %s...", file_name)
+            self._data.extend(self._index_unique(file_name, self._process_data(file_name), len(self._data)))
+            self.version += 1
+            return self._data
+
         if file_name is None:
             logging.warning("No filename provided. Using the default filename.")
         else:
             self.file_name = file_name
 
-        logging.info(f"Refreshing data from {self.file_name}...")
-        self._data = self._process_data(str(self.file_name))
+        logging.info("Refreshing data from %s...", self.file_name)
+        self._index = {}
+        self._data = self._index_unique(str(self.file_name), self._process_data(str(self.file_name)), 0)
+        self.version += 1
         return self._data
 
+    def append(self, item: U) -> None:
+        """
+        Add a single domain object to the cached data.
+
+        Args:
+            item (U): An already validated domain object.
+
+        Raises:
+            ValueError: If an object with the same id is already cached.
+        """
+        item_id = cast(Identified, item).id
+        if item_id in self._index:
+            raise ValueError(f"Duplicate id: {item_id}")
+        self._index[item_id] = len(self._data)
+        self._data.append(item)
+        self.version += 1
+
+    def get_by_id(self, item_id: int) -> U | None:
+        """
+        Return the cached domain object with the given id.
+
+        Args:
+            item_id (int): The id.
+
+        Returns:
+            U | None: The domain object, None if the id is unknown.
+        """
+        position = self._index.get(item_id)
+        return None if position is None else self._data[position]
+
+    def upsert(self, item: U) -> U | None:
+        """
+        Replace the cached domain object with the same id, or add the object if its id is new.
+
+        Args:
+            item (U): An already validated domain object.
+
+        Returns:
+            U | None: The replaced domain object, None if the object was added.
+        """
+        previous = self._upsert(item)
+        self.version += 1
+        return previous
+
+    def delete(self, item_id: int) -> U | None:
+        """
+        Remove the cached domain object with the given id.
+
+        The last object is moved into the freed position, so a delete costs O(1)
+        but does not preserve the order of the cached data.
+
+        Args:
+            item_id (int): The id.
+
+        Returns:
+            U | None: The removed domain object, None if the id is unknown.
+        """
+        removed = self._delete(item_id)
+        if removed is not None:
+            self.version += 1
+        return removed
+
+    def apply_changes(self, file_name: str) -> AppliedChanges[U]:
+        """
+        Apply a change set of upsert and delete records in O(number of records).
+
+        Every record is a raw entry with an additional `op` field, "upsert" or "delete".
+        Upserted entries are validated and converted like loaded ones; invalid records
+        and deletes of unknown ids are rejected, logged and quarantined. Records are
+        applied in file order, so a later record for the same id wins.
+
+        Args:
+            file_name (str): The name of the change-set file, read with `file_reader`.
+
+        Returns:
+            AppliedChanges[U]: The inserted, updated and deleted domain objects.
+        """
+        logging.info("Applying changes from %s...", file_name)
+        changes: AppliedChanges[U] = AppliedChanges()
+        with measure("data_repository.apply_changes") as stage:
+            records = cast(list[dict], self.file_reader.read(file_name))
+            stage.rows = len(records)
+            for record in records:
+                try:
+                    operation, entry = split_change(record)
+                except ValueError as e:
+                    self._reject_change(record, file_name, "invalid_change", str(e))
+                    changes.rejected += 1
+                    continue
+                if operation is ChangeOperation.DELETE:
+                    removed = self._delete(entry["id"])
+                    if removed is None:
+                        self._reject_change(record, file_name, "unknown_id", f"Unknown id: {entry['id']}")
+                        changes.rejected += 1
+                    else:
+                        changes.deleted.append(removed)
+                    continue
+                raw_entry = cast(T, entry)
+                if not self.validator.validate(raw_entry):
+                    self._reject_change(record, file_name, None, f"Invalid entry: {entry}")
+                    changes.rejected += 1
+                    continue
+                item = self.converter.convert(raw_entry)
+                previous = self._upsert(item)
+                if previous is None:
+                    changes.inserted.append(item)
+                else:
+                    changes.updated.append((previous, item))
+        if self.quarantine is not None:
+            self.quarantine.flush()
+        if changes:
+            self.version += 1
+        logging.info("Applied %d inserts, %d updates and %d deletes from %s, %d records rejected.",
+                     len(changes.inserted), len(changes.updated), len(changes.deleted), file_name, changes.rejected)
+        return changes
+
     def _process_data(self, file_name: str) -> list[U]:
         """
         Internal method to read, validate, and convert raw data.
@@ -95,17 +271,189 @@ class DataRepository[T, U]:
         Returns:
             list[U]: A list of validated and converted domain objects.
         """
-        logging.info(f"Reading data from {file_name}...")
+        logging.info("Reading data from %s...", file_name)
         row_data = self.file_reader.read(file_name)
+        if self.row_filter is not None:
+            row_data = self._filter_rows(row_data, self.row_filter)
+        if self.reject_collector is not None:
+            valid_data = self._process_data_collecting(file_name, row_data, self.reject_collector)
+        elif get_metrics_sink().enabled:
+            valid_data = self._process_data_instrumented(file_name, row_data)
+        else:
+            valid_data = []
+            for entry in row_data:
+                if self.validator.validate(entry):
+                    converted_data = self.converter.convert(entry)
+                    valid_data.append(converted_data)
+                else:   
+                    logging.error("Invalid entry: %s", entry)
+                    self._quarantine(entry, file_name)
+        if self.quarantine is not None:
+            self.quarantine.flush()
+        return valid_data
+
+    def _filter_rows(self, row_data: list[T], row_filter: Callable[[T], bool]) -> list[T]:
+        """
+        Skip the raw entries rejected by the row filter.
+
+        Args:
+            row_data (list[T]): Raw data read from the file.
+            row_filter (Callable[[T], bool]): Returns False for skipped entries.
+
+        Returns:
+            list[T]: The accepted entries, in order.
+        """
+        with measure("data_repository.filter_rows") as stage:
+            stage.rows = len(row_data)
+            accepted = list(filter(row_filter, row_data))
+        logging.info("Row filter skipped %d of %d entries.", len(row_data) - len(accepted), len(row_data))
+        sink = get_metrics_sink()
+        if sink.enabled:
+            sink.increment("data_repository.filtered_rows", len(row_data) - len(accepted))
+        return accepted
+
+    def _process_data_instrumented(self, file_name: str, row_data: list[T]) -> list[U]:
+        """
+        Validate and convert raw data while recording stage metrics.
+
+        Validation and conversion run as two separate passes, so their durations
+        are measured once per batch instead of once per row.
+
+        Args:
+            file_name (str): The name of the processed file.
+            row_data (list[T]): Raw data read from the file.
+
+        Returns:
+            list[U]: A list of validated and converted domain objects.
+        """
+        with measure("data_repository.process_data") as stage:
+            stage.rows = len(row_data)
+            with measure("validator.validate") as validation:
+                validation.rows = len(row_data)
+                is_valid = [self.validator.validate(entry) for entry in row_data]
+            with measure("converter.convert") as conversion:
+                valid_data = [self.converter.convert(entry) for entry, valid in zip(row_data, is_valid) if valid]
+                conversion.rows = len(valid_data)
+            for entry, valid in zip(row_data, is_valid):
+                if not valid:
+                    logging.error("Invalid entry: %s", entry)
+                    self._quarantine(entry, file_name)
+        get_metrics_sink().increment("data_repository.invalid_rows", len(row_data) - len(valid_data))
+        return valid_data
+
+    def _process_data_collecting(self, file_name: str, row_data: list[T], collector: RejectCollector) -> list[U]:
+        """
+        Validate and convert raw data, passing invalid entries to the reject collector.
+
+        Args:
+            file_name (str): The name of the processed file.
+            row_data (list[T]): Raw data read from the file.
+            collector (RejectCollector): The collector receiving invalid entries.
+
+        Returns:
+            list[U]: A list of validated and converted domain objects.
+        """
         valid_data = []
-        for entry in row_data:
-            if self.validator.validate(entry):
-                converted_data = self.converter.convert(entry)
-                valid_data.append(converted_data)
-            else:   
-                logging.error(f"Invalid entry: {entry}")
+        with measure("data_repository.process_data") as stage:
+            stage.rows = len(row_data)
+            for entry in row_data:
+                reason = self.validator.rejection_reason(entry)
+                if reason is None:
+                    valid_data.append(self.converter.convert(entry))
+                else:
+                    collector.reject(entry, reason)
+                    self._quarantine(entry, file_name, reason)
+        rejected = collector.log_summary(file_name)
+        sink = get_metrics_sink()
+        if sink.enabled:
+            sink.increment("data_repository.invalid_rows", sum(rejected.values()))
         return valid_data
 
+    def _quarantine(self, entry: T, file_name: str, rule: str | None = None) -> None:
+        """
+        Write an invalid entry to the quarantine file, if one is configured.
+
+        Args:
+            entry (T): The invalid entry.
+            file_name (str): The name of the file the entry was read from.
+            rule (str | None): The failing validation rule, looked up with the validator when None.
+        """
+        if self.quarantine is None:
+            return
+        if rule is None:
+            rule = self.validator.rejection_reason(entry) or "invalid"
+        self.quarantine.write(entry, rule, file_name)
+
+    def _upsert(self, item: U) -> U | None:
+        """
+        Replace or add a domain object without changing the version.
+        """
+        item_id = cast(Identified, item).id
+        position = self._index.get(item_id)
+        if position is None:
+            self._index[item_id] = len(self._data)
+            self._data.append(item)
+            return None
+        previous = self._data[position]
+        self._data[position] = item
+        return previous
+
+    def _delete(self, item_id: int) -> U | None:
+        """
+        Remove a domain object by moving the last object into its position, without changing the version.
+        """
+        position = self._index.pop(item_id, None)
+        if position is None:
+            return None
+        removed = self._data[position]
+        last = self._data.pop()
+        if position < len(self._data):
+            self._data[position] = last
+            self._index[cast(Identified, last).id] = position
+        return removed
+
+    def _reject_change(self, record: dict, file_name: str, rule: str | None, message: str) -> None:
+        """
+        Log and quarantine a change-set record which cannot be applied.
+        """
+        logging.error("Rejected change: %s", message)
+        if self.quarantine is not None:
+            if rule is None:
+                rule = self.validator.rejection_reason(cast(T, split_change(record)[1])) or "invalid"
+            self.quarantine.write(record, rule, file_name)
+
+    def _index_unique(self, file_name: str, items: list[U], offset: int) -> list[U]:
+        """
+        Add loaded domain objects to the id index and drop the ones with an already indexed id.
+
+        Args:
+            file_name (str): The name of the file the objects were loaded from.
+            items (list[U]): The loaded domain objects.
+            offset (int): The position of the first object in the cached data.
+
+        Returns:
+            list[U]: The objects with unique ids, in file order; the first occurrence of an id wins.
+        """
+        index = self._index
+        unique: list[U] = []
+        duplicates: list[U] = []
+        for item in items:
+            item_id = cast(Identified, item).id
+            if item_id in index:
+                duplicates.append(item)
+                continue
+            index[item_id] = offset + len(unique)
+            unique.append(item)
+        if duplicates:
+            logging.warning("Skipped %d entries with duplicate ids in %s, e.g. %s.", len(duplicates), file_name,
+                            [cast(Identified, item).id for item in duplicates[:10]])
+            get_metrics_sink().increment("data_repository.duplicate_ids", len(duplicates))
+            if self.quarantine is not None:
+                for item in duplicates:
+                    self.quarantine.write(cast(Identified, item).to_dict(), "duplicate_id", file_name)
+                self.quarantine.flush()
+        return unique
+
 class ProductDataRepository(DataRepository[ProductDataDict, Product]):
     """
     Repository for managing product data.
@@ -125,27 +473,143 @@ class OrderDataRepository(DataRepository[OrderDataDict, Order]):
     pass
 
 
+class ProjectedOrderDataRepository(DataRepository[OrderDataDict, ProjectedOrder]):
+    """
+    Repository for orders loaded with only the fields declared by a projection.
+
+    Built with a `ProjectedOrderConverter` and an `OrderDataDictValidator` requiring the
+    same fields, undeclared fields are neither validated nor converted; entries which are
+    invalid only in undeclared fields are kept. With `SUMMARY_ORDER_FIELDS` the orders
+    can back the purchase summary builds of `PurchaseSummaryRepository`, but not the
+    rollups, the cube, the order indexes or order changes, which need complete orders;
+    those raise a `ValueError`.
+    """
+    pass
+
+
+class SummaryOrderSource(Protocol):
+    """
+    Source of the orders a purchase summary is built from, e.g. a `ProjectedOrderDataRepository`.
+
+    Attributes:
+        version (int): Incremented every time the orders change.
+
+    Methods:
+        get_data() -> Sequence[SummaryOrder]:
+            Return all orders.
+    """
+    @property
+    def version(self) -> int: ...
+
+    def get_data(self) -> Sequence[SummaryOrder]: ...
+
+
+@runtime_checkable
+class OrderSource(SummaryOrderSource, Protocol):
+    """
+    Source of complete orders, e.g. an `OrderDataRepository`.
+
+    Attributes:
+        version (int): Incremented every time the orders change.
+
+    Methods:
+        get_data() -> list[Order]:
+            Return all orders.
+        append(item: Order) -> None:
+            Add an order.
+        apply_changes(file_name: str) -> AppliedChanges[Order]:
+            Apply an order change set.
+    """
+    @property
+    def version(self) -> int: ...
+
+    def get_data(self) -> list[Order]: ...
+
+    def append(self, item: Order) -> None: ...
+
+    def apply_changes(self, file_name: str) -> AppliedChanges[Order]: ...
+
+
 @dataclass
 class PurchaseSummaryRepository[C, P, O]:
     """
     Repository for summarizing purchase data.
 
+    The summary is accumulated by customer and product ids, so the loop over orders
+    only hashes integers. The public view keyed by `Customer` and `Product` objects
+    is derived from it once per customer-product pair.
+
     Attributes:
         customer_repo (DataRepository[C, Customer]): Repository for customer data.
         product_repo (DataRepository[P, Product]): Repository for product data.
-        order_repo (DataRepository[O, Order]): Repository for order data.
+        order_repo (SummaryOrderSource): Repository for order data, e.g. a `DataRepository[O, Order]`.
+            The summaries only need `SUMMARY_ORDER_FIELDS`; rollups, cubes, order indexes, filters
+            and order changes need an `OrderSource` of complete orders and raise a `ValueError`
+            for a `ProjectedOrderDataRepository`.
+        reject_collector (RejectCollector | None): When set, orders with invalid customer or product
+            references are aggregated and summarized in a single log line.
+        workers (int): The maximum number of worker processes used to build the summary. With more
+            than one worker, contiguous slices of the orders are summarized in parallel. At most one
+            worker is used per `MIN_ORDERS_PER_WORKER` orders, so small loads are built serially.
+        prefilter_references (bool): If True, the references of all orders are checked in one
+            bulk pass before a single-process build, which then skips the per-order lookups;
+            orders with invalid references are summarized in one log line.
         _purchase_summary (CustomersWithPurchesdProducts): Cached summary of purchases.
+        _summary_by_id (CustomerProductQuantities): Cached summary of purchases keyed by ids.
+        _rollups (PurchaseRollups | None): Cached rollups, valid while `_rollups_version` equals `version`.
+        version (int): Incremented every time the summary is rebuilt or changed.
 
     Methods:
         purchase_summary(forced_refreshed: bool = False) -> CustomersWithPurchesdProducts:
             Retrieve or refresh the purchase summary.
-        _build_purchase_summary() -> CustomersWithPurchesdProducts:
+        purchase_summary_by_id(forced_refreshed: bool = False) -> CustomerProductQuantitiesView:
+            Retrieve or refresh the purchase summary keyed by customer and product ids.
+        versions() -> tuple[int, ...]:
+            Return the version of the summary and of every underlying repository.
+        purchase_rollups(forced_refreshed: bool = False) -> PurchaseRollups:
+            Retrieve or refresh the per-category and per-shipping-method rollups.
+        add_order(order: Order) -> bool:
+            Add a new order and update the built summaries and rollups in place.
+        apply_changes(customers_file, products_file, orders_file) -> dict[str, AppliedChanges]:
+            Apply change sets to the repositories and propagate them to the built summaries.
+        check_integrity() -> IntegrityReport:
+            Check the customer and product references of all orders in one bulk pass.
+        purchase_cube(band_width: int = 10, forced_refreshed: bool = False) -> PurchaseCube:
+            Retrieve or refresh the age band x category x shipping method cube.
+        order_index(forced_refreshed: bool = False) -> OrderBitmapIndex:
+            Retrieve or refresh the bitmap indexes over the orders.
+        filtered_orders(order_filter: OrderFilter) -> list[Order]:
+            Return the orders with valid references accepted by a filter, selected with the bitmap indexes.
+        filtered_summary_by_id(order_filter: OrderFilter) -> CustomerProductQuantities:
+            Accumulate the quantities of the orders accepted by a filter.
+        filtered_purchase_summary(order_filter: OrderFilter) -> CustomersWithPurchesdProducts:
+            Return the purchase summary of the orders accepted by a filter.
+        filtered_rollups(order_filter: OrderFilter) -> PurchaseRollups:
+            Build the rollups of the orders accepted by a filter.
+        filtered_cube(order_filter: OrderFilter, band_width: int = 10) -> PurchaseCube:
+            Build the cube of the orders accepted by a filter.
+        _build_purchase_summary(forced_refreshed: bool = False) -> CustomersWithPurchesdProducts:
             Internal method to build the purchase summary.
+        _build_summary_by_id() -> CustomerProductQuantities:
+            Internal method to accumulate order quantities by customer and product ids.
+        _build_summary_by_id_sharded(workers: int) -> CustomerProductQuantities:
+            Internal method to accumulate order quantities in a pool of worker processes.
     """
     customer_repo: DataRepository[C, Customer]
     product_repo: DataRepository[P, Product]
-    order_repo: DataRepository[O, Order]
+    order_repo: SummaryOrderSource
+    reject_collector: RejectCollector | None = None
+    workers: int = 1
+    prefilter_references: bool = False
     _purchase_summary: CustomersWithPurchesdProducts = field(default_factory=dict, init=False)
+    _summary_by_id: CustomerProductQuantities = field(default_factory=dict, init=False)
+    version: int = field(default=0, init=False)
+    _rollups: PurchaseRollups | None = field(default=None, init=False)
+    _rollups_version: int = field(default=-1, init=False)
+    _entity_index: tuple[tuple[int, int], dict[int, Customer], dict[int, Product]] | None = field(
+        default=None, init=False)
+    _cube: tuple[tuple[int, int], PurchaseCube] | None = field(default=None, init=False)
+    _order_index: tuple[tuple[int, int, int], OrderBitmapIndex] | None = field(default=None, init=False)
 
     def purchase_summary(self, forced_refreshed: bool = False) -> CustomersWithPurchesdProducts:
         """
@@ -157,31 +621,644 @@ class PurchaseSummaryRepository[C, P, O]:
         Returns:
             CustomersWithPurchesdProducts: A dictionary mapping customers to purchased products and quantities.
         """
+        sink = get_metrics_sink()
         if forced_refreshed or not self._purchase_summary:
             logging.info("Building or refreshing purchase summary from repositories ...")
-            self._purchase_summary = self._build_purchase_summary()
+            if sink.enabled:
+                sink.increment("purchase_summary.cache_misses")
+            self._purchase_summary = self._build_purchase_summary(forced_refreshed)
+        elif sink.enabled:
+            sink.increment("purchase_summary.cache_hits")
         return self._purchase_summary
-    
-    def _build_purchase_summary(self) -> CustomersWithPurchesdProducts: 
+
+    def purchase_summary_by_id(self, forced_refreshed: bool = False) -> CustomerProductQuantitiesView:
+        """
+        Retrieve or refresh the purchase summary keyed by customer and product ids.
+
+        Args:
+            forced_refreshed (bool): If True, forces a refresh of the summary.
+
+        Returns:
+            CustomerProductQuantitiesView: A read-only mapping of customer ids to product ids and quantities.
+        """
+        if forced_refreshed or not self._summary_by_id:
+            logging.info("Building or refreshing purchase summary by id from repositories ...")
+            self._summary_by_id = self._build_summary_by_id()
+            self._purchase_summary = {}
+            self.version += 1
+        return self._summary_by_id
+
+    def versions(self) -> tuple[int, ...]:
+        """
+        Return the version of the summary and of every underlying repository.
+
+        The tuple changes whenever the summary is rebuilt or any repository is
+        refreshed, so it can key caches of results derived from the summary.
+
+        Returns:
+            tuple[int, ...]: The summary version followed by the repository versions.
+        """
+        repositories = (self.customer_repo, self.product_repo, self.order_repo)
+        return self.version, *(repository.version for repository in repositories if repository is not None)
+
+    def purchase_rollups(self, forced_refreshed: bool = False) -> PurchaseRollups:
+        """
+        Retrieve or refresh the per-category and per-shipping-method rollups.
+
+        The rollups follow the summary: they are rebuilt on first use after the summary
+        was rebuilt, and updated in place by `add_order`.
+
+        Args:
+            forced_refreshed (bool): If True, forces a refresh of the rollups.
+
+        Returns:
+            PurchaseRollups: Totals of the orders with valid references.
+        """
+        self.purchase_summary_by_id()
+        if forced_refreshed or self._rollups is None or self._rollups_version != self.version:
+            logging.info("Building or refreshing purchase rollups from repositories ...")
+            self._rollups = self._build_rollups()
+            self._rollups_version = self.version
+        return self._rollups
+
+    def add_order(self, order: Order) -> bool:
+        """
+        Add a new order and update the built summaries and rollups in place.
+
+        The order is appended to the order repository. Summaries and rollups which
+        were not built yet are left to be built from the repository on first use.
+
+        Args:
+            order (Order): The new order.
+
+        Returns:
+            bool: True if the order was added to the summaries, False if it references
+            an unknown customer or product.
+        """
+        order_repo = self._full_orders("add_order")
+        customers, products = self._entities_by_id()
+        order_repo.append(order)
+        customer = customers.get(order.customer_id)
+        product = products.get(order.product_id)
+        if customer is None or product is None:
+            self._report_invalid_reference(order)
+            self._finish_invalid_references(1)
+            return False
+
+        self._update_summaries(customer, product, order.quantity)
+        rollups_in_sync = self._rollups is not None and self._rollups_version == self.version
+        self.version += 1
+        if rollups_in_sync and self._rollups is not None:
+            self._rollups.add_order(order, product)
+            self._rollups_version = self.version
+        return True
+
+    def apply_changes(
+            self,
+            customers_file: str | None = None,
+            products_file: str | None = None,
+            orders_file: str | None = None) -> dict[str, AppliedChanges]:
+        """
+        Apply change sets to the repositories and propagate them to the built summaries.
+
+        Order changes are propagated in O(changed orders): the quantities of deleted
+        orders and of the previous versions of updated orders are subtracted, those of
+        inserted and updated orders are added. Rollups are updated in place when only
+        new orders were added, and rebuilt on next use otherwise. Customer and product
+        changes can turn orders with dangling references valid and vice versa, so they
+        drop the summaries, which are rebuilt on next use.
+
+        Args:
+            customers_file (str | None): The customer change set, if any.
+            products_file (str | None): The product change set, if any.
+            orders_file (str | None): The order change set, if any.
+
+        Returns:
+            dict[str, AppliedChanges]: The applied changes by repository name
+            ("customers", "products", "orders"), for every given change set.
+        """
+        applied: dict[str, AppliedChanges] = {}
+        change_sets = (("customers", self.customer_repo, customers_file), ("products", self.product_repo, products_file))
+        for name, repository, file_name in change_sets:
+            if file_name is not None:
+                applied[name] = repository.apply_changes(file_name)
+        if orders_file is not None:
+            applied["orders"] = self._full_orders("apply_changes").apply_changes(orders_file)
+
+        if applied.get("customers") or applied.get("products"):
+            logging.info("Customers or products changed, the purchase summary is rebuilt on next use.")
+            self._purchase_summary = {}
+            self._summary_by_id = {}
+            self._rollups = None
+            self.version += 1
+        elif applied.get("orders"):
+            self._propagate_order_changes(applied["orders"])
+        return applied
+
+    def _propagate_order_changes(self, changes: AppliedChanges[Order]) -> None:
+        """
+        Subtract removed orders from and add new orders to the built summaries and rollups.
+
+        Args:
+            changes (AppliedChanges[Order]): The changes applied to the order repository.
+        """
+        customers, products = self._entities_by_id()
+        removed = changes.removed()
+        rollups_in_sync = self._rollups is not None and self._rollups_version == self.version and not removed
+        dangling_orders = 0
+        for sign, orders in ((-1, removed), (1, changes.added())):
+            for order in orders:
+                customer = customers.get(order.customer_id)
+                product = products.get(order.product_id)
+                if customer is None or product is None:
+                    if sign > 0:
+                        dangling_orders += 1
+                        self._report_invalid_reference(order)
+                    continue
+                self._update_summaries(customer, product, sign * order.quantity)
+                if rollups_in_sync and self._rollups is not None:
+                    self._rollups.add_order(order, product)
+        self.version += 1
+        if rollups_in_sync:
+            self._rollups_version = self.version
+        self._finish_invalid_references(dangling_orders)
+
+    def _update_summaries(self, customer: Customer, product: Product, quantity: int) -> None:
+        """
+        Add a quantity, negative to subtract, to the built summaries; pairs which drop to zero are removed.
+
+        Args:
+            customer (Customer): The customer.
+            product (Product): The product.
+            quantity (int): The quantity change.
         """
-        Internal method to build the purchase summary.
+        summaries: list[tuple[dict, int | Customer, int | Product]] = [
+            (self._summary_by_id, customer.id, product.id),
+            (self._purchase_summary, customer, product)
+        ]
+        for summary, customer_key, product_key in summaries:
+            if not summary:
+                continue
+            purchases = summary.setdefault(customer_key, {})
+            remaining = purchases.get(product_key, 0) + quantity
+            if remaining:
+                purchases[product_key] = remaining
+                continue
+            purchases.pop(product_key, None)
+            if not purchases:
+                del summary[customer_key]
+
+    def _build_purchase_summary(self, forced_refreshed: bool = False) -> CustomersWithPurchesdProducts:
+        """
+        Internal method to build the purchase summary from the summary keyed by ids.
+
+        The summary keyed by ids is only rebuilt when it was not built yet or a refresh
+        is forced, so the version, and with it the rollups and the cube, are kept otherwise.
+
+        Args:
+            forced_refreshed (bool): If True, forces a rebuild of the summary keyed by ids.
 
         Returns:
             CustomersWithPurchesdProducts: A dictionary mapping customers to purchased products and quantities.
         """
-        purchase_summary: CustomersWithPurchesdProducts = defaultdict(lambda: defaultdict(int))
+        summary_by_id = self.purchase_summary_by_id(forced_refreshed)
+        customers, products = self._entities_by_id()
+        return {
+            customers[customer_id]: {products[product_id]: quantity for product_id, quantity in purchases.items()}
+            for customer_id, purchases in summary_by_id.items()
+        }
+
+    def _build_summary_by_id(self) -> CustomerProductQuantities:
+        """
+        Internal method to accumulate order quantities by customer and product ids.
+
+        Orders referencing a missing customer or product are skipped and reported.
+
+        Returns:
+            CustomerProductQuantities: A dictionary mapping customer ids to product ids and quantities.
+        """
+        workers = min(self.workers, len(self.order_repo.get_data()) // MIN_ORDERS_PER_WORKER)
+        if workers > 1:
+            return self._build_summary_by_id_sharded(workers)
+        if self.prefilter_references:
+            return self._build_summary_by_id_prefiltered()
+        summary: CustomerProductQuantities = {}
         # Get data from repositories
-        customers = {customer.id: customer for customer in self.customer_repo.get_data()}
-        products = {product.id: product for product in self.product_repo.get_data()}
+        customer_ids = {customer.id for customer in self.customer_repo.get_data()}
+        product_ids = {product.id for product in self.product_repo.get_data()}
+        orders = self.order_repo.get_data()
+
+        with measure("purchase_summary.build") as stage:
+            stage.rows = len(orders)
+            dangling_orders = 0
+            for order in orders:
+                customer_id = order.customer_id
+                product_id = order.product_id
+                if customer_id in customer_ids and product_id in product_ids:
+                    purchases = summary.get(customer_id)
+                    if purchases is None:
+                        purchases = summary[customer_id] = {}
+                    purchases[product_id] = purchases.get(product_id, 0) + order.quantity
+                else:
+                    dangling_orders += 1
+                    self._report_invalid_reference(order)
+        self._finish_invalid_references(dangling_orders)
+        return summary
+
+    def check_integrity(self) -> IntegrityReport:
+        """
+        Check the customer and product references of all orders in one bulk pass.
+
+        Returns:
+            IntegrityReport: Validity of every order, by position, and the offending ids.
+        """
         orders = self.order_repo.get_data()
+        with measure("purchase_summary.check_integrity") as stage:
+            stage.rows = len(orders)
+            return check_order_references(
+                orders,
+                IdMembership.from_ids(customer.id for customer in self.customer_repo.get_data()),
+                IdMembership.from_ids(product.id for product in self.product_repo.get_data())
+            )
 
-        for order in orders:
-            customer = customers.get(order.customer_id)
-            product = products.get(order.product_id)
-            if customer and product:
-                purchase_summary[customer][product] += order.quantity
+    def _build_summary_by_id_prefiltered(self) -> CustomerProductQuantities:
+        """
+        Internal method to accumulate order quantities after a bulk reference check.
+
+        Returns:
+            CustomerProductQuantities: A dictionary mapping customer ids to product ids and quantities.
+        """
+        report = self.check_integrity()
+        orders = self.order_repo.get_data()
+        if report.invalid_orders:
+            if self.reject_collector is not None:
+                for position in report.invalid_positions():
+                    self._report_invalid_reference(orders[position])
             else:
-                logging.warning(f"Order {order.id} has invalid customer or product reference.")
-        return dict(purchase_summary)
+                report.log_summary("Purchase summary")
+            orders = report.valid_orders(orders)
+
+        summary: CustomerProductQuantities = {}
+        with measure("purchase_summary.build") as stage:
+            stage.rows = len(orders)
+            for order in orders:
+                purchases = summary.get(order.customer_id)
+                if purchases is None:
+                    purchases = summary[order.customer_id] = {}
+                purchases[order.product_id] = purchases.get(order.product_id, 0) + order.quantity
+        self._finish_invalid_references(report.invalid_orders)
+        return summary
+
+    def _build_summary_by_id_sharded(self, workers: int) -> CustomerProductQuantities:
+        """
+        Internal method to accumulate order quantities in a pool of worker processes.
+
+        The order columns are extracted into typed arrays with C-level `map` calls and
+        cut into one contiguous slice per worker, so the parent does no per-order Python
+        work. Merging the partial summaries in slice order adds customers and products in
+        the order of their first order, and the invalid references of consecutive slices
+        are already in order position, which gives exactly the result and log output of
+        the serial build.
+
+        Args:
+            workers (int): The number of worker processes and slices.
+
+        Returns:
+            CustomerProductQuantities: A dictionary mapping customer ids to product ids and quantities.
+        """
+        # Imported on first use: the process pool pulls in multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        customer_ids = frozenset(customer.id for customer in self.customer_repo.get_data())
+        product_ids = frozenset(product.id for product in self.product_repo.get_data())
+        orders = self.order_repo.get_data()
+
+        with measure("purchase_summary.build_sharded") as stage:
+            stage.rows = len(orders)
+            columns = [array('q', map(attrgetter(name), orders)) for name in ("customer_id", "product_id", "quantity")]
+            bounds = [len(orders) * number // workers for number in range(workers + 1)]
+            slices = [
+                OrderSlice(start, *(column[start:stop] for column in columns))
+                for start, stop in zip(bounds, bounds[1:])
+            ]
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_summary_worker,
+                initargs=(customer_ids, product_ids)
+            ) as executor:
+                partials = list(executor.map(_build_partial_summary, slices))
+
+            summary: CustomerProductQuantities = {}
+            dangling_positions: list[int] = []
+            for slice_number, (partial, dangling) in enumerate(partials):
+                logging.debug("Slice %d: %d customers, %d orders with invalid references.",
+                              slice_number, len(partial), len(dangling))
+                for customer_id, partial_purchases in partial.items():
+                    purchases = summary.get(customer_id)
+                    if purchases is None:
+                        summary[customer_id] = partial_purchases
+                        continue
+                    for product_id, quantity in partial_purchases.items():
+                        purchases[product_id] = purchases.get(product_id, 0) + quantity
+                dangling_positions.extend(dangling)
+
+        for position in dangling_positions:
+            self._report_invalid_reference(orders[position])
+        self._finish_invalid_references(len(dangling_positions))
+        return summary
+
+    def purchase_cube(self, band_width: int = 10, forced_refreshed: bool = False) -> PurchaseCube:
+        """
+        Retrieve or refresh the age band x category x shipping method cube.
+
+        Age bands cover the age range enforced by the customer validator. The cube
+        is rebuilt on first use after the summary changed or for another band width.
+
+        Args:
+            band_width (int): The number of ages in one band.
+            forced_refreshed (bool): If True, forces a refresh of the cube.
+
+        Returns:
+            PurchaseCube: Quantity and revenue of the orders with valid references.
+        """
+        self.purchase_summary_by_id()
+        key = (self.version, band_width)
+        if forced_refreshed or self._cube is None or self._cube[0] != key:
+            logging.info("Building or refreshing purchase cube from repositories ...")
+            self._cube = (key, self._build_cube(band_width))
+        return self._cube[1]
+
+    def order_index(self, forced_refreshed: bool = False) -> OrderBitmapIndex:
+        """
+        Retrieve or refresh the bitmap indexes over the orders.
+
+        The indexes are rebuilt on first use after any repository changed.
+
+        Args:
+            forced_refreshed (bool): If True, forces a refresh of the indexes.
+
+        Returns:
+            OrderBitmapIndex: Order positions by shipping method, product category and discount bucket.
+        """
+        order_repo = self._full_orders("order_index")
+        versions = (self.customer_repo.version, self.product_repo.version, order_repo.version)
+        if forced_refreshed or self._order_index is None or self._order_index[0] != versions:
+            logging.info("Building or refreshing order bitmap indexes from repositories ...")
+            _, products = self._entities_by_id()
+            report = self.check_integrity()
+            orders = order_repo.get_data()
+            with measure("purchase_summary.build_order_index") as stage:
+                stage.rows = len(orders)
+                self._order_index = (versions, OrderBitmapIndex.from_orders(orders, products, report.valid))
+        return self._order_index[1]
+
+    def filtered_orders(self, order_filter: OrderFilter) -> list[Order]:
+        """
+        Return the orders with valid references accepted by a filter.
+
+        Categories, shipping methods and the discount range are resolved with bitmap
+        AND/OR on the order indexes, so only the selected orders are visited; customer
+        and product id sets and the age range are then tested by id membership.
+
+        Args:
+            order_filter (OrderFilter): The filter.
+
+        Returns:
+            list[Order]: The accepted orders, in repository order.
+        """
+        index = self.order_index()
+        selected = index.select(order_filter.categories, order_filter.shipping_methods, order_filter.discount_range)
+        with measure("purchase_summary.filter_orders") as stage:
+            stage.rows = len(selected)
+            orders = list(map(index.orders.__getitem__, selected))
+            customer_ids = order_filter.accepted_customers(self.customer_repo.get_data())
+            if customer_ids is not None:
+                orders = [order for order in orders if order.customer_id in customer_ids]
+            if order_filter.product_ids is not None:
+                orders = [order for order in orders if order.product_id in order_filter.product_ids]
+        return orders
+
+    def filtered_summary_by_id(self, order_filter: OrderFilter) -> CustomerProductQuantities:
+        """
+        Accumulate the quantities of the orders accepted by a filter.
+
+        The selected orders all have valid references, so none of them needs a lookup.
+
+        Args:
+            order_filter (OrderFilter): The filter.
 
+        Returns:
+            CustomerProductQuantities: A dictionary mapping customer ids to product ids and quantities.
+        """
+        orders = self.filtered_orders(order_filter)
+        summary: CustomerProductQuantities = {}
+        with measure("purchase_summary.build_filtered") as stage:
+            stage.rows = len(orders)
+            for order in orders:
+                purchases = summary.get(order.customer_id)
+                if purchases is None:
+                    purchases = summary[order.customer_id] = {}
+                purchases[order.product_id] = purchases.get(order.product_id, 0) + order.quantity
+        return summary
+
+    def filtered_purchase_summary(self, order_filter: OrderFilter) -> CustomersWithPurchesdProducts:
+        """
+        Return the purchase summary of the orders accepted by a filter.
+
+        Args:
+            order_filter (OrderFilter): The filter.
+
+        Returns:
+            CustomersWithPurchesdProducts: A dictionary mapping customers to purchased products and quantities.
+        """
+        customers, products = self._entities_by_id()
+        return {
+            customers[customer_id]: {products[product_id]: quantity for product_id, quantity in purchases.items()}
+            for customer_id, purchases in self.filtered_summary_by_id(order_filter).items()
+        }
+
+    def filtered_rollups(self, order_filter: OrderFilter) -> PurchaseRollups:
+        """
+        Build the per-category and per-shipping-method rollups of the orders accepted by a filter.
+
+        Args:
+            order_filter (OrderFilter): The filter.
+
+        Returns:
+            PurchaseRollups: Totals of the accepted orders.
+        """
+        _, products = self._entities_by_id()
+        orders = self.filtered_orders(order_filter)
+        with measure("purchase_summary.build_rollups") as stage:
+            stage.rows = len(orders)
+            return PurchaseRollups.from_orders(orders, products)
+
+    def filtered_cube(self, order_filter: OrderFilter, band_width: int = 10) -> PurchaseCube:
+        """
+        Build the age band x category x shipping method cube of the orders accepted by a filter.
+
+        Args:
+            order_filter (OrderFilter): The filter.
+            band_width (int): The number of ages in one band.
+
+        Returns:
+            PurchaseCube: Quantity and revenue of the accepted orders.
+        """
+        return self._build_cube(band_width, self.filtered_orders(order_filter))
+
+    def _build_cube(self, band_width: int, selected: list[Order] | None = None) -> PurchaseCube:
+        """
+        Internal method to build the cube in one pass over the orders.
+
+        Args:
+            band_width (int): The number of ages in one band.
+            selected (list[Order] | None): Orders with valid references to aggregate, all orders when None.
+
+        Returns:
+            PurchaseCube: Quantity and revenue of the orders with valid references.
+        """
+        customer_validator = self.customer_repo.validator
+        age_validator = (customer_validator if isinstance(customer_validator, CustomerDataDictValidator)
+                         else CustomerDataDictValidator())
+        customers, products = self._entities_by_id()
+        orders = self._full_orders("purchase_cube").get_data() if selected is None else selected
+        with measure("purchase_summary.build_cube") as stage:
+            stage.rows = len(orders)
+            return PurchaseCube.from_orders(
+                (order for order in orders if order.customer_id in customers and order.product_id in products),
+                customers,
+                products,
+                age_validator.min_value,
+                age_validator.max_value,
+                band_width
+            )
+
+    def _build_rollups(self) -> PurchaseRollups:
+        """
+        Internal method to build the rollups in one pass over the orders.
+
+        Returns:
+            PurchaseRollups: Totals of the orders with valid references.
+        """
+        customers, products = self._entities_by_id()
+        orders = self._full_orders("purchase_rollups").get_data()
+        with measure("purchase_summary.build_rollups") as stage:
+            stage.rows = len(orders)
+            return PurchaseRollups.from_orders(
+                (order for order in orders if order.customer_id in customers and order.product_id in products),
+                products
+            )
+
+    def _entities_by_id(self) -> tuple[dict[int, Customer], dict[int, Product]]:
+        """
+        Return customers and products by id, re-indexed when their repositories change.
+        """
+        versions = (self.customer_repo.version, self.product_repo.version)
+        if self._entity_index is None or self._entity_index[0] != versions:
+            self._entity_index = (
+                versions,
+                {customer.id: customer for customer in self.customer_repo.get_data()},
+                {product.id: product for product in self.product_repo.get_data()}
+            )
+        return self._entity_index[1], self._entity_index[2]
 
+    def _full_orders(self, query: str) -> OrderSource:
+        """
+        Return the order repository for a query which needs complete orders.
+
+        Args:
+            query (str): The name of the query, for the error message.
+
+        Returns:
+            OrderSource: The order repository.
+
+        Raises:
+            ValueError: If the orders were loaded with only `SUMMARY_ORDER_FIELDS`.
+        """
+        if isinstance(self.order_repo, ProjectedOrderDataRepository) or not isinstance(self.order_repo, OrderSource):
+            raise ValueError(
+                f"{query} needs complete orders, but the orders were loaded with only the fields "
+                f"{', '.join(SUMMARY_ORDER_FIELDS)}; load them with an OrderDataRepository."
+            )
+        return self.order_repo
+
+    def _report_invalid_reference(self, order: SummaryOrder) -> None:
+        """
+        Report an order referencing a missing customer or product.
+
+        Args:
+            order (SummaryOrder): The skipped order.
+        """
+        if self.reject_collector is not None:
+            self.reject_collector.reject(order.to_dict(), "invalid_reference")
+        else:
+            logging.warning("Order %s has invalid customer or product reference.", order.id)
+
+    def _finish_invalid_references(self, dangling_orders: int) -> None:
+        """
+        Summarize the orders with invalid references found during a build.
+
+        Args:
+            dangling_orders (int): The number of skipped orders.
+        """
+        if self.reject_collector is not None:
+            self.reject_collector.log_summary("purchase summary")
+        if dangling_orders:
+            get_metrics_sink().increment("purchase_summary.dangling_orders", dangling_orders)
+
+
+@dataclass
+class OrderSlice:
+    """
+    Compact columns of a contiguous slice of orders summarized by one worker process.
+
+    Attributes:
+        start (int): Position of the first order of the slice in the order repository.
+        customer_ids (array[int]): Customer ids of the orders.
+        product_ids (array[int]): Product ids of the orders.
+        quantities (array[int]): Quantities of the orders.
+    """
+    start: int
+    customer_ids: array
+    product_ids: array
+    quantities: array
+
+
+_worker_customer_ids: frozenset[int] = frozenset()
+_worker_product_ids: frozenset[int] = frozenset()
+
+
+def _init_summary_worker(customer_ids: frozenset[int], product_ids: frozenset[int]) -> None:
+    """
+    Store the known customer and product ids once per worker process.
+    """
+    global _worker_customer_ids, _worker_product_ids
+    _worker_customer_ids = customer_ids
+    _worker_product_ids = product_ids
+
+
+def _build_partial_summary(order_slice: OrderSlice) -> tuple[CustomerProductQuantities, array]:
+    """
+    Accumulate the quantities of one slice of orders.
+
+    Args:
+        order_slice (OrderSlice): The orders of the slice.
+
+    Returns:
+        tuple[CustomerProductQuantities, array]:
+            - The partial summary of the slice.
+            - The positions of orders with invalid references.
+    """
+    summary: CustomerProductQuantities = {}
+    dangling = array('q')
+    for position, customer_id, product_id, quantity in zip(
+            range(order_slice.start, order_slice.start + len(order_slice.quantities)),
+            order_slice.customer_ids, order_slice.product_ids, order_slice.quantities):
+        if customer_id in _worker_customer_ids and product_id in _worker_product_ids:
+            purchases = summary.get(customer_id)
+            if purchases is None:
+                purchases = summary[customer_id] = {}
+            purchases[product_id] = purchases.get(product_id, 0) + quantity
+        else:
+            dangling.append(position)
+    return summary, dangling
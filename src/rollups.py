@@ -0,0 +1,119 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Iterable
+
+from src.model import Order, Product, ProductCategory, ShippingMethod
+
+
+@dataclass
+class GroupTotals:
+    """
+    Totals of the orders of one group, e.g. one product category.
+
+    Attributes:
+        units (int): The total purchased quantity.
+        revenue (Decimal): The total price of the purchased products.
+        buyers (set[int]): Ids of the customers who ordered in the group.
+    """
+    units: int = 0
+    revenue: Decimal = field(default_factory=lambda: Decimal("0.0"))
+    buyers: set[int] = field(default_factory=set)
+
+    def add(self, customer_id: int, quantity: int, revenue: Decimal) -> None:
+        """
+        Add one order to the totals.
+
+        Args:
+            customer_id (int): The id of the customer.
+            quantity (int): The ordered quantity.
+            revenue (Decimal): The price of the ordered products.
+        """
+        self.units += quantity
+        self.revenue += revenue
+        self.buyers.add(customer_id)
+
+
+@dataclass
+class PurchaseRollups:
+    """
+    Materialized per-category and per-shipping-method totals of valid orders.
+
+    Built in one pass over the orders and updated in place for every new order,
+    so category and shipping method questions are answered in O(groups), and
+    popularity within a category in O(products in the category), without walking
+    the purchase summary.
+
+    Attributes:
+        categories (dict[ProductCategory, GroupTotals]): Totals by product category.
+        shipping_methods (dict[ShippingMethod, GroupTotals]): Totals by shipping method.
+        category_products (dict[ProductCategory, dict[Product, int]]): Purchased quantity of every
+            product, grouped by category.
+
+    Methods:
+        add_order(order: Order, product: Product) -> None:
+            Add one valid order.
+        from_orders(orders: Iterable[Order], products: dict[int, Product]) -> PurchaseRollups:
+            Build the rollups of orders referencing known products.
+        popular_products(category: ProductCategory | None = None) -> list[Product]:
+            Return the products with the highest purchased quantity.
+    """
+    categories: dict[ProductCategory, GroupTotals] = field(default_factory=dict)
+    shipping_methods: dict[ShippingMethod, GroupTotals] = field(default_factory=dict)
+    category_products: dict[ProductCategory, dict[Product, int]] = field(default_factory=dict)
+
+    def add_order(self, order: Order, product: Product) -> None:
+        """
+        Add one valid order.
+
+        Args:
+            order (Order): The order.
+            product (Product): The ordered product.
+        """
+        revenue = product.total_price(order.quantity)
+        category_totals = self.categories.get(product.category)
+        if category_totals is None:
+            category_totals = self.categories[product.category] = GroupTotals()
+        category_totals.add(order.customer_id, order.quantity, revenue)
+        shipping_totals = self.shipping_methods.get(order.shipping_method)
+        if shipping_totals is None:
+            shipping_totals = self.shipping_methods[order.shipping_method] = GroupTotals()
+        shipping_totals.add(order.customer_id, order.quantity, revenue)
+        products = self.category_products.setdefault(product.category, {})
+        products[product] = products.get(product, 0) + order.quantity
+
+    @classmethod
+    def from_orders(cls, orders: Iterable[Order], products: dict[int, Product]) -> "PurchaseRollups":
+        """
+        Build the rollups of orders.
+
+        Args:
+            orders (Iterable[Order]): Orders with valid customer and product references.
+            products (dict[int, Product]): Known products by id.
+
+        Returns:
+            PurchaseRollups: The rollups of the orders.
+        """
+        rollups = cls()
+        for order in orders:
+            rollups.add_order(order, products[order.product_id])
+        return rollups
+
+    def popular_products(self, category: ProductCategory | None = None) -> list[Product]:
+        """
+        Return the products with the highest purchased quantity.
+
+        Args:
+            category (ProductCategory | None): Only consider products of this category, all products when None.
+
+        Returns:
+            list[Product]: All products with the highest quantity, empty when there are no orders.
+        """
+        if category is None:
+            quantities = {product: quantity
+                          for products in self.category_products.values() for product, quantity in products.items()}
+        else:
+            quantities = self.category_products.get(category, {})
+        if not quantities:
+            return []
+        max_count = max(quantities.values())
+        return [product for product, count in quantities.items() if count == max_count]
@@ -1,19 +1,39 @@
 from collections import Counter
 from dataclasses import dataclass
 from decimal import Decimal
-from src.model import Customer, Product, CustomerDataDict, ProductDataDict, OrderDataDict
+from typing import Iterable
+from src.cache import ResultCache, cached_result
+from src.money import Money
+from src.model import (
+    Customer, Product, CustomerDataDict, ProductDataDict, OrderDataDict, ProductCategory, ShippingMethod, SummaryOrder
+)
+from src.filters import OrderFilter
 from src.repository import PurchaseSummaryRepository, CustomersWithPurchesdProducts
+from src.rollups import PurchaseRollups
+from src.metrics import instrumented
+from src.sketch import DEFAULT_QUANTILES, QuantileSketch
 import logging
 
-logging.basicConfig(level=logging.INFO)
-
 @dataclass(eq=False, frozen=False)
 class PurchasesSummaryService:
     """
     Service class for analyzing purchase data.
 
+    With a `ResultCache`, results are cached by method, arguments and the versions of the
+    repository data, so repeated calls are answered without recomputation until the data
+    is refreshed. Cached results are shared between callers and must not be modified, so
+    caching is opt-in; without a cache every call returns a fresh result.
+
+    Every query method takes an optional `order_filter`. The filter is pushed down to
+    the repository, which selects the accepted orders with its bitmap indexes and
+    aggregates only them, instead of filtering a summary built from all orders.
+
     Attributes:
         repository (PurchaseSummaryRepository): A repository that provides summarized purchase data.
+        cache (ResultCache | None): The LRU result cache, caching is disabled when None (default).
+        fixed_point (bool): If True, customer totals are computed with integer minor units
+            (see `Money`) and converted to `Decimal` once per customer. Results are equal to
+            the `Decimal` path for prices with at most two decimal places.
 
     Methods:
         calculate_avarage_spending_per_customer() -> dict[Customer, Decimal]:
@@ -22,36 +42,79 @@ class PurchasesSummaryService:
             Find the most popular products based on purchase quantities.
         find_highest_and_lowest_spenders() -> tuple[list[Customer], list[Customer]]:
             Identify the highest and lowest spenders among customers.
+        spending_quantiles(quantiles: Iterable[float]) -> dict[float, Decimal]:
+            Calculate quantiles of the total spending per customer.
+        order_quantity_quantiles(quantiles: Iterable[float]) -> dict[float, int]:
+            Calculate quantiles of the quantity per order.
+        units_by_category() / units_by_shipping_method() -> dict[..., int]:
+            Return the purchased quantity by product category or shipping method.
+        revenue_by_category() / revenue_by_shipping_method() -> dict[..., Decimal]:
+            Return the revenue by product category or shipping method.
+        distinct_buyers_by_category() / distinct_buyers_by_shipping_method() -> dict[..., int]:
+            Return the number of distinct buyers by product category or shipping method.
+        popular_products(category: ProductCategory | None = None) -> list[Product]:
+            Find the most popular products, optionally within a category.
+        sales_by_age_band(category, shipping_method, band_width) -> dict[tuple[int, int], tuple[int, Decimal]]:
+            Return quantity and revenue by customer age band, from the cube.
         calculate_total_spent(purchases: dict[Product, int]) -> Decimal:
             Calculate the total amount spent on purchases.
+        calculate_total_spent_fixed_point(purchases: dict[Product, int]) -> Money:
+            Calculate the total amount spent on purchases with integer minor units.
+        cache_versions() -> tuple[int, ...]:
+            Return the versions of the data the cached results depend on.
     """
     repository: PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict]
+    cache: ResultCache | None = None
+    fixed_point: bool = False
+
+    def cache_versions(self) -> tuple[int, ...]:
+        """
+        Return the versions of the data the cached results depend on.
+
+        Returns:
+            tuple[int, ...]: The versions of the summary and of the underlying repositories.
+        """
+        return self.repository.versions()
 
-    def calculate_avarage_spending_per_customer(self) -> dict[Customer, Decimal]:
+    @instrumented("service.calculate_avarage_spending_per_customer")
+    @cached_result("calculate_avarage_spending_per_customer")
+    def calculate_avarage_spending_per_customer(
+            self,
+            order_filter: OrderFilter | None = None) -> dict[Customer, Decimal]:
         """
         Calculate the average spending per customer.
 
+        Args:
+            order_filter (OrderFilter | None): Only count the accepted orders, all orders when None.
+
         Returns:
             dict[Customer, Decimal]: A dictionary mapping each customer to their average spending.
         """
         average_spending: dict[Customer, Decimal] = {}
-        for customer, purchases in self.repository.purchase_summary().items():
-            total_spent = self.calculate_total_spent(purchases)
+        for customer, purchases in self._purchase_summary(order_filter).items():
+            total_spent = self._total_spent(purchases)
             total_products = Decimal(sum(purchases.values()))
             average_spending[customer] = total_spent / total_products if total_products > 0 else Decimal("0.0")
         return average_spending
 
-    def find_most_popular_products(self) -> list[Product]:
+    @instrumented("service.find_most_popular_products")
+    @cached_result("find_most_popular_products")
+    def find_most_popular_products(
+            self,
+            order_filter: OrderFilter | None = None) -> list[Product]:
         """
         Find the most popular products based on purchase quantities.
 
+        Args:
+            order_filter (OrderFilter | None): Only count the accepted orders, all orders when None.
+
         Returns:
             list[Product]: A list of the most popular products. If there are multiple products with the same
             highest quantity, all are included.
         """
         product_counter: Counter[Product] = Counter()
 
-        for purchases in self.repository.purchase_summary().values():
+        for purchases in self._purchase_summary(order_filter).values():
             for product, quantity in purchases.items():
                 product_counter[product] += quantity
 
@@ -61,10 +124,17 @@ class PurchasesSummaryService:
 
         return [product for product, count in product_counter.items() if count == max_count]
 
-    def find_highest_and_lowest_spenders(self) -> tuple[list[Customer], list[Customer]]:
+    @instrumented("service.find_highest_and_lowest_spenders")
+    @cached_result("find_highest_and_lowest_spenders")
+    def find_highest_and_lowest_spenders(
+            self,
+            order_filter: OrderFilter | None = None) -> tuple[list[Customer], list[Customer]]:
         """
         Identify the highest and lowest spenders among customers.
 
+        Args:
+            order_filter (OrderFilter | None): Only count the accepted orders, all orders when None.
+
         Returns:
             tuple[list[Customer], list[Customer]]:
                 - A list of customers who spent the most.
@@ -75,8 +145,8 @@ class PurchasesSummaryService:
         highest_spenders: list[Customer] = []
         lowest_spenders: list[Customer] = []
 
-        for customer, purchases in self.repository.purchase_summary().items():
-            total_spent = self.calculate_total_spent(purchases)
+        for customer, purchases in self._purchase_summary(order_filter).items():
+            total_spent = self._total_spent(purchases)
             if total_spent > max_spent:
                 max_spent = total_spent
                 highest_spenders = [customer]
@@ -91,6 +161,237 @@ class PurchasesSummaryService:
 
         return highest_spenders, lowest_spenders
 
+    @instrumented("service.spending_quantiles")
+    @cached_result("spending_quantiles")
+    def spending_quantiles(
+            self,
+            quantiles: Iterable[float] = DEFAULT_QUANTILES,
+            order_filter: OrderFilter | None = None) -> dict[float, Decimal]:
+        """
+        Calculate quantiles of the total spending per customer.
+
+        Exact for small summaries, estimated with a quantile sketch for large ones.
+
+        Args:
+            quantiles (Iterable[float]): Quantiles in the range [0, 1], p50, p90 and p99 by default.
+            order_filter (OrderFilter | None): Only count the accepted orders, all orders when None.
+
+        Returns:
+            dict[float, Decimal]: The total spending at every quantile, empty when there are no purchases.
+        """
+        sketch: QuantileSketch[Decimal] = QuantileSketch()
+        for purchases in self._purchase_summary(order_filter).values():
+            sketch.add(self._total_spent(purchases))
+        return sketch.quantiles(quantiles) if sketch.count else {}
+
+    @instrumented("service.order_quantity_quantiles")
+    @cached_result("order_quantity_quantiles")
+    def order_quantity_quantiles(
+            self,
+            quantiles: Iterable[float] = DEFAULT_QUANTILES,
+            order_filter: OrderFilter | None = None) -> dict[float, int]:
+        """
+        Calculate quantiles of the quantity per order.
+
+        Only orders included in the purchase summary are taken into account, orders
+        with invalid customer or product references are skipped.
+
+        Args:
+            quantiles (Iterable[float]): Quantiles in the range [0, 1], p50, p90 and p99 by default.
+            order_filter (OrderFilter | None): Only count the accepted orders, all orders when None.
+
+        Returns:
+            dict[float, int]: The order quantity at every quantile, empty when there are no orders.
+        """
+        sketch: QuantileSketch[int] = QuantileSketch()
+        order: SummaryOrder
+        if order_filter is not None and not order_filter.unrestricted:
+            for order in self.repository.filtered_orders(order_filter):
+                sketch.add(order.quantity)
+            return sketch.quantiles(quantiles) if sketch.count else {}
+        summary = self.repository.purchase_summary_by_id()
+        for order in self.repository.order_repo.get_data():
+            purchases = summary.get(order.customer_id)
+            if purchases is not None and order.product_id in purchases:
+                sketch.add(order.quantity)
+        return sketch.quantiles(quantiles) if sketch.count else {}
+
+    @instrumented("service.units_by_category")
+    @cached_result("units_by_category")
+    def units_by_category(self, order_filter: OrderFilter | None = None) -> dict[ProductCategory, int]:
+        """
+        Return the purchased quantity by product category, from the rollups.
+
+        Args:
+            order_filter (OrderFilter | None): Only count the accepted orders, all orders when None.
+
+        Returns:
+            dict[ProductCategory, int]: The total quantity of every category with orders.
+        """
+        return {category: totals.units for category, totals in self._rollups(order_filter).categories.items()}
+
+    @instrumented("service.units_by_shipping_method")
+    @cached_result("units_by_shipping_method")
+    def units_by_shipping_method(self, order_filter: OrderFilter | None = None) -> dict[ShippingMethod, int]:
+        """
+        Return the purchased quantity by shipping method, from the rollups.
+
+        Args:
+            order_filter (OrderFilter | None): Only count the accepted orders, all orders when None.
+
+        Returns:
+            dict[ShippingMethod, int]: The total quantity of every shipping method with orders.
+        """
+        return {method: totals.units for method, totals in self._rollups(order_filter).shipping_methods.items()}
+
+    @instrumented("service.revenue_by_category")
+    @cached_result("revenue_by_category")
+    def revenue_by_category(self, order_filter: OrderFilter | None = None) -> dict[ProductCategory, Decimal]:
+        """
+        Return the revenue by product category, from the rollups.
+
+        Revenue is computed like `calculate_total_spent`, so the categories add up
+        to the total spending of all customers.
+
+        Args:
+            order_filter (OrderFilter | None): Only count the accepted orders, all orders when None.
+
+        Returns:
+            dict[ProductCategory, Decimal]: The total price of the products sold in every category.
+        """
+        return {category: totals.revenue
+                for category, totals in self._rollups(order_filter).categories.items()}
+
+    @instrumented("service.revenue_by_shipping_method")
+    @cached_result("revenue_by_shipping_method")
+    def revenue_by_shipping_method(self, order_filter: OrderFilter | None = None) -> dict[ShippingMethod, Decimal]:
+        """
+        Return the revenue by shipping method, from the rollups.
+
+        Args:
+            order_filter (OrderFilter | None): Only count the accepted orders, all orders when None.
+
+        Returns:
+            dict[ShippingMethod, Decimal]: The total price of the products shipped with every method.
+        """
+        return {method: totals.revenue
+                for method, totals in self._rollups(order_filter).shipping_methods.items()}
+
+    @instrumented("service.distinct_buyers_by_category")
+    @cached_result("distinct_buyers_by_category")
+    def distinct_buyers_by_category(self, order_filter: OrderFilter | None = None) -> dict[ProductCategory, int]:
+        """
+        Return the number of distinct buyers by product category, from the rollups.
+
+        Args:
+            order_filter (OrderFilter | None): Only count the accepted orders, all orders when None.
+
+        Returns:
+            dict[ProductCategory, int]: The number of customers who ordered in every category.
+        """
+        return {category: len(totals.buyers)
+                for category, totals in self._rollups(order_filter).categories.items()}
+
+    @instrumented("service.distinct_buyers_by_shipping_method")
+    @cached_result("distinct_buyers_by_shipping_method")
+    def distinct_buyers_by_shipping_method(self, order_filter: OrderFilter | None = None) -> dict[ShippingMethod, int]:
+        """
+        Return the number of distinct buyers by shipping method, from the rollups.
+
+        Args:
+            order_filter (OrderFilter | None): Only count the accepted orders, all orders when None.
+
+        Returns:
+            dict[ShippingMethod, int]: The number of customers who used every shipping method.
+        """
+        return {method: len(totals.buyers)
+                for method, totals in self._rollups(order_filter).shipping_methods.items()}
+
+    @instrumented("service.popular_products")
+    @cached_result("popular_products")
+    def popular_products(
+            self,
+            category: ProductCategory | None = None,
+            order_filter: OrderFilter | None = None) -> list[Product]:
+        """
+        Find the most popular products, optionally within a category, from the rollups.
+
+        Args:
+            category (ProductCategory | None): Only consider products of this category, all products when None.
+            order_filter (OrderFilter | None): Only count the accepted orders, all orders when None.
+
+        Returns:
+            list[Product]: All products with the highest purchased quantity.
+        """
+        return self._rollups(order_filter).popular_products(category)
+
+    @instrumented("service.sales_by_age_band")
+    @cached_result("sales_by_age_band")
+    def sales_by_age_band(
+            self,
+            category: ProductCategory | None = None,
+            shipping_method: ShippingMethod | None = None,
+            band_width: int = 10,
+            order_filter: OrderFilter | None = None) -> dict[tuple[int, int], tuple[int, Decimal]]:
+        """
+        Return quantity and revenue by customer age band, from the cube.
+
+        Args:
+            category (ProductCategory | None): Only count this category, all categories when None.
+            shipping_method (ShippingMethod | None): Only count this shipping method, all methods when None.
+            band_width (int): The number of ages in one band.
+            order_filter (OrderFilter | None): Only count the accepted orders, all orders when None.
+
+        Returns:
+            dict[tuple[int, int], tuple[int, Decimal]]: Quantity and revenue keyed by the inclusive
+            age range of every band.
+        """
+        if order_filter is None or order_filter.unrestricted:
+            cube = self.repository.purchase_cube(band_width)
+        else:
+            cube = self.repository.filtered_cube(order_filter, band_width)
+        return {cube.band_range(band): cube.slice(band, category, shipping_method) for band in range(cube.bands)}
+
+    @staticmethod
+    def calculate_total_spent_fixed_point(purchases: dict[Product, int]) -> Money:
+        """
+        Calculate the total amount spent on purchases with integer minor units.
+
+        Args:
+            purchases (dict[Product, int]): A dictionary mapping products to their purchased quantities.
+
+        Returns:
+            Money: The total amount spent on the purchases.
+        """
+        return Money(sum(
+            (product.price_minor if product.price_minor is not None else product.money.minor) * quantity
+            for product, quantity in purchases.items()
+        ))
+
+    def _purchase_summary(self, order_filter: OrderFilter | None) -> CustomersWithPurchesdProducts:
+        """
+        Return the purchase summary of the orders accepted by a filter, the cached summary when unfiltered.
+        """
+        if order_filter is None or order_filter.unrestricted:
+            return self.repository.purchase_summary()
+        return self.repository.filtered_purchase_summary(order_filter)
+
+    def _rollups(self, order_filter: OrderFilter | None) -> PurchaseRollups:
+        """
+        Return the rollups of the orders accepted by a filter, the cached rollups when unfiltered.
+        """
+        if order_filter is None or order_filter.unrestricted:
+            return self.repository.purchase_rollups()
+        return self.repository.filtered_rollups(order_filter)
+
+    def _total_spent(self, purchases: dict[Product, int]) -> Decimal:
+        """
+        Calculate the total amount spent on purchases in the configured arithmetic mode.
+        """
+        if self.fixed_point:
+            return self.calculate_total_spent_fixed_point(purchases).to_decimal()
+        return self.calculate_total_spent(purchases)
+
     @staticmethod
     def calculate_total_spent(purchases: dict[Product, int]) -> Decimal:
         """
@@ -0,0 +1,454 @@
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Hashable, Iterable
+import heapq
+import math
+import random
+
+MASK_64 = (1 << 64) - 1
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def hash64(key: Hashable, seed: int = 0) -> int:
+    """
+    Hash a key to 64 bits, deterministically across processes.
+
+    Integers are mixed with the SplitMix64 finalizer; other keys go through
+    `hash` first, so only integer keys are stable between interpreter runs.
+
+    Args:
+        key (Hashable): The key to hash.
+        seed (int): The seed selecting an independent hash function.
+
+    Returns:
+        int: A 64-bit hash value.
+    """
+    value = key if isinstance(key, int) else hash(key)
+    value = (value + seed * 0x9E3779B97F4A7C15 + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+@dataclass
+class CountMinSketch:
+    """
+    Count-Min sketch estimating the frequency of keys in a stream.
+
+    Estimates never underestimate; with probability `1 - delta` they overestimate
+    by at most `epsilon * total`. Sketches with the same dimensions can be merged.
+
+    Attributes:
+        epsilon (float): The relative error bound.
+        delta (float): The probability of exceeding the error bound.
+        total (int): The sum of all added counts.
+
+    Methods:
+        add(key: Hashable, count: int = 1) -> None:
+            Add a count for a key.
+        estimate(key: Hashable) -> int:
+            Estimate the total count of a key.
+        merge(other: CountMinSketch) -> CountMinSketch:
+            Return a sketch of both streams.
+    """
+    epsilon: float = 0.001
+    delta: float = 0.01
+    total: int = 0
+    _tables: list[array] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """
+        Allocate the counter tables.
+        """
+        self._tables = [array('q', bytes(8 * self.width)) for _ in range(self.depth)]
+
+    @property
+    def width(self) -> int:
+        """
+        Return the number of counters per row.
+        """
+        return math.ceil(math.e / self.epsilon)
+
+    @property
+    def depth(self) -> int:
+        """
+        Return the number of rows, one per hash function.
+        """
+        return math.ceil(math.log(1 / self.delta))
+
+    def add(self, key: Hashable, count: int = 1) -> None:
+        """
+        Add a count for a key.
+        """
+        width = self.width
+        for seed, table in enumerate(self._tables):
+            table[hash64(key, seed) % width] += count
+        self.total += count
+
+    def estimate(self, key: Hashable) -> int:
+        """
+        Estimate the total count of a key.
+        """
+        width = self.width
+        return min(table[hash64(key, seed) % width] for seed, table in enumerate(self._tables))
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """
+        Return a sketch of both streams.
+
+        Raises:
+            ValueError: If the sketches have different dimensions.
+        """
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge Count-Min sketches with different dimensions.")
+        merged = CountMinSketch(self.epsilon, self.delta, self.total + other.total)
+        merged._tables = [array('q', (a + b for a, b in zip(mine, theirs)))
+                          for mine, theirs in zip(self._tables, other._tables)]
+        return merged
+
+
+@dataclass
+class SpaceSaving[K: Hashable]:
+    """
+    Space-Saving summary of the heaviest keys of a stream.
+
+    Keeps at most `capacity` counters. Every key whose total count exceeds
+    `total / capacity` is guaranteed to be monitored; its counter overestimates
+    the true count by at most its recorded error.
+
+    The smallest counter is found with a lazy min-heap holding one entry per
+    monitored key. Counts only grow, so an entry may record less than the current
+    count; such stale entries are refreshed when they reach the top. Every refresh
+    follows at least one increment, so adding a key costs O(1) when it is
+    monitored and amortized O(log capacity) when a counter is replaced.
+
+    Attributes:
+        capacity (int): The maximum number of monitored keys.
+        total (int): The sum of all added counts.
+        counters (dict[K, int]): Estimated counts of the monitored keys.
+        errors (dict[K, int]): Maximum overestimation of every monitored key.
+
+    Methods:
+        add(key: K, count: int = 1) -> None:
+            Add a count for a key.
+        top(k: int | None = None) -> list[tuple[K, int]]:
+            Return the monitored keys with the highest counts.
+        merge(other: SpaceSaving[K]) -> SpaceSaving[K]:
+            Return a summary of both streams.
+    """
+    capacity: int = 100
+    total: int = 0
+    counters: dict[K, int] = field(default_factory=dict)
+    errors: dict[K, int] = field(default_factory=dict)
+    _heap: list[tuple[int, int, K]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _pushes: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """
+        Build the heap of the initial counters.
+        """
+        self._heap = [(count, number, key) for number, (key, count) in enumerate(self.counters.items())]
+        heapq.heapify(self._heap)
+        self._pushes = len(self._heap)
+
+    def _entry(self, key: K, count: int) -> tuple[int, int, K]:
+        """
+        Return a heap entry; the push number orders equal counts, so keys are never compared.
+        """
+        self._pushes += 1
+        return count, self._pushes, key
+
+    def add(self, key: K, count: int = 1) -> None:
+        """
+        Add a count for a key, replacing the smallest counter when the summary is full.
+        """
+        self.total += count
+        counters = self.counters
+        if key in counters:
+            counters[key] += count
+            return
+        if len(counters) < self.capacity:
+            counters[key] = count
+            self.errors[key] = 0
+            heapq.heappush(self._heap, self._entry(key, count))
+            return
+        heap = self._heap
+        while heap[0][0] != counters[heap[0][2]]:
+            stale = heap[0][2]
+            heapq.heapreplace(heap, self._entry(stale, counters[stale]))
+        minimum, _, evicted = heap[0]
+        del counters[evicted]
+        del self.errors[evicted]
+        counters[key] = minimum + count
+        self.errors[key] = minimum
+        heapq.heapreplace(heap, self._entry(key, minimum + count))
+
+    def top(self, k: int | None = None) -> list[tuple[K, int]]:
+        """
+        Return the monitored keys with the highest counts.
+
+        Args:
+            k (int | None): The number of keys to return, all monitored keys when None.
+
+        Returns:
+            list[tuple[K, int]]: Keys with estimated counts, highest first.
+        """
+        ranked = sorted(self.counters.items(), key=lambda item: item[1], reverse=True)
+        return ranked if k is None else ranked[:k]
+
+    def merge(self, other: "SpaceSaving[K]") -> "SpaceSaving[K]":
+        """
+        Return a summary of both streams.
+
+        Keys missing from a full summary may still have a count up to its smallest
+        counter, which is added to their estimate and error.
+        """
+        own_floor = min(self.counters.values()) if len(self.counters) >= self.capacity else 0
+        other_floor = min(other.counters.values()) if len(other.counters) >= other.capacity else 0
+        counters: dict[K, int] = {}
+        errors: dict[K, int] = {}
+        for key in self.counters.keys() | other.counters.keys():
+            counters[key] = self.counters.get(key, own_floor) + other.counters.get(key, other_floor)
+            errors[key] = self.errors.get(key, own_floor) + other.errors.get(key, other_floor)
+        capacity = max(self.capacity, other.capacity)
+        kept = sorted(counters, key=counters.__getitem__, reverse=True)[:capacity]
+        return SpaceSaving(
+            capacity=capacity,
+            total=self.total + other.total,
+            counters={key: counters[key] for key in kept},
+            errors={key: errors[key] for key in kept}
+        )
+
+
+@dataclass
+class HyperLogLog:
+    """
+    HyperLogLog estimator of the number of distinct keys in a stream.
+
+    The relative standard error is about `1.04 / sqrt(2 ** precision)`.
+    Estimators with the same precision can be merged.
+
+    Attributes:
+        precision (int): The number of index bits, between 4 and 16.
+
+    Methods:
+        for_error(relative_error: float) -> HyperLogLog:
+            Create an estimator with the given relative standard error.
+        add(key: Hashable) -> None:
+            Add a key.
+        count() -> int:
+            Estimate the number of distinct keys.
+        merge(other: HyperLogLog) -> HyperLogLog:
+            Return an estimator of the union of both streams.
+    """
+    precision: int = 12
+    _registers: bytearray = field(default_factory=bytearray, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """
+        Allocate the registers.
+
+        Raises:
+            ValueError: If the precision is out of range.
+        """
+        if not 4 <= self.precision <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16.")
+        self._registers = bytearray(1 << self.precision)
+
+    @classmethod
+    def for_error(cls, relative_error: float) -> "HyperLogLog":
+        """
+        Create an estimator with the given relative standard error.
+
+        Args:
+            relative_error (float): The target relative standard error, e.g. 0.02.
+
+        Returns:
+            HyperLogLog: An estimator with the smallest sufficient precision.
+        """
+        precision = math.ceil(math.log2((1.04 / relative_error) ** 2))
+        return cls(precision=min(16, max(4, precision)))
+
+    def add(self, key: Hashable) -> None:
+        """
+        Add a key.
+        """
+        value = hash64(key)
+        index = value >> (64 - self.precision)
+        remaining_bits = 64 - self.precision
+        remaining = value & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - remaining.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct keys.
+        """
+        registers = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / registers) if registers >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[registers]
+        estimate = alpha * registers * registers / sum(2.0 ** -register for register in self._registers)
+        empty = self._registers.count(0)
+        if estimate <= 2.5 * registers and empty:
+            estimate = registers * math.log(registers / empty)
+        return round(estimate)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Return an estimator of the union of both streams.
+
+        Raises:
+            ValueError: If the estimators have different precisions.
+        """
+        if self.precision != other.precision:
+            raise ValueError("Cannot merge HyperLogLog estimators with different precisions.")
+        merged = HyperLogLog(self.precision)
+        merged._registers = bytearray(max(a, b) for a, b in zip(self._registers, other._registers))
+        return merged
+
+
+@dataclass
+class QuantileSketch[T: (int, float, Decimal)]:
+    """
+    KLL sketch of the distribution of a stream of comparable values.
+
+    Values are kept unchanged in compactors of increasing weight. While fewer than
+    `exact_limit` values were added nothing is compacted and quantiles are exact;
+    afterwards the memory is O(k) and the rank error is about `1.7 / k` with high
+    probability. Returned quantiles are always values of the stream. Sketches with
+    the same `k` can be merged.
+
+    Attributes:
+        k (int): The size of the top compactor, which controls accuracy.
+        exact_limit (int): The number of values kept exactly before compacting.
+        seed (int): Seed of the compaction coin flips.
+        count (int): The number of added values.
+
+    Methods:
+        add(value: T) -> None:
+            Add a value.
+        quantile(q: float) -> T:
+            Return the value at a quantile.
+        quantiles(qs: Iterable[float]) -> dict[float, T]:
+            Return the values at several quantiles.
+        merge(other: QuantileSketch[T]) -> QuantileSketch[T]:
+            Return a sketch of both streams.
+    """
+    k: int = 200
+    exact_limit: int = 1000
+    seed: int = 0
+    count: int = 0
+    _levels: list[list[T]] = field(default_factory=lambda: [[]], init=False, repr=False)
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """
+        Seed the compaction coin flips.
+        """
+        self._rng = random.Random(self.seed)
+
+    @property
+    def is_exact(self) -> bool:
+        """
+        Return True while every added value is kept.
+        """
+        return len(self._levels) == 1
+
+    def add(self, value: T) -> None:
+        """
+        Add a value.
+        """
+        self._levels[0].append(value)
+        self.count += 1
+        if len(self._levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def quantile(self, q: float) -> T:
+        """
+        Return the value at a quantile, using the nearest-rank method.
+
+        Args:
+            q (float): The quantile in the range [0, 1].
+
+        Returns:
+            T: The smallest stored value whose cumulative weight reaches `q * count`.
+
+        Raises:
+            ValueError: If the sketch is empty or `q` is out of range.
+        """
+        return self.quantiles([q])[q]
+
+    def quantiles(self, qs: Iterable[float]) -> dict[float, T]:
+        """
+        Return the values at several quantiles.
+
+        Args:
+            qs (Iterable[float]): Quantiles in the range [0, 1].
+
+        Returns:
+            dict[float, T]: The value at every requested quantile.
+
+        Raises:
+            ValueError: If the sketch is empty or a quantile is out of range.
+        """
+        if not self.count:
+            raise ValueError("Cannot compute quantiles of an empty sketch.")
+        weighted = sorted(((value, 1 << level) for level, values in enumerate(self._levels) for value in values),
+                          key=lambda item: item[0])
+        cumulative, total = [], 0
+        for _, weight in weighted:
+            total += weight
+            cumulative.append(total)
+        result = {}
+        for q in qs:
+            if not 0 <= q <= 1:
+                raise ValueError(f"Quantile out of range: {q}")
+            rank = max(1, math.ceil(q * total))
+            result[q] = weighted[bisect_left(cumulative, rank)][0]
+        return result
+
+    def merge(self, other: "QuantileSketch[T]") -> "QuantileSketch[T]":
+        """
+        Return a sketch of both streams.
+
+        Raises:
+            ValueError: If the sketches have different sizes.
+        """
+        if self.k != other.k:
+            raise ValueError("Cannot merge quantile sketches with different sizes.")
+        merged: QuantileSketch[T] = QuantileSketch(self.k, self.exact_limit, self.seed, self.count + other.count)
+        height = max(len(self._levels), len(other._levels))
+        merged._levels = [
+            (self._levels[level] if level < len(self._levels) else [])
+            + (other._levels[level] if level < len(other._levels) else [])
+            for level in range(height)
+        ]
+        merged._compress()
+        return merged
+
+    def _capacity(self, level: int) -> int:
+        """
+        Return the capacity of a compactor; lower levels shrink geometrically.
+        """
+        if len(self._levels) == 1:
+            return max(self.exact_limit, self.k)
+        depth = len(self._levels) - 1 - level
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _compress(self) -> None:
+        """
+        Compact every compactor over its capacity, promoting half of its values.
+        """
+        level = 0
+        while level < len(self._levels):
+            values = self._levels[level]
+            if len(values) >= self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append([])
+                values.sort()
+                kept = [values.pop()] if len(values) % 2 else []
+                self._levels[level + 1].extend(values[self._rng.randrange(2)::2])
+                self._levels[level] = kept
+            level += 1
@@ -0,0 +1,380 @@
+from array import array
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Iterable
+import logging
+
+from src.metrics import measure
+from src.repository import PurchaseSummaryRepository, CustomerProductQuantities, CustomerProductQuantitiesView
+
+
+@dataclass
+class PurchaseMatrix:
+    """
+    Customer x product quantity matrix stored in the CSR (compressed sparse row) format.
+
+    Customers and products are mapped to dense row and column indices. The quantities
+    of row `r` are `quantities[indptr[r]:indptr[r + 1]]` with their column indices in
+    `indices` at the same positions. All arrays are typed `array('q')`, so one stored
+    entry costs 16 bytes instead of a dictionary entry per customer-product pair.
+    A CSC (compressed sparse column) copy used for per-product queries is built on
+    first use.
+
+    Attributes:
+        customer_ids (array[int]): Customer id of every row.
+        product_ids (array[int]): Product id of every column.
+        indptr (array[int]): Row start offsets into `indices` and `quantities`, one more than rows.
+        indices (array[int]): Column index of every stored entry, sorted within a row.
+        quantities (array[int]): Quantity of every stored entry.
+
+    Methods:
+        from_triples(customer_ids, product_ids, triples) -> PurchaseMatrix:
+            Build the matrix from (customer id, product id, quantity) triples.
+        row(customer_id: int) -> dict[int, int]:
+            Return the quantities purchased by a customer, keyed by product id.
+        has_purchases(customer_id: int) -> bool / buyers() -> Iterator[int]:
+            Test a customer for purchases, iterate the customers with purchases.
+        column(product_id: int) -> dict[int, int]:
+            Return the quantities of a product, keyed by customer id.
+        to_summary_by_id() -> CustomerProductQuantities:
+            Convert the matrix to the nested dictionary summary.
+    """
+    customer_ids: array
+    product_ids: array
+    indptr: array
+    indices: array
+    quantities: array
+    _customer_index: dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    _product_index: dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    _csc: tuple[array, array, array] | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """
+        Index customer and product ids.
+        """
+        self._customer_index = {customer_id: index for index, customer_id in enumerate(self.customer_ids)}
+        self._product_index = {product_id: index for index, product_id in enumerate(self.product_ids)}
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """
+        Return the number of rows (customers) and columns (products).
+        """
+        return len(self.customer_ids), len(self.product_ids)
+
+    @property
+    def nnz(self) -> int:
+        """
+        Return the number of stored customer-product entries.
+        """
+        return len(self.quantities)
+
+    @classmethod
+    def from_triples(
+            cls,
+            customer_ids: Iterable[int],
+            product_ids: Iterable[int],
+            triples: Iterable[tuple[int, int, int]]) -> "PurchaseMatrix":
+        """
+        Build the matrix from (customer id, product id, quantity) triples.
+
+        The triples are collected in COO (coordinate) arrays, distributed to rows with a
+        counting sort, and duplicate columns within a row are summed.
+
+        Args:
+            customer_ids (Iterable[int]): Ids of all customers, in row order.
+            product_ids (Iterable[int]): Ids of all products, in column order.
+            triples (Iterable[tuple[int, int, int]]): Triples referencing only known ids.
+
+        Returns:
+            PurchaseMatrix: The built matrix.
+        """
+        customers = array('q', customer_ids)
+        products = array('q', product_ids)
+        customer_index = {customer_id: index for index, customer_id in enumerate(customers)}
+        product_index = {product_id: index for index, product_id in enumerate(products)}
+
+        rows, cols, values = array('q'), array('q'), array('q')
+        for customer_id, product_id, quantity in triples:
+            rows.append(customer_index[customer_id])
+            cols.append(product_index[product_id])
+            values.append(quantity)
+
+        # Counting sort of the COO entries by row
+        offsets = array('q', bytes(8 * (len(customers) + 1)))
+        for row in rows:
+            offsets[row + 1] += 1
+        for row in range(len(customers)):
+            offsets[row + 1] += offsets[row]
+        position = array('q', offsets)
+        sorted_cols, sorted_values = array('q', bytes(8 * len(rows))), array('q', bytes(8 * len(rows)))
+        for row, col, value in zip(rows, cols, values):
+            sorted_cols[position[row]] = col
+            sorted_values[position[row]] = value
+            position[row] += 1
+        del rows, cols, values, position
+
+        # Sum duplicate columns within every row
+        indptr, indices, quantities = array('q', [0]), array('q'), array('q')
+        for row in range(len(customers)):
+            merged: dict[int, int] = {}
+            for index in range(offsets[row], offsets[row + 1]):
+                col = sorted_cols[index]
+                merged[col] = merged.get(col, 0) + sorted_values[index]
+            for col in sorted(merged):
+                indices.append(col)
+                quantities.append(merged[col])
+            indptr.append(len(indices))
+        return cls(customers, products, indptr, indices, quantities)
+
+    def row(self, customer_id: int) -> dict[int, int]:
+        """
+        Return the quantities purchased by a customer.
+
+        Args:
+            customer_id (int): The customer id.
+
+        Returns:
+            dict[int, int]: Quantities keyed by product id, empty for unknown customers.
+        """
+        row = self._customer_index.get(customer_id)
+        if row is None:
+            return {}
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return {self.product_ids[col]: quantity
+                for col, quantity in zip(self.indices[start:end], self.quantities[start:end])}
+
+    def has_purchases(self, customer_id: int) -> bool:
+        """
+        Return True if a customer has a stored entry.
+
+        Args:
+            customer_id (int): The customer id.
+
+        Returns:
+            bool: False for unknown customers and customers without purchases.
+        """
+        row = self._customer_index.get(customer_id)
+        return row is not None and self.indptr[row] < self.indptr[row + 1]
+
+    def buyers(self) -> Iterator[int]:
+        """
+        Return the ids of the customers with a stored entry, in row order.
+        """
+        indptr = self.indptr
+        return (customer_id for row, customer_id in enumerate(self.customer_ids) if indptr[row] < indptr[row + 1])
+
+    def column(self, product_id: int) -> dict[int, int]:
+        """
+        Return the quantities of a product purchased by every customer.
+
+        Args:
+            product_id (int): The product id.
+
+        Returns:
+            dict[int, int]: Quantities keyed by customer id, empty for unknown products.
+        """
+        col = self._product_index.get(product_id)
+        if col is None:
+            return {}
+        colptr, row_indices, quantities = self._column_major()
+        start, end = colptr[col], colptr[col + 1]
+        return {self.customer_ids[row]: quantity
+                for row, quantity in zip(row_indices[start:end], quantities[start:end])}
+
+    def product_totals(self) -> dict[int, int]:
+        """
+        Return the total purchased quantity of every product with purchases.
+
+        Returns:
+            dict[int, int]: Quantities keyed by product id.
+        """
+        totals = array('q', bytes(8 * len(self.product_ids)))
+        for col, quantity in zip(self.indices, self.quantities):
+            totals[col] += quantity
+        return {self.product_ids[col]: total for col, total in enumerate(totals) if total}
+
+    def to_summary_by_id(self) -> CustomerProductQuantities:
+        """
+        Convert the matrix to the nested dictionary summary.
+
+        Customers without purchases are left out, customers and products keep
+        the row and column order.
+
+        Returns:
+            CustomerProductQuantities: A dictionary mapping customer ids to product ids and quantities.
+        """
+        summary: CustomerProductQuantities = {}
+        for row, customer_id in enumerate(self.customer_ids):
+            start, end = self.indptr[row], self.indptr[row + 1]
+            if start < end:
+                summary[customer_id] = {self.product_ids[col]: quantity
+                                        for col, quantity in zip(self.indices[start:end], self.quantities[start:end])}
+        return summary
+
+    def _column_major(self) -> tuple[array, array, array]:
+        """
+        Return the CSC copy of the matrix, building it on first use.
+        """
+        if self._csc is None:
+            colptr = array('q', bytes(8 * (len(self.product_ids) + 1)))
+            for col in self.indices:
+                colptr[col + 1] += 1
+            for col in range(len(self.product_ids)):
+                colptr[col + 1] += colptr[col]
+            position = array('q', colptr)
+            row_indices = array('q', bytes(8 * self.nnz))
+            quantities = array('q', bytes(8 * self.nnz))
+            for row in range(len(self.customer_ids)):
+                for index in range(self.indptr[row], self.indptr[row + 1]):
+                    col = self.indices[index]
+                    row_indices[position[col]] = row
+                    quantities[position[col]] = self.quantities[index]
+                    position[col] += 1
+            self._csc = (colptr, row_indices, quantities)
+        return self._csc
+
+
+@dataclass(eq=False)
+class PurchaseMatrixSummary(Mapping[int, dict[int, int]]):
+    """
+    Read-only summary keyed by customer and product ids answered from a purchase matrix.
+
+    Only customers with purchases are keys, in row order. The quantities of a customer
+    are sliced from the matrix on access, so no nested dictionary is kept beside it.
+    Equality with other mappings compares the items.
+
+    Attributes:
+        matrix (PurchaseMatrix): The customer x product quantity matrix.
+    """
+    matrix: PurchaseMatrix
+
+    def __getitem__(self, customer_id: int) -> dict[int, int]:
+        if customer_id not in self:
+            raise KeyError(customer_id)
+        return self.matrix.row(customer_id)
+
+    def __contains__(self, customer_id: object) -> bool:
+        return isinstance(customer_id, int) and self.matrix.has_purchases(customer_id)
+
+    def __iter__(self) -> Iterator[int]:
+        return self.matrix.buyers()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.matrix.buyers())
+
+
+@dataclass
+class SparsePurchaseSummaryRepository[C, P, O](PurchaseSummaryRepository[C, P, O]):
+    """
+    Purchase summary repository backed by a sparse customer x product matrix.
+
+    Per-customer and per-product queries are answered by slicing the matrix, and
+    `purchase_summary_by_id()` is a `PurchaseMatrixSummary` view of it, so no nested
+    dictionary summary is kept beside the matrix. The `purchase_summary()` mapping of
+    the base class is built from the view on demand.
+
+    The matrix is built on first use and rebuilt when a refresh is forced, which
+    increments `version` like a rebuild of the base summary. The CSR matrix cannot
+    grow in place, so after `add_order` or `apply_changes`, which already increment
+    `version`, it is rebuilt on next use for the changed data.
+
+    Attributes:
+        _matrix (PurchaseMatrix | None): Cached purchase matrix.
+        _matrix_version (int): The `version` the cached matrix was built for.
+
+    Methods:
+        purchase_matrix(forced_refreshed: bool = False) -> PurchaseMatrix:
+            Retrieve or refresh the purchase matrix.
+        purchase_summary_by_id(forced_refreshed: bool = False) -> CustomerProductQuantitiesView:
+            Retrieve or refresh the purchase matrix and return a summary view of it.
+        customer_purchases(customer_id: int) -> dict[int, int]:
+            Return the quantities purchased by a customer, keyed by product id.
+        product_buyers(product_id: int) -> dict[int, int]:
+            Return the quantities of a product, keyed by customer id.
+    """
+    _matrix: PurchaseMatrix | None = field(default=None, init=False)
+    _matrix_version: int = field(default=-1, init=False)
+
+    def purchase_matrix(self, forced_refreshed: bool = False) -> PurchaseMatrix:
+        """
+        Retrieve or refresh the purchase matrix.
+
+        Args:
+            forced_refreshed (bool): If True, forces a refresh of the matrix.
+
+        Returns:
+            PurchaseMatrix: The customer x product quantity matrix.
+        """
+        if forced_refreshed or self._matrix is None or self._matrix_version != self.version:
+            logging.info("Building or refreshing purchase matrix from repositories ...")
+            if forced_refreshed or self._matrix is None:
+                self._purchase_summary = {}
+                self.version += 1
+            self._matrix = self._build_matrix()
+            self._matrix_version = self.version
+        return self._matrix
+
+    def purchase_summary_by_id(self, forced_refreshed: bool = False) -> CustomerProductQuantitiesView:
+        """
+        Retrieve or refresh the purchase matrix and return a summary view of it.
+
+        Args:
+            forced_refreshed (bool): If True, forces a refresh of the matrix.
+
+        Returns:
+            CustomerProductQuantitiesView: A read-only mapping of customer ids to product ids and quantities.
+        """
+        return PurchaseMatrixSummary(self.purchase_matrix(forced_refreshed))
+
+    def customer_purchases(self, customer_id: int) -> dict[int, int]:
+        """
+        Return the quantities purchased by a customer.
+
+        Args:
+            customer_id (int): The customer id.
+
+        Returns:
+            dict[int, int]: Quantities keyed by product id.
+        """
+        return self.purchase_matrix().row(customer_id)
+
+    def product_buyers(self, product_id: int) -> dict[int, int]:
+        """
+        Return the quantities of a product purchased by every customer.
+
+        Args:
+            product_id (int): The product id.
+
+        Returns:
+            dict[int, int]: Quantities keyed by customer id.
+        """
+        return self.purchase_matrix().column(product_id)
+
+    def _build_matrix(self) -> PurchaseMatrix:
+        """
+        Internal method to build the purchase matrix from the repositories.
+
+        Returns:
+            PurchaseMatrix: The customer x product quantity matrix.
+        """
+        customer_ids = [customer.id for customer in self.customer_repo.get_data()]
+        product_ids = [product.id for product in self.product_repo.get_data()]
+        known_customers, known_products = set(customer_ids), set(product_ids)
+        orders = self.order_repo.get_data()
+        dangling_orders = 0
+
+        def valid_triples() -> Iterable[tuple[int, int, int]]:
+            nonlocal dangling_orders
+            for order in orders:
+                if order.customer_id in known_customers and order.product_id in known_products:
+                    yield order.customer_id, order.product_id, order.quantity
+                else:
+                    dangling_orders += 1
+                    self._report_invalid_reference(order)
+
+        with measure("purchase_summary.build_matrix") as stage:
+            stage.rows = len(orders)
+            matrix = PurchaseMatrix.from_triples(customer_ids, product_ids, valid_triples())
+        self._finish_invalid_references(dangling_orders)
+        return matrix
@@ -0,0 +1,462 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Iterable
+import logging
+import math
+
+from src.converter import AbstractConverter
+from src.file_service import FileReader
+from src.filters import OrderFilter
+from src.metrics import measure
+from src.money import Money
+from src.model import Customer, Product, Order, OrderDataDict, ProductCategory
+from src.repository import DataRepository
+from src.sketch import DEFAULT_QUANTILES, CountMinSketch, HyperLogLog, QuantileSketch, SpaceSaving
+from src.validator import Validator
+
+
+@dataclass
+class StreamingAnalyticsResult:
+    """
+    Aggregates collected by one pass over an order stream.
+
+    Holds only per-customer and per-product values, so its size is
+    O(customers + products) regardless of the number of orders.
+
+    Attributes:
+        customers (dict[int, Customer]): Known customers by id.
+        products (dict[int, Product]): Known products by id.
+        customer_spent (dict[int, Decimal]): Total spent by customer id, in order of the first purchase.
+        customer_quantities (dict[int, int]): Total purchased quantity by customer id.
+        product_quantities (dict[int, int]): Total purchased quantity by product id.
+        order_quantities (QuantileSketch[int]): Distribution of the quantity per valid order.
+        orders (int): The number of orders read from the stream.
+        invalid_orders (int): The number of orders rejected by the validator.
+        dangling_orders (int): The number of orders referencing an unknown customer or product.
+        filtered_orders (int): The number of orders skipped by the order filter.
+
+    Methods:
+        calculate_avarage_spending_per_customer() -> dict[Customer, Decimal]:
+            Calculate the average spending per customer.
+        find_most_popular_products() -> list[Product]:
+            Find the most popular products based on purchase quantities.
+        find_highest_and_lowest_spenders() -> tuple[list[Customer], list[Customer]]:
+            Identify the highest and lowest spenders among customers.
+        spending_quantiles(quantiles: Iterable[float]) -> dict[float, Decimal]:
+            Calculate quantiles of the total spending per customer.
+        order_quantity_quantiles(quantiles: Iterable[float]) -> dict[float, int]:
+            Calculate quantiles of the quantity per order.
+    """
+    customers: dict[int, Customer]
+    products: dict[int, Product]
+    customer_spent: dict[int, Decimal] = field(default_factory=dict)
+    customer_quantities: dict[int, int] = field(default_factory=dict)
+    product_quantities: dict[int, int] = field(default_factory=dict)
+    order_quantities: QuantileSketch[int] = field(default_factory=QuantileSketch)
+    orders: int = 0
+    invalid_orders: int = 0
+    dangling_orders: int = 0
+    filtered_orders: int = 0
+
+    def calculate_avarage_spending_per_customer(self) -> dict[Customer, Decimal]:
+        """
+        Calculate the average spending per customer.
+
+        Returns:
+            dict[Customer, Decimal]: A dictionary mapping each customer to their average spending.
+        """
+        return {
+            self.customers[customer_id]: spent / Decimal(self.customer_quantities[customer_id])
+            if self.customer_quantities[customer_id] > 0 else Decimal("0.0")
+            for customer_id, spent in self.customer_spent.items()
+        }
+
+    def find_most_popular_products(self) -> list[Product]:
+        """
+        Find the most popular products based on purchase quantities.
+
+        Returns:
+            list[Product]: All products with the highest purchased quantity.
+        """
+        if not self.product_quantities:
+            return []
+        max_count = max(self.product_quantities.values())
+        return [self.products[product_id]
+                for product_id, count in self.product_quantities.items() if count == max_count]
+
+    def find_highest_and_lowest_spenders(self) -> tuple[list[Customer], list[Customer]]:
+        """
+        Identify the highest and lowest spenders among customers.
+
+        Returns:
+            tuple[list[Customer], list[Customer]]:
+                - A list of customers who spent the most.
+                - A list of customers who spent the least.
+        """
+        if not self.customer_spent:
+            return [], []
+        max_spent = max(self.customer_spent.values())
+        min_spent = min(self.customer_spent.values())
+        return (
+            [self.customers[customer_id] for customer_id, spent in self.customer_spent.items() if spent == max_spent],
+            [self.customers[customer_id] for customer_id, spent in self.customer_spent.items() if spent == min_spent]
+        )
+
+    def spending_quantiles(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> dict[float, Decimal]:
+        """
+        Calculate quantiles of the total spending per customer.
+
+        Args:
+            quantiles (Iterable[float]): Quantiles in the range [0, 1], p50, p90 and p99 by default.
+
+        Returns:
+            dict[float, Decimal]: The total spending at every quantile, empty when there are no purchases.
+        """
+        sketch: QuantileSketch[Decimal] = QuantileSketch()
+        for spent in self.customer_spent.values():
+            sketch.add(spent)
+        return sketch.quantiles(quantiles) if sketch.count else {}
+
+    def order_quantity_quantiles(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> dict[float, int]:
+        """
+        Calculate quantiles of the quantity per order.
+
+        Args:
+            quantiles (Iterable[float]): Quantiles in the range [0, 1], p50, p90 and p99 by default.
+
+        Returns:
+            dict[float, int]: The order quantity at every quantile, empty when there are no valid orders.
+        """
+        return self.order_quantities.quantiles(quantiles) if self.order_quantities.count else {}
+
+
+@dataclass
+class StreamingPurchaseAnalytics[C, P]:
+    """
+    One-pass purchase analytics over an order file which is never materialized.
+
+    Only the customer and product repositories are loaded. Orders are read one
+    at a time from the file reader stream, validated, converted and aggregated,
+    so memory usage is O(customers + products) instead of O(orders). The result
+    answers every `PurchasesSummaryService` metric.
+
+    Attributes:
+        customer_repo (DataRepository[C, Customer]): Repository for customer data.
+        product_repo (DataRepository[P, Product]): Repository for product data.
+        order_reader (FileReader[OrderDataDict]): The reader streaming raw orders.
+        order_validator (Validator[OrderDataDict]): The validator of raw orders.
+        order_converter (AbstractConverter[OrderDataDict, Order]): The converter of raw orders.
+        fixed_point (bool): If True, spending is accumulated in integer minor units and
+            converted to `Decimal` once per customer at the end of the stream.
+        order_filter (OrderFilter | None): When set, raw orders it rejects are skipped
+            before validation and conversion.
+
+    Methods:
+        run(orders_file: str) -> StreamingAnalyticsResult:
+            Aggregate an order file in one pass.
+        _stream(orders_file, result, prices, customer_spent, zero) -> None:
+            Internal method to aggregate the orders of a file into a result.
+    """
+    customer_repo: DataRepository[C, Customer]
+    product_repo: DataRepository[P, Product]
+    order_reader: FileReader[OrderDataDict]
+    order_validator: Validator[OrderDataDict]
+    order_converter: AbstractConverter[OrderDataDict, Order]
+    fixed_point: bool = False
+    order_filter: OrderFilter | None = None
+
+    def run(self, orders_file: str) -> StreamingAnalyticsResult:
+        """
+        Aggregate an order file in one pass.
+
+        Args:
+            orders_file (str): The name of the order file.
+
+        Returns:
+            StreamingAnalyticsResult: Per-customer and per-product aggregates.
+        """
+        result = StreamingAnalyticsResult(
+            customers={customer.id: customer for customer in self.customer_repo.get_data()},
+            products={product.id: product for product in self.product_repo.get_data()}
+        )
+        if self.fixed_point:
+            minor_spent: dict[int, int] = {}
+            self._stream(orders_file, result, {product_id: product.money.minor
+                                               for product_id, product in result.products.items()}, minor_spent, 0)
+            result.customer_spent = {customer_id: Money(spent).to_decimal() for customer_id, spent in minor_spent.items()}
+        else:
+            self._stream(orders_file, result, {product_id: product.price
+                                               for product_id, product in result.products.items()},
+                         result.customer_spent, Decimal("0.0"))
+        return result
+
+    def _stream[A: (int, Decimal)](
+            self,
+            orders_file: str,
+            result: StreamingAnalyticsResult,
+            prices: dict[int, A],
+            customer_spent: dict[int, A],
+            zero: A) -> None:
+        """
+        Internal method to aggregate the orders of a file into a result.
+
+        Spending is accumulated in the type of the prices, integer minor units or `Decimal`.
+
+        Args:
+            orders_file (str): The name of the order file.
+            result (StreamingAnalyticsResult): The result receiving the counts and quantities.
+            prices (dict[int, A]): Unit price by product id.
+            customer_spent (dict[int, A]): Receives the total spent by customer id.
+            zero (A): The zero of the price type.
+        """
+        customer_quantities = result.customer_quantities
+        product_quantities = result.product_quantities
+        order_quantities = result.order_quantities
+        accepts = None
+        if self.order_filter is not None and not self.order_filter.unrestricted:
+            accepts = self.order_filter.row_predicate(result.customers.values(), result.products.values())
+
+        logging.info("Streaming orders from %s...", orders_file)
+        with measure("streaming.run") as stage:
+            for entry in self.order_reader.stream(orders_file):
+                result.orders += 1
+                if accepts is not None and not accepts(entry):
+                    result.filtered_orders += 1
+                    continue
+                if not self.order_validator.validate(entry):
+                    result.invalid_orders += 1
+                    logging.error("Invalid entry: %s", entry)
+                    continue
+                order = self.order_converter.convert(entry)
+                price = prices.get(order.product_id)
+                if price is None or order.customer_id not in result.customers:
+                    result.dangling_orders += 1
+                    logging.warning("Order %s has invalid customer or product reference.", order.id)
+                    continue
+                customer_id = order.customer_id
+                customer_spent[customer_id] = customer_spent.get(customer_id, zero) + price * order.quantity
+                customer_quantities[customer_id] = customer_quantities.get(customer_id, 0) + order.quantity
+                product_quantities[order.product_id] = product_quantities.get(order.product_id, 0) + order.quantity
+                order_quantities.add(order.quantity)
+            stage.rows = result.orders
+
+
+@dataclass
+class PurchaseSketches:
+    """
+    Approximate popularity and distinct-customer aggregates of an order stream.
+
+    Product quantities are kept in a Count-Min sketch and the heaviest products in a
+    Space-Saving summary, so their memory is fixed by the error bounds instead of the
+    number of products seen. Distinct customers are estimated with one HyperLogLog per
+    product and per category. Sketches built with the same bounds on different slices
+    of the stream can be merged.
+
+    Attributes:
+        epsilon (float): Relative error bound of the product quantities, as a fraction of all quantities.
+        delta (float): Probability of exceeding `epsilon`.
+        distinct_error (float): Relative standard error of the distinct customer counts.
+        product_quantities (CountMinSketch): Purchased quantity by product id.
+        heavy_hitters (SpaceSaving[int]): The most purchased product ids.
+        product_customers (dict[int, HyperLogLog]): Distinct customers by product id.
+        category_customers (dict[ProductCategory, HyperLogLog]): Distinct customers by category.
+
+    Methods:
+        add(customer_id: int, product_id: int, category: ProductCategory, quantity: int) -> None:
+            Add one order.
+        estimate_product_quantity(product_id: int) -> int:
+            Estimate the purchased quantity of a product.
+        top_products(k: int) -> list[tuple[int, int]]:
+            Return the estimated most popular products with their quantities.
+        distinct_customers(product_id: int) -> int:
+            Estimate the number of distinct customers of a product.
+        distinct_customers_by_category() -> dict[ProductCategory, int]:
+            Estimate the number of distinct customers of every category.
+        merge(other: PurchaseSketches) -> PurchaseSketches:
+            Return the sketches of both streams.
+    """
+    epsilon: float = 0.001
+    delta: float = 0.01
+    distinct_error: float = 0.02
+    product_quantities: CountMinSketch = field(init=False)
+    heavy_hitters: SpaceSaving[int] = field(init=False)
+    product_customers: dict[int, HyperLogLog] = field(default_factory=dict, init=False)
+    category_customers: dict[ProductCategory, HyperLogLog] = field(default_factory=dict, init=False)
+
+    def __post_init__(self) -> None:
+        """
+        Create the empty sketches from the error bounds.
+        """
+        self.product_quantities = CountMinSketch(self.epsilon, self.delta)
+        self.heavy_hitters = SpaceSaving(capacity=math.ceil(1 / self.epsilon))
+
+    def add(self, customer_id: int, product_id: int, category: ProductCategory, quantity: int) -> None:
+        """
+        Add one order.
+
+        Args:
+            customer_id (int): The id of the customer.
+            product_id (int): The id of the product.
+            category (ProductCategory): The category of the product.
+            quantity (int): The ordered quantity.
+        """
+        self.product_quantities.add(product_id, quantity)
+        self.heavy_hitters.add(product_id, quantity)
+        self._distinct(self.product_customers, product_id).add(customer_id)
+        self._distinct(self.category_customers, category).add(customer_id)
+
+    def estimate_product_quantity(self, product_id: int) -> int:
+        """
+        Estimate the purchased quantity of a product.
+
+        Args:
+            product_id (int): The id of the product.
+
+        Returns:
+            int: An estimate which is never below the true quantity.
+        """
+        estimate = self.product_quantities.estimate(product_id)
+        monitored = self.heavy_hitters.counters.get(product_id)
+        return estimate if monitored is None else min(estimate, monitored)
+
+    def top_products(self, k: int) -> list[tuple[int, int]]:
+        """
+        Return the estimated most popular products.
+
+        Args:
+            k (int): The number of products to return.
+
+        Returns:
+            list[tuple[int, int]]: Product ids with estimated quantities, highest first.
+        """
+        estimates = [(product_id, self.estimate_product_quantity(product_id))
+                     for product_id, _ in self.heavy_hitters.top()]
+        return sorted(estimates, key=lambda item: item[1], reverse=True)[:k]
+
+    def distinct_customers(self, product_id: int) -> int:
+        """
+        Estimate the number of distinct customers of a product.
+
+        Args:
+            product_id (int): The id of the product.
+
+        Returns:
+            int: The estimated number of customers, 0 for products without orders.
+        """
+        estimator = self.product_customers.get(product_id)
+        return estimator.count() if estimator is not None else 0
+
+    def distinct_customers_by_category(self) -> dict[ProductCategory, int]:
+        """
+        Estimate the number of distinct customers of every category with orders.
+
+        Returns:
+            dict[ProductCategory, int]: The estimated number of customers by category.
+        """
+        return {category: estimator.count() for category, estimator in self.category_customers.items()}
+
+    def merge(self, other: "PurchaseSketches") -> "PurchaseSketches":
+        """
+        Return the sketches of both streams.
+
+        Args:
+            other (PurchaseSketches): Sketches built with the same error bounds.
+
+        Returns:
+            PurchaseSketches: The merged sketches, neither operand is modified.
+        """
+        merged = PurchaseSketches(self.epsilon, self.delta, self.distinct_error)
+        merged.product_quantities = self.product_quantities.merge(other.product_quantities)
+        merged.heavy_hitters = self.heavy_hitters.merge(other.heavy_hitters)
+        merged.product_customers = self._merge_distinct(self.product_customers, other.product_customers)
+        merged.category_customers = self._merge_distinct(self.category_customers, other.category_customers)
+        return merged
+
+    def _merge_distinct[K](self, mine: dict[K, HyperLogLog], theirs: dict[K, HyperLogLog]) -> dict[K, HyperLogLog]:
+        """
+        Return the distinct counters of both streams by key, copying the counters of one stream only.
+        """
+        merged: dict[K, HyperLogLog] = {}
+        for key in mine.keys() | theirs.keys():
+            if key in mine and key in theirs:
+                merged[key] = mine[key].merge(theirs[key])
+            else:
+                merged[key] = (mine.get(key) or theirs[key]).merge(HyperLogLog(self._precision()))
+        return merged
+
+    def _distinct[K](self, estimators: dict[K, HyperLogLog], key: K) -> HyperLogLog:
+        """
+        Return the distinct counter of a key, creating it on first use.
+        """
+        estimator = estimators.get(key)
+        if estimator is None:
+            estimator = estimators[key] = HyperLogLog(self._precision())
+        return estimator
+
+    def _precision(self) -> int:
+        """
+        Return the HyperLogLog precision matching `distinct_error`.
+        """
+        return HyperLogLog.for_error(self.distinct_error).precision
+
+
+@dataclass
+class ApproximatePurchaseAnalytics[P]:
+    """
+    One-pass approximate popularity and distinct-customer analytics over an order file.
+
+    Unlike `StreamingPurchaseAnalytics`, neither the customers nor the per-product
+    quantities are held exactly: the memory is bounded by the configured error
+    bounds and the number of products, so it suits dashboards over unbounded streams.
+    Customer references are not checked, product references are needed for categories.
+
+    Attributes:
+        product_repo (DataRepository[P, Product]): Repository for product data.
+        order_reader (FileReader[OrderDataDict]): The reader streaming raw orders.
+        order_validator (Validator[OrderDataDict]): The validator of raw orders.
+        order_converter (AbstractConverter[OrderDataDict, Order]): The converter of raw orders.
+        epsilon (float): Relative error bound of the product quantities.
+        delta (float): Probability of exceeding `epsilon`.
+        distinct_error (float): Relative standard error of the distinct customer counts.
+
+    Methods:
+        run(orders_file: str) -> PurchaseSketches:
+            Sketch an order file in one pass.
+    """
+    product_repo: DataRepository[P, Product]
+    order_reader: FileReader[OrderDataDict]
+    order_validator: Validator[OrderDataDict]
+    order_converter: AbstractConverter[OrderDataDict, Order]
+    epsilon: float = 0.001
+    delta: float = 0.01
+    distinct_error: float = 0.02
+
+    def run(self, orders_file: str) -> PurchaseSketches:
+        """
+        Sketch an order file in one pass.
+
+        Args:
+            orders_file (str): The name of the order file.
+
+        Returns:
+            PurchaseSketches: The approximate aggregates of the valid orders.
+        """
+        categories = {product.id: product.category for product in self.product_repo.get_data()}
+        sketches = PurchaseSketches(self.epsilon, self.delta, self.distinct_error)
+        orders = 0
+
+        logging.info("Sketching orders from %s...", orders_file)
+        with measure("streaming.sketch") as stage:
+            for entry in self.order_reader.stream(orders_file):
+                orders += 1
+                if not self.order_validator.validate(entry):
+                    logging.error("Invalid entry: %s", entry)
+                    continue
+                order = self.order_converter.convert(entry)
+                category = categories.get(order.product_id)
+                if category is None:
+                    logging.warning("Order %s has invalid customer or product reference.", order.id)
+                    continue
+                sketches.add(order.customer_id, order.product_id, category, order.quantity)
+            stage.rows = orders
+        return sketches
@@ -3,7 +3,6 @@ from dataclasses import dataclass, field
 from decimal import Decimal, InvalidOperation
 from enum import Enum
 from typing import Type, override
-from email_validator import validate_email, EmailNotValidError
 import re
 import logging
 from src.model import (
@@ -13,8 +12,6 @@ from src.model import (
     ProductCategory,
     ShippingMethod)
 
-logging.basicConfig(level=logging.INFO)
-
 @dataclass
 class Validator[T]:
     """
@@ -26,8 +23,12 @@ class Validator[T]:
     Methods:
         validate(data: T) -> bool:
             Validate the data against required fields.
+        rejection_reason(data: T) -> str | None:
+            Return the name of the first failing validation rule without logging.
         has_required_keys(data: T, keys: list[str]) -> bool:
             Check if the data contains all required fields.
+        missing_keys(data: T, keys: list[str]) -> list[str]:
+            Return the required fields missing from the data.
         is_positive(data: int | str) -> bool:
             Check if the data is a positive number.
         is_valid_value_of(value: str, enum_class: Type[Enum]) -> bool:
@@ -49,21 +50,39 @@ class Validator[T]:
         """
         return len(self.required_fields) == 0 or self.has_required_keys(data, self.required_fields)
 
+    def rejection_reason(self, data: T) -> str | None:
+        """
+        Return the name of the first failing validation rule.
+
+        Unlike `validate`, this method does not log anything, so it can be used
+        when rejected entries are aggregated instead of logged one by one.
+
+        Returns:
+            str | None: The failing rule, e.g. "missing_keys:price", or None when the data is valid.
+        """
+        missing_keys = self.missing_keys(data, self.required_fields)
+        if missing_keys:
+            return f"missing_keys:{','.join(missing_keys)}"
+        return None
+
     def has_required_keys(self, data: T, keys: list[str]) -> bool:
         """
         Check if the data has the required fields.
         """
-        missing_keys = []
-        for key in keys:
-            if isinstance(data, dict):
-                if key not in data:
-                    missing_keys.append(key)
-            elif not hasattr(data, key):
-                missing_keys.append(key)        
+        missing_keys = self.missing_keys(data, keys)
         if missing_keys:
-            logging.error(f"Missing keys: {', '.join(missing_keys)}")
+            logging.error("Missing keys: %s", ", ".join(missing_keys))
             return False            
         return True
+
+    @staticmethod
+    def missing_keys(data: T, keys: list[str]) -> list[str]:
+        """
+        Return the required fields missing from the data.
+        """
+        if isinstance(data, dict):
+            return [key for key in keys if key not in data]
+        return [key for key in keys if not hasattr(data, key)]
     
 
     @staticmethod
@@ -79,7 +98,7 @@ class Validator[T]:
                     decimal_value = Decimal(value)
                     return decimal_value > 0
                 except InvalidOperation as e:
-                    logging.error(f"{str(e)}")
+                    logging.error("%s", e)
                     return False
             case _:
                 return False
@@ -96,11 +115,13 @@ class Validator[T]:
         """
         Validate the email address.
         """
+        # Imported on first use: email_validator and its DNS dependencies are slow to import
+        from email_validator import validate_email, EmailNotValidError
         try:
             validate_email(email, check_deliverability=True)
             return True
         except EmailNotValidError as e:
-            logging.error(f"{str(e)}")
+            logging.error("%s", e)
             return False   
 
     @staticmethod
@@ -119,7 +140,7 @@ class Validator[T]:
             decimal_value = Decimal(value)
             return min_value <= decimal_value <= max_value
         except InvalidOperation as e:
-            logging.error(f"{str(e)}")
+            logging.error("%s", e)
             return False
         
     @staticmethod
@@ -134,6 +155,34 @@ class Validator[T]:
         #     logging.error(f"String '{value}' does not match the regex '{regex}'")
         #     return False
 
+    @staticmethod
+    def _to_decimal(value: str) -> Decimal | None:
+        """
+        Convert the value to a decimal without logging, None if it is not a number.
+
+        NaN is also returned as None: comparing it raises `InvalidOperation`, and
+        `validate` rejects it.
+        """
+        try:
+            decimal_value = Decimal(value)
+        except (InvalidOperation, TypeError, ValueError):
+            return None
+        return None if decimal_value.is_nan() else decimal_value
+
+    @staticmethod
+    def _is_positive_quiet(data: int | str) -> bool:
+        """
+        Check if the data is positive without logging.
+        """
+        match data:
+            case int(value):
+                return value > 0
+            case str(value):
+                decimal_value = Validator._to_decimal(value)
+                return decimal_value is not None and decimal_value > 0
+            case _:
+                return False
+
 @dataclass    
 class ProductDataDictValidator(Validator[ProductDataDict]):
     """
@@ -161,6 +210,16 @@ class ProductDataDictValidator(Validator[ProductDataDict]):
         """
         return super().validate(data) and Validator.is_positive(data["price"])
 
+    @override
+    def rejection_reason(self, data: ProductDataDict) -> str | None:
+        """
+        Return the name of the first failing product validation rule.
+        """
+        reason = super().rejection_reason(data)
+        if reason is None and not Validator._is_positive_quiet(data["price"]):
+            return "non_positive_price"
+        return reason
+
 
 @dataclass
 class CustomerDataDictValidator(Validator[CustomerDataDict]):
@@ -195,12 +254,25 @@ class CustomerDataDictValidator(Validator[CustomerDataDict]):
             self.validate_int_in_range(data["age"], self.min_value, self.max_value)  
             # and Validator.is_valid_email(data["email"])
         )
+
+    @override
+    def rejection_reason(self, data: CustomerDataDict) -> str | None:
+        """
+        Return the name of the first failing customer validation rule.
+        """
+        reason = super().rejection_reason(data)
+        if reason is None and not self.validate_int_in_range(data["age"], self.min_value, self.max_value):
+            return "age_out_of_range"
+        return reason
     
 @dataclass
 class OrderDataDictValidator(Validator[OrderDataDict]):
     """
     Validator for order data.
 
+    The discount range is only checked when "discount" is a required field, so a
+    validator of a projection, e.g. `SUMMARY_ORDER_FIELDS`, skips it.
+
     Attributes:
         min_discount (Decimal): The minimum valid discount value.
         max_discount (Decimal): The maximum valid discount value.
@@ -226,6 +298,19 @@ class OrderDataDictValidator(Validator[OrderDataDict]):
         Validate the order data.
         """
         return super().validate(data) and (
-            self.validate_decimal_in_range(data["discount"], self.min_discount, self.max_discount)
+            "discount" not in self.required_fields
+            or self.validate_decimal_in_range(data["discount"], self.min_discount, self.max_discount)
             # and Validator.is_valid_value_of(data["shipping_method"], ShippingMethod)
-        )
\ No newline at end of file
+        )
+
+    @override
+    def rejection_reason(self, data: OrderDataDict) -> str | None:
+        """
+        Return the name of the first failing order validation rule.
+        """
+        reason = super().rejection_reason(data)
+        if reason is None and "discount" in self.required_fields:
+            discount = Validator._to_decimal(data["discount"])
+            if discount is None or not self.min_discount <= discount <= self.max_discount:
+                return "discount_out_of_range"
+        return reason
@@ -0,0 +1,85 @@
+from src.bitmap_index import ARRAY_LIMIT, CHUNK_SIZE, CompressedBitmap, discount_bucket
+from src.filters import OrderFilter
+from src.repository import (
+    PurchaseSummaryRepository,
+    CustomerDataRepository,
+    ProductDataRepository,
+    OrderDataRepository
+)
+from src.model import CustomerDataDict, OrderDataDict, ProductCategory, ProductDataDict, ShippingMethod
+from array import array
+from decimal import Decimal
+import random
+import pytest
+
+
+@pytest.mark.parametrize("left_rate, right_rate", [(0.5, 0.5), (0.5, 0.01), (0.01, 0.01), (0.0, 0.3)])
+def test_bitmap_operations_match_sets(left_rate: float, right_rate: float) -> None:
+    """
+    Test intersection and union of compressed bitmaps against sets.
+
+    Args:
+        left_rate (float): The fraction of positions in the left bitmap.
+        right_rate (float): The fraction of positions in the right bitmap.
+
+    Asserts:
+        - Dense full chunks are stored as integers and sparse ones as arrays.
+        - `&`, `|`, `len`, `in` and iteration agree with the equivalent set operations.
+    """
+    rng = random.Random(7)
+    size = 2 * CHUNK_SIZE + 100
+    left_mask = bytes(rng.random() < left_rate for _ in range(size))
+    right_mask = bytes(rng.random() < right_rate for _ in range(size))
+    left, right = CompressedBitmap.from_mask(left_mask), CompressedBitmap.from_mask(right_mask)
+    left_set = {position for position, bit in enumerate(left_mask) if bit}
+    right_set = {position for position, bit in enumerate(right_mask) if bit}
+
+    for bitmap, rate in ((left, left_rate), (right, right_rate)):
+        expected_type = int if rate * CHUNK_SIZE > ARRAY_LIMIT else array
+        assert all(isinstance(bitmap.containers[key], expected_type) for key in (0, 1) if key in bitmap.containers)
+    assert list(left) == sorted(left_set) and len(left) == len(left_set)
+    assert list(left & right) == sorted(left_set & right_set)
+    assert list(left | right) == sorted(left_set | right_set)
+    assert list(CompressedBitmap.from_positions(sorted(right_set))) == sorted(right_set)
+    assert all((position in left) == (position in left_set) for position in range(0, size, 97))
+
+
+def test_index_selection_matches_scan(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that filtered summaries from the bitmap indexes equal a filtered scan of the orders.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+
+    Asserts:
+        - Orders with dangling references are never selected.
+        - Category, shipping method and partial discount bucket filters select exactly the matching orders.
+        - No filter gives the unfiltered summary.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    repository = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo)
+    customers = {customer.id for customer in customer_repo.get_data()}
+    products = {product.id: product for product in product_repo.get_data()}
+    filters: list[tuple[list[ProductCategory] | None, list[ShippingMethod] | None, tuple[Decimal, Decimal] | None]] = [
+        ([ProductCategory.ELECTRONICS], [ShippingMethod.EXPRESS], None),
+        ([ProductCategory.BOOKS, ProductCategory.CLOTHING], None, (Decimal("0.05"), Decimal("0.25"))),
+        (None, None, (Decimal("0.3"), Decimal("0.1")))
+    ]
+    for categories, methods, discounts in filters:
+        expected: dict[int, dict[int, int]] = {}
+        for order in order_repo.get_data():
+            product = products.get(order.product_id)
+            if order.customer_id not in customers or product is None:
+                continue
+            if ((categories is not None and product.category not in categories)
+                    or (methods is not None and order.shipping_method not in methods)
+                    or (discounts is not None and not discounts[0] <= order.discount <= discounts[1])):
+                continue
+            purchases = expected.setdefault(order.customer_id, {})
+            purchases[order.product_id] = purchases.get(order.product_id, 0) + order.quantity
+
+        order_filter = OrderFilter(categories=categories, shipping_methods=methods, discount_range=discounts)
+        assert repository.filtered_summary_by_id(order_filter) == expected
+    assert repository.filtered_summary_by_id(OrderFilter()) == repository.purchase_summary_by_id()
+    assert discount_bucket(Decimal("1.0")) == discount_bucket(Decimal("0.95")) == 9
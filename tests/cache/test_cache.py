@@ -0,0 +1,83 @@
+from dataclasses import dataclass, field
+
+from src.cache import ResultCache, cached_result
+
+
+@dataclass
+class CountingQueries:
+    """
+    Object with a cached query counting its computations.
+    """
+    cache: ResultCache | None = field(default_factory=lambda: ResultCache(max_size=2))
+    version: int = 0
+    computed: int = 0
+
+    def cache_versions(self) -> int:
+        return self.version
+
+    @cached_result("scaled")
+    def scaled(self, value: int, factor: int = 1) -> list[int]:
+        self.computed += 1
+        return [value * factor]
+
+
+def test_result_cache_hits_and_misses() -> None:
+    """
+    Test that repeated lookups are answered from the cache and counted.
+
+    Asserts:
+        - The second call with the same arguments is a hit and returns the same object.
+        - Different arguments are cached separately.
+        - The statistics report hits, misses and the hit rate.
+    """
+    queries = CountingQueries()
+
+    first = queries.scaled(2, factor=3)
+    assert queries.scaled(2, factor=3) is first
+    assert queries.scaled(2) == [2]
+
+    assert queries.computed == 2
+    stats = queries.cache.stats()  # type: ignore[union-attr]
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 2)
+    assert stats.hit_rate == 1 / 3
+
+
+def test_result_cache_evicts_least_recently_used() -> None:
+    """
+    Test that the cache respects its size cap by evicting the least recently used entry.
+
+    Asserts:
+        - A recently read entry survives an insertion into a full cache.
+        - The least recently used entry is recomputed.
+    """
+    queries = CountingQueries()
+    queries.scaled(1)
+    queries.scaled(2)
+    queries.scaled(1)
+    queries.scaled(3)
+
+    queries.scaled(1)
+    assert queries.computed == 3
+    queries.scaled(2)
+    assert queries.computed == 4
+    assert queries.cache.stats().evictions == 2  # type: ignore[union-attr]
+
+
+def test_result_cache_keys_by_version() -> None:
+    """
+    Test that changing the data version invalidates cached results.
+
+    Asserts:
+        - A call after a version change is recomputed.
+        - Caching is skipped entirely when the cache is None.
+    """
+    queries = CountingQueries()
+    queries.scaled(1)
+    queries.version += 1
+    queries.scaled(1)
+    assert queries.computed == 2
+
+    uncached = CountingQueries(cache=None)
+    uncached.scaled(1)
+    uncached.scaled(1)
+    assert uncached.computed == 2
@@ -0,0 +1,140 @@
+from src.cli import main
+from src.data_generator import DatasetConfig, write_dataset
+from pathlib import Path
+import json
+import pytest
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    """
+    Fixture writing a small generated dataset.
+
+    Args:
+        tmp_path (Path): A temporary directory provided by pytest.
+
+    Returns:
+        Path: The directory with the products, customers and orders files.
+    """
+    directory = tmp_path / "data"
+    write_dataset(str(directory), DatasetConfig(products=20, customers=50, orders=500, dangling_rate=0.02, seed=5))
+    return directory
+
+
+def run_json(data_dir: Path, capsys: pytest.CaptureFixture[str], *argv: str) -> dict:
+    """
+    Run the CLI and parse its JSON output.
+    """
+    assert main(["--data-dir", str(data_dir), "--log-level", "ERROR", *argv, "--json"]) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+def test_load_prints_valid_record_counts(data_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """
+    Test the `load` command.
+
+    Asserts:
+        - Every dataset is reported with the number of its valid records.
+        - The orders with dangling references of the generated dataset are counted.
+    """
+    assert main(["--data-dir", str(data_dir), "--log-level", "ERROR", "load"]) == 0
+    counts = dict(line.split(": ") for line in capsys.readouterr().out.splitlines())
+
+    assert set(counts) == {"products", "customers", "orders", "invalid_references"}
+    assert 0 < int(counts["orders"]) <= 500
+    assert 0 < int(counts["invalid_references"]) < int(counts["orders"])
+
+
+def test_report_engines_agree(data_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """
+    Test that the `report` command gives the same metrics with every engine.
+
+    Asserts:
+        - The python, sparse and streaming engines report equal shared metrics.
+        - The rollup and cube metrics are reported by the materializing engines.
+        - The `summary` command prints the same summary with the sparse engine.
+    """
+    python = run_json(data_dir, capsys, "report")
+    sparse = run_json(data_dir, capsys, "--engine", "sparse", "report")
+    streaming = run_json(data_dir, capsys, "--engine", "streaming", "--fixed-point", "report")
+
+    assert python == sparse
+    assert {name: python[name] for name in streaming} == streaming
+    assert "revenue_by_category" in python and "sales_by_age_band" in python
+    assert run_json(data_dir, capsys, "--engine", "sparse", "summary") == run_json(data_dir, capsys, "summary")
+
+
+def test_streaming_engine_rejects_summary(data_dir: Path) -> None:
+    """
+    Test that the streaming engine refuses commands which need the materialized summary.
+
+    Asserts:
+        - The parser exits with a usage error.
+    """
+    with pytest.raises(SystemExit) as error:
+        main(["--data-dir", str(data_dir), "--engine", "streaming", "summary"])
+    assert error.value.code == 2
+
+
+def test_export_and_profile(data_dir: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """
+    Test the `export` command with profiling enabled.
+
+    Asserts:
+        - The validated dataset and the summary are written and match the `summary` command.
+        - A cProfile and an allocation report is written for every command and pipeline stage.
+    """
+    output_dir, profile_dir = tmp_path / "out", tmp_path / "profiles"
+    assert main(["--data-dir", str(data_dir), "--log-level", "ERROR", "--profile", "--trace-memory",
+                 "--profile-dir", str(profile_dir), "export", str(output_dir)]) == 0
+    capsys.readouterr()
+
+    assert {path.name for path in output_dir.iterdir()} == {
+        "products.json", "customers.json", "orders.json", "purchase_summary.json"
+    }
+    exported = json.loads((output_dir / "purchase_summary.json").read_text(encoding="utf-8"))
+    assert exported == run_json(data_dir, capsys, "summary")
+    reports = {path.name for path in profile_dir.iterdir()}
+    for stage in ("cli.load", "cli.summary", "cli.export", "file_reader.read", "purchase_summary.build"):
+        assert {f"{stage}.pstats", f"{stage}.allocations.txt"} <= reports
+
+
+def test_order_filter_is_pushed_down(data_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """
+    Test that the order filter options skip orders while they are loaded.
+
+    Asserts:
+        - `load` counts only the express orders.
+        - The python and streaming engines report the same filtered metrics.
+    """
+    assert main(["--data-dir", str(data_dir), "--log-level", "ERROR", "load"]) == 0
+    all_counts = dict(line.split(": ") for line in capsys.readouterr().out.splitlines())
+    assert main(["--data-dir", str(data_dir), "--log-level", "ERROR", "--shipping-method", "Express", "load"]) == 0
+    counts = dict(line.split(": ") for line in capsys.readouterr().out.splitlines())
+
+    assert 0 < int(counts["orders"]) < int(all_counts["orders"])
+    filters = ["--shipping-method", "Express", "--category", "Books", "--age-range", "20", "50"]
+    python = run_json(data_dir, capsys, "--fixed-point", *filters, "report")
+    streaming = run_json(data_dir, capsys, "--engine", "streaming", "--fixed-point", *filters, "report")
+    assert {name: python[name] for name in streaming} == streaming
+    assert set(python["units_by_category"]) == {"Books"}
+
+
+def test_projected_orders_give_same_summary(data_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """
+    Test that the `--project-orders` option loads orders for summary-only commands.
+
+    Asserts:
+        - The `load` command counts and checks the projected orders like the full orders.
+        - The `summary` command prints the same summary with projected orders.
+        - Commands which need the full orders are refused with a usage error.
+    """
+    outputs = []
+    for options in ([], ["--project-orders"]):
+        assert main(["--data-dir", str(data_dir), "--log-level", "ERROR", *options, "load"]) == 0
+        outputs.append(capsys.readouterr().out)
+    assert outputs[0] == outputs[1] and "orders: " in outputs[1]
+    assert run_json(data_dir, capsys, "--project-orders", "summary") == run_json(data_dir, capsys, "summary")
+    with pytest.raises(SystemExit) as error:
+        main(["--data-dir", str(data_dir), "--project-orders", "report"])
+    assert error.value.code == 2
@@ -10,6 +10,12 @@ from src.model import (
     OrderDataDict
 )
 from decimal import Decimal
+from src.data_generator import DatasetConfig, write_dataset
+from src.converter import ProductConverter, CustomerConverter, OrderConverter
+from src.file_service import ProductJsonFileReader, CustomerJsonFileReader, OrderJsonFileReader
+from src.validator import ProductDataDictValidator, CustomerDataDictValidator, OrderDataDictValidator
+from src.repository import ProductDataRepository, CustomerDataRepository, OrderDataRepository
+from pathlib import Path
 
 @pytest.fixture
 def customer_1() -> Customer:
@@ -187,4 +193,40 @@ def order_3_data() -> OrderDataDict:
         "quantity": 1, 
         "discount": "0.2",
         "shipping_method":"Standard"
-    }
\ No newline at end of file
+    }
+
+@pytest.fixture
+def generated_repositories(tmp_path: Path) -> tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]:
+    """
+    Fixture loading repositories from a small generated dataset with dangling references.
+
+    Args:
+        tmp_path (Path): A temporary directory provided by pytest.
+
+    Returns:
+        tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]:
+            The customer, product and order repositories.
+    """
+    paths = write_dataset(
+        str(tmp_path),
+        DatasetConfig(products=30, customers=100, orders=2_000, dangling_rate=0.02, seed=3)
+    )
+    customer_repo = CustomerDataRepository(
+        file_reader=CustomerJsonFileReader(),
+        validator=CustomerDataDictValidator(),
+        converter=CustomerConverter(),
+        file_name=paths["customers"]
+    )
+    product_repo = ProductDataRepository(
+        file_reader=ProductJsonFileReader(),
+        validator=ProductDataDictValidator(),
+        converter=ProductConverter(),
+        file_name=paths["products"]
+    )
+    order_repo = OrderDataRepository(
+        file_reader=OrderJsonFileReader(),
+        validator=OrderDataDictValidator(),
+        converter=OrderConverter(),
+        file_name=paths["orders"]
+    )
+    return customer_repo, product_repo, order_repo
@@ -19,11 +19,12 @@ Tests:
     - `test_product_converter`: Verifies that `ProductConverter` correctly converts product data.
     - `test_customer_converter`: Verifies that `CustomerConverter` correctly converts customer data.
     - `test_order_converter`: Verifies that `OrderConverter` correctly converts order data.
+    - `test_projected_order_converter`: Verifies that `ProjectedOrderConverter` converts only declared fields.
 """
 import pytest
 from pytest import FixtureRequest
-from src.model import (Product, Customer, Order)
-from src.converter import ProductConverter, CustomerConverter, OrderConverter
+from src.model import (Product, Customer, Order, OrderDataDict, ProjectedOrder, ShippingMethod, SUMMARY_ORDER_FIELDS)
+from src.converter import ProductConverter, CustomerConverter, OrderConverter, ProjectedOrderConverter, ValuePool
 from decimal import Decimal
 
 @pytest.mark.parametrize("product_data_fixture_name, product_fixture_name", [
@@ -116,4 +117,63 @@ def test_order_converter(order_data_fixture_name: str, order_fixture_name: str,
     assert converted_orders.customer_id == order.customer_id
     assert converted_orders.product_id == order.product_id
     assert converted_orders.quantity == order.quantity
-    assert converted_orders.discount.quantize(Decimal("0.01")) == order.discount
\ No newline at end of file
+    assert converted_orders.discount.quantize(Decimal("0.01")) == order.discount
+
+def test_converters_share_repeated_values() -> None:
+    """
+    Test that repeated strings and discounts are shared between converted records.
+
+    Asserts:
+        - Equal names of different records are the same interned object.
+        - Orders with the same discount string share one `Decimal`, unless pooling is disabled.
+        - The value pool is bounded.
+    """
+    names = ["".join(["Jo", "hn"]), "".join(["J", "ohn"])]
+    customers = [CustomerConverter().convert({
+        "id": index, "first_name": name, "last_name": "Doe", "age": 30, "email": f"{index}@example.com"
+    }) for index, name in enumerate(names)]
+    assert names[0] is not names[1]
+    assert customers[0].first_name is customers[1].first_name
+
+    def order_data(discount: str) -> OrderDataDict:
+        return {"id": 1, "customer_id": 1, "product_id": 1, "quantity": 1, "discount": discount,
+                "shipping_method": "Standard"}
+
+    converter = OrderConverter()
+    assert converter.convert(order_data("0.1")).discount is converter.convert(order_data("0.1")).discount
+    unpooled = OrderConverter(pool_values=False)
+    assert unpooled.convert(order_data("0.1")).discount is not unpooled.convert(order_data("0.1")).discount
+
+    pool = ValuePool(Decimal, max_size=2)
+    for text in ["0.1", "0.2", "0.3"]:
+        pool.get(text)
+    assert len(pool) == 2
+    assert pool.get("0.3") == Decimal("0.3")
+
+
+def test_projected_order_converter(order_1: Order) -> None:
+    """
+    Test the `ProjectedOrderConverter` class.
+
+    Args:
+        order_1 (Order): A sample order instance.
+
+    Asserts:
+        - Summary projections copy the id, references and quantity and leave the other fields unset.
+        - Declared fields are converted like `OrderConverter` converts them.
+        - Malformed undeclared fields are ignored.
+        - Unknown fields and projections without the summary fields are rejected.
+    """
+    data = order_1.to_dict()
+    summary_only = ProjectedOrderConverter().convert({**data, "discount": "abc", "shipping_method": "Drone"})
+    full = ProjectedOrderConverter([*SUMMARY_ORDER_FIELDS, "discount", "shipping_method"]).convert(data)
+
+    assert summary_only == ProjectedOrder(order_1.id, order_1.customer_id, order_1.product_id, order_1.quantity)
+    assert summary_only.discount is None and summary_only.shipping_method is None
+    assert (full.discount, full.shipping_method) == (order_1.discount, order_1.shipping_method)
+    assert isinstance(full.shipping_method, ShippingMethod)
+    assert full.to_dict() == data
+    with pytest.raises(ValueError):
+        ProjectedOrderConverter(["id", "customer_id", "product_id", "price"])
+    with pytest.raises(ValueError):
+        ProjectedOrderConverter(["id", "customer_id", "quantity"])
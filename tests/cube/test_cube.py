@@ -0,0 +1,93 @@
+from decimal import Decimal
+import pytest
+from src.cube import PurchaseCube
+from src.model import Customer, CustomerDataDict, Order, OrderDataDict, Product, ProductCategory, ProductDataDict, ShippingMethod
+from src.repository import (
+    PurchaseSummaryRepository,
+    CustomerDataRepository,
+    ProductDataRepository,
+    OrderDataRepository
+)
+from src.service import PurchasesSummaryService
+
+
+def test_cube_slice_and_rollup(
+        customer_1: Customer,
+        customer_2: Customer,
+        product_1: Product,
+        product_2: Product,
+        order_1: Order,
+        order_2: Order,
+        order_3: Order) -> None:
+    """
+    Test slices and roll-ups of a small cube.
+
+    Args:
+        customer_1 (Customer): A customer aged 30.
+        customer_2 (Customer): A customer aged 25.
+        product_1 (Product): An electronics product.
+        product_2 (Product): A clothing product.
+        order_1 (Order): A standard shipping order of product 101 by customer 1.
+        order_2 (Order): An express shipping order of product 102 by customer 1.
+        order_3 (Order): A standard shipping order of product 101 by customer 2.
+
+    Asserts:
+        - Age bands split the validator range.
+        - Slices and roll-ups return the quantity and revenue of the matching orders.
+    """
+    cube = PurchaseCube.from_orders(
+        [order_1, order_2, order_3],
+        {1: customer_1, 2: customer_2},
+        {101: product_1, 102: product_2},
+        min_age=0,
+        max_age=65
+    )
+
+    assert cube.bands == 7
+    assert cube.band_range(6) == (60, 65)
+    assert (cube.band_of(customer_1.age), cube.band_of(customer_2.age)) == (3, 2)
+    assert cube.slice() == (8, Decimal("4600.00"))
+    assert cube.slice(age_band=3) == (7, Decimal("3100.00"))
+    assert cube.slice(category=ProductCategory.ELECTRONICS, shipping_method=ShippingMethod.STANDARD) == (
+        3, Decimal("4500.00"))
+    assert cube.rollup("shipping_method") == {
+        (ShippingMethod.STANDARD,): (3, Decimal("4500.00")),
+        (ShippingMethod.EXPRESS,): (5, Decimal("100.00"))
+    }
+    assert cube.rollup("age_band", "category")[(2, ProductCategory.ELECTRONICS)] == (1, Decimal("1500.00"))
+    assert cube.rollup() == {(): (8, Decimal("4600.00"))}
+    with pytest.raises(ValueError):
+        PurchaseCube(min_age=10, max_age=5)
+
+
+def test_cube_matches_orders(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that the repository cube and the service answer match a walk over the orders.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+
+    Asserts:
+        - Quantity and revenue by age band of one category match the orders.
+        - The cube totals match the rollups.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    repository = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo)
+    service = PurchasesSummaryService(repository=repository)
+    customers = {customer.id: customer for customer in customer_repo.get_data()}
+    products = {product.id: product for product in product_repo.get_data()}
+    expected: dict[tuple[int, int], tuple[int, Decimal]] = {}
+    for order in order_repo.get_data():
+        customer, product = customers.get(order.customer_id), products.get(order.product_id)
+        if customer is None or product is None or product.category != ProductCategory.BOOKS:
+            continue
+        band = (customer.age // 20 * 20, min(customer.age // 20 * 20 + 19, 65))
+        quantity, revenue = expected.get(band, (0, Decimal("0.0")))
+        expected[band] = quantity + order.quantity, revenue + product.total_price(order.quantity)
+
+    result = service.sales_by_age_band(category=ProductCategory.BOOKS, band_width=20)
+
+    assert {band: totals for band, totals in result.items() if totals[0]} == expected
+    assert {key[0]: totals[1] for key, totals in repository.purchase_cube().rollup("category").items()} == (
+        service.revenue_by_category())
@@ -0,0 +1,92 @@
+from src.data_generator import (
+    DatasetConfig,
+    generate_products,
+    generate_customers,
+    generate_orders,
+    write_dataset
+)
+from src.validator import ProductDataDictValidator, CustomerDataDictValidator, OrderDataDictValidator
+from collections import Counter
+from pathlib import Path
+import json
+import pytest
+
+
+@pytest.fixture
+def config() -> DatasetConfig:
+    """
+    Fixture providing a small dataset configuration.
+
+    Returns:
+        DatasetConfig: A configuration with 50 products, 200 customers and 5000 orders.
+    """
+    return DatasetConfig(products=50, customers=200, orders=5_000, seed=7, chunk_size=1_000)
+
+
+def test_write_dataset_is_deterministic(tmp_path: Path, config: DatasetConfig) -> None:
+    """
+    Test that the same seed produces identical files.
+
+    Asserts:
+        - Files written twice with the same configuration are identical.
+        - The files contain the configured number of records.
+    """
+    first = write_dataset(str(tmp_path / "first"), config)
+    second = write_dataset(str(tmp_path / "second"), config)
+
+    for name in ("products", "customers", "orders"):
+        assert Path(first[name]).read_text() == Path(second[name]).read_text()
+
+    with open(first["orders"], 'r', encoding='utf-8') as file:
+        assert len(json.load(file)) == config.orders
+
+
+def test_generated_records_are_valid(config: DatasetConfig) -> None:
+    """
+    Test that records generated without invalid rows pass validation.
+
+    Asserts:
+        - Every product, customer and order is accepted by its validator.
+        - Every order references an existing customer and product.
+    """
+    assert all(ProductDataDictValidator().validate(product) for product in generate_products(config))
+    assert all(CustomerDataDictValidator().validate(customer) for customer in generate_customers(config))
+    for order in generate_orders(config):
+        assert OrderDataDictValidator().validate(order)
+        assert 1 <= order["customer_id"] <= config.customers
+        assert 1 <= order["product_id"] <= config.products
+
+
+def test_invalid_and_dangling_rates(config: DatasetConfig) -> None:
+    """
+    Test that invalid rows and dangling references are injected at the configured rates.
+
+    Asserts:
+        - Roughly 10% of orders fail validation.
+        - Roughly 5% of orders reference a missing customer or product.
+    """
+    dirty = DatasetConfig(
+        products=config.products, customers=config.customers, orders=config.orders,
+        invalid_rate=0.1, dangling_rate=0.05, seed=config.seed
+    )
+    validator = OrderDataDictValidator()
+    orders = list(generate_orders(dirty))
+    invalid = sum(1 for order in orders if not validator.validate(order))
+    dangling = sum(
+        1 for order in orders
+        if order.get("customer_id", 0) > dirty.customers or order.get("product_id", 0) > dirty.products
+    )
+
+    assert 0.07 * dirty.orders < invalid < 0.13 * dirty.orders
+    assert 0.03 * dirty.orders < dangling < 0.07 * dirty.orders
+
+
+def test_product_popularity_is_skewed(config: DatasetConfig) -> None:
+    """
+    Test that product popularity follows a skewed distribution.
+
+    Asserts:
+        - The most popular product is ordered far more often than the median product.
+    """
+    counts = sorted(Counter(order["product_id"] for order in generate_orders(config)).values(), reverse=True)
+    assert counts[0] > 5 * counts[len(counts) // 2]
@@ -190,3 +190,37 @@ def test_write_order(tmpdir: Path, orders_data: list[OrderDataDict]) -> None:
     
     assert saved_data == orders_data
 
+
+def test_read_json_lines(tmp_path: Path, products_data: list[ProductDataDict]) -> None:
+    """
+    Test reading product data from a JSON Lines file.
+
+    Args:
+        tmp_path (Path): A temporary directory provided by pytest.
+        products_data (list[ProductDataDict]): The product data written to the file.
+
+    Assertions:
+        - Every non-empty line is read as one product.
+    """
+    file_name = tmp_path / "products.jsonl"
+    file_name.write_text("\n".join(json.dumps(product) for product in products_data) + "\n\n")
+
+    assert ProductJsonFileReader().read(str(file_name)) == products_data
+
+def test_stream_json_array_in_small_chunks(tmp_path: Path, orders_data: list[OrderDataDict]) -> None:
+    """
+    Test streaming order data from a JSON array file read in very small chunks.
+
+    Args:
+        tmp_path (Path): A temporary directory provided by pytest.
+        orders_data (list[OrderDataDict]): The order data written to the file.
+
+    Assertions:
+        - The streamed objects equal the file content for every chunk size.
+    """
+    file_name = tmp_path / "orders.json"
+    file_name.write_text("  " + json.dumps(orders_data, indent=4))
+
+    reader = OrderJsonFileReader()
+    for chunk_size in (1, 3, 17, 64 * 1024):
+        assert list(reader.stream(str(file_name), chunk_size)) == orders_data
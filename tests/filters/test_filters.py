@@ -0,0 +1,87 @@
+from src.filters import OrderFilter
+from src.model import Customer, Order, OrderDataDict, Product, ProductCategory, ShippingMethod
+from decimal import Decimal
+from typing import Any, cast
+import pytest
+
+
+@pytest.fixture
+def order_filter() -> OrderFilter:
+    """
+    Fixture of a filter restricting every dimension.
+
+    Returns:
+        OrderFilter: Electronics shipped by express to customers aged 20 to 40 with a discount up to 0.2.
+    """
+    return OrderFilter(
+        categories=[ProductCategory.ELECTRONICS],
+        shipping_methods=[ShippingMethod.EXPRESS],
+        age_range=[20, 40],
+        customer_ids={1, 2, 3},
+        discount_range=(Decimal("0.0"), Decimal("0.2"))
+    )
+
+
+def test_row_and_order_predicates_agree(
+        order_filter: OrderFilter,
+        customer_1: Customer,
+        customer_2: Customer,
+        product_1: Product,
+        product_2: Product) -> None:
+    """
+    Test that raw entries and converted orders are accepted alike.
+
+    Args:
+        order_filter (OrderFilter): The filter.
+        customer_1, customer_2 (Customer): Sample customers.
+        product_1, product_2 (Product): Sample products.
+
+    Asserts:
+        - Collections are normalized to frozensets and ranges to tuples, so the filter is hashable.
+        - Every combination of customer, product, shipping method and discount is accepted by
+          the row predicate exactly when it is accepted by the order predicate.
+        - Only the express orders of the laptop with the low discount are accepted.
+    """
+    customers, products = [customer_1, customer_2], [product_1, product_2]
+    by_row = order_filter.row_predicate(customers, products)
+    by_order = order_filter.order_predicate(customers, products)
+
+    assert order_filter.categories == frozenset({ProductCategory.ELECTRONICS}) and order_filter.age_range == (20, 40)
+    assert hash(order_filter) == hash(OrderFilter(**vars(order_filter)))
+    accepted = []
+    for customer in customers:
+        for product in products:
+            for method in ShippingMethod:
+                for discount in ("0.1", "0.3"):
+                    order = Order(id=1, customer_id=customer.id, product_id=product.id, quantity=1,
+                                  discount=Decimal(discount), shipping_method=method)
+                    assert by_row(order.to_dict()) == by_order(order)
+                    accepted.append(by_order(order))
+    assert accepted.count(True) == 2
+
+
+def test_row_predicate_accepts_malformed_entries(
+        order_filter: OrderFilter,
+        customer_1: Customer,
+        product_1: Product) -> None:
+    """
+    Test that entries the filter cannot evaluate are left to the validator.
+
+    Args:
+        order_filter (OrderFilter): The filter.
+        customer_1 (Customer): A sample customer.
+        product_1 (Product): A sample product.
+
+    Asserts:
+        - Malformed ids, shipping methods and discounts are accepted.
+        - An unrestricted filter accepts every order.
+    """
+    accepts = order_filter.row_predicate([customer_1], [product_1])
+    malformed: list[dict[str, Any]] = [
+        {"customer_id": "1", "product_id": [2], "shipping_method": "Express", "discount": "0.1"},
+        {"customer_id": None, "product_id": None, "shipping_method": ["Express"], "discount": "abc"},
+        {"discount": "NaN"}
+    ]
+
+    assert all(accepts(cast(OrderDataDict, entry)) for entry in malformed)
+    assert OrderFilter().unrestricted and not order_filter.unrestricted
@@ -0,0 +1,72 @@
+from src.integrity import IdMembership, check_order_references
+from src.model import Order, ShippingMethod
+from decimal import Decimal
+from typing import cast
+import pytest
+
+
+def make_order(id_: int, customer_id: int, product_id: int) -> Order:
+    """
+    Create an order with the given references.
+    """
+    return Order(id=id_, customer_id=customer_id, product_id=product_id, quantity=1,
+                 discount=Decimal("0.0"), shipping_method=ShippingMethod.STANDARD)
+
+
+@pytest.mark.parametrize("ids, dense", [([1, 2, 3, 5], True), ([1, 1_000_000], False), ([-1, 2], False)])
+def test_membership_representations_agree(ids: list[int], dense: bool) -> None:
+    """
+    Test that compact ids use a bitmap and that both representations give the same mask.
+
+    Args:
+        ids (list[int]): The known ids.
+        dense (bool): Whether a bitmap is expected.
+
+    Asserts:
+        - Compact non-negative ids are stored in a bitmap, other ids in a set.
+        - Values out of the bitmap range, including negative ones, are not members.
+    """
+    membership = IdMembership.from_ids(ids)
+    values = [5, -1, 4, 2, 1_000_000, 7, 0]
+
+    assert (membership.bitmap is not None) is dense
+    assert membership.mask(values) == bytes(value in set(ids) for value in values)
+    assert membership.mask([]) == b""
+
+
+def test_check_order_references_reports_dangling_ids() -> None:
+    """
+    Test the bulk reference check of orders.
+
+    Asserts:
+        - Orders with an unknown customer or product are invalid, by position.
+        - The offending ids are counted per reference.
+        - Only the valid orders are kept.
+    """
+    orders = [make_order(1, 1, 10), make_order(2, 9, 10), make_order(3, 2, 99), make_order(4, 9, 99),
+              make_order(5, 2, 11)]
+    report = check_order_references(orders, IdMembership.from_ids([1, 2]), IdMembership.from_ids([10, 11]))
+
+    assert (report.orders, report.invalid_orders) == (5, 3)
+    assert report.invalid_positions() == [1, 2, 3]
+    assert report.dangling_customers == {9: 2}
+    assert report.dangling_products == {99: 2}
+    assert [order.id for order in report.valid_orders(orders)] == [1, 5]
+
+
+def test_check_order_references_reports_out_of_range_ids() -> None:
+    """
+    Test that ids far beyond the known ids or of another type are reported as dangling.
+
+    Asserts:
+        - A huge customer id and a non-int product id make their orders invalid instead of raising.
+        - The dense bitmap keeps its size.
+    """
+    customers, products = IdMembership.from_ids([1, 2]), IdMembership.from_ids([10, 11])
+    orders = [make_order(1, 1, 10), make_order(2, 10**12, 10), make_order(3, 2, cast(int, "11"))]
+    report = check_order_references(orders, customers, products)
+
+    assert report.invalid_positions() == [1, 2]
+    assert report.dangling_customers == {10**12: 1}
+    assert report.dangling_products == {"11": 1}
+    assert customers.bitmap is not None and len(customers.bitmap) == 3
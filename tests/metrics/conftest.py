@@ -0,0 +1,16 @@
+from src.metrics import InMemoryMetricsRegistry, set_metrics_sink
+from typing import Iterator
+import pytest
+
+@pytest.fixture
+def registry() -> Iterator[InMemoryMetricsRegistry]:
+    """
+    Fixture installing an in-memory metrics registry for the duration of a test.
+
+    Yields:
+        InMemoryMetricsRegistry: The installed registry.
+    """
+    registry = InMemoryMetricsRegistry()
+    set_metrics_sink(registry)
+    yield registry
+    set_metrics_sink(None)
@@ -0,0 +1,144 @@
+from src.metrics import (
+    InMemoryMetricsRegistry,
+    NullMetricsSink,
+    PrometheusTextFileSink,
+    StatsDSink,
+    get_metrics_sink,
+    measure,
+    set_metrics_sink
+)
+from src.model import ProductDataDict, CustomerDataDict, OrderDataDict, Product, Customer, Order
+from src.validator import ProductDataDictValidator
+from src.converter import ProductConverter
+from src.repository import ProductDataRepository, PurchaseSummaryRepository
+from src.file_service import ProductJsonFileReader
+from unittest.mock import MagicMock
+from pathlib import Path
+import json
+import socket
+
+
+def test_instrumentation_disabled_by_default() -> None:
+    """
+    Test that instrumentation is disabled unless a sink is installed.
+
+    Asserts:
+        - The default sink is a disabled `NullMetricsSink`.
+        - `measure` returns the shared no-op timer.
+    """
+    sink = get_metrics_sink()
+    assert isinstance(sink, NullMetricsSink)
+    assert not sink.enabled
+    assert measure("a") is measure("b")
+
+
+def test_data_repository_records_stage_metrics(
+        tmp_path: Path,
+        registry: InMemoryMetricsRegistry,
+        product_1_data: ProductDataDict,
+        product_1_data_invalid: ProductDataDict) -> None:
+    """
+    Test that loading a repository records reader, validator and converter metrics.
+
+    Asserts:
+        - Every stage is called once and reports the processed rows.
+        - The invalid row is counted.
+    """
+    file_name = tmp_path / "products.json"
+    file_name.write_text(json.dumps([product_1_data, product_1_data_invalid]))
+
+    repository = ProductDataRepository(
+        file_reader=ProductJsonFileReader(),
+        validator=ProductDataDictValidator(),
+        converter=ProductConverter(),
+        file_name=str(file_name)
+    )
+
+    assert len(repository.get_data()) == 1
+    counters = registry.counters
+    assert counters["file_reader.read.calls"] == 1
+    assert counters["file_reader.read.rows"] == 2
+    assert counters["validator.validate.rows"] == 2
+    assert counters["converter.convert.rows"] == 1
+    assert counters["data_repository.invalid_rows"] == 1
+    assert len(registry.timings["data_repository.process_data.duration"]) == 1
+
+
+def test_purchase_summary_records_cache_hits(
+        registry: InMemoryMetricsRegistry,
+        customer_1: Customer,
+        product_1: Product,
+        order_1: Order,
+        order_3: Order) -> None:
+    """
+    Test that the purchase summary reports cache misses, hits and dangling orders.
+
+    Asserts:
+        - The first call is a miss, the next two are hits.
+        - The summary build reports the number of processed and dangling orders.
+    """
+    customer_repo, product_repo, order_repo = MagicMock(), MagicMock(), MagicMock()
+    customer_repo.get_data.return_value = [customer_1]
+    product_repo.get_data.return_value = [product_1]
+    order_repo.get_data.return_value = [order_1, order_3]
+    purchase_summary_repository = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](
+        customer_repo=customer_repo,
+        product_repo=product_repo,
+        order_repo=order_repo
+    )
+
+    for _ in range(3):
+        purchase_summary_repository.purchase_summary()
+
+    assert registry.counters["purchase_summary.cache_misses"] == 1
+    assert registry.counters["purchase_summary.cache_hits"] == 2
+    assert registry.counters["purchase_summary.build.rows"] == 2
+    assert registry.counters["purchase_summary.dangling_orders"] == 1
+
+
+def test_prometheus_text_file_sink(tmp_path: Path) -> None:
+    """
+    Test that the Prometheus sink writes the text exposition format.
+
+    Asserts:
+        - Counters, summaries and gauges are written with sanitized names.
+    """
+    sink = PrometheusTextFileSink(file_name=str(tmp_path / "metrics.prom"))
+    sink.increment("file_reader.read.rows", 10)
+    sink.timing("file_reader.read.duration", 0.5)
+    sink.gauge("file_reader.read.rows_per_second", 20.0)
+    sink.flush()
+
+    text = (tmp_path / "metrics.prom").read_text()
+    assert "# TYPE pipeline_file_reader_read_rows_total counter" in text
+    assert "pipeline_file_reader_read_rows_total 10" in text
+    assert "pipeline_file_reader_read_duration_seconds_count 1" in text
+    assert "pipeline_file_reader_read_duration_seconds_sum 0.5" in text
+    assert "pipeline_file_reader_read_rows_per_second 20.0" in text
+
+
+def test_statsd_sink_sends_udp_packets() -> None:
+    """
+    Test that the StatsD sink sends packets to a local UDP stand-in.
+
+    Asserts:
+        - Counters, timings and gauges are sent in the StatsD line format.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    server.settimeout(2)
+    sink = StatsDSink(port=server.getsockname()[1])
+    try:
+        sink.increment("orders.rows", 3)
+        sink.timing("orders.duration", 0.25)
+        sink.gauge("orders.rows_per_second", 12.0)
+        packets = [server.recv(1024).decode() for _ in range(3)]
+    finally:
+        sink.close()
+        server.close()
+
+    assert packets == [
+        "pipeline.orders.rows:3|c",
+        "pipeline.orders.duration:250.000|ms",
+        "pipeline.orders.rows_per_second:12.0|g"
+    ]
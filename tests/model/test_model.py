@@ -52,3 +52,21 @@ def test_order_to_dict(order_1: Order, order_1_data: OrderDataDict) -> None:
     expected_dict = order_1_data
     assert data == expected_dict
 
+
+def test_entities_hash_by_id(customer_1: Customer, product_1: Product) -> None:
+    """
+    Test that customers and products are hashed by their id.
+
+    Args:
+        customer_1 (Customer): A Customer instance to be tested.
+        product_1 (Product): A Product instance to be tested.
+
+    Asserts:
+        - The hash equals the hash of the id.
+        - Entities with the same id but different fields are still different dictionary keys.
+    """
+    assert hash(customer_1) == hash(customer_1.id)
+    assert hash(product_1) == hash(product_1.id)
+
+    renamed = Product(id=product_1.id, name="Other", category=product_1.category, price=product_1.price)
+    assert len({product_1: 1, renamed: 2}) == 2
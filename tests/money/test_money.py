@@ -0,0 +1,131 @@
+from decimal import Decimal, ROUND_HALF_EVEN
+import pytest
+from src.converter import OrderConverter, ProductConverter
+from src.model import CustomerDataDict, OrderDataDict, ProductDataDict
+from src.money import Discount, Money
+from src.repository import (
+    PurchaseSummaryRepository,
+    CustomerDataRepository,
+    ProductDataRepository,
+    OrderDataRepository
+)
+from src.service import PurchasesSummaryService
+from src.streaming import StreamingPurchaseAnalytics
+from src.file_service import OrderJsonFileReader
+from src.validator import OrderDataDictValidator
+
+
+@pytest.mark.parametrize("text", [
+    "1500.00", "0", "19.9", "0.005", "0.015", "0.025", "2.675", "-2.675", "-0.015", "10.0049", "1E+2", "1.5e-2"
+])
+def test_money_parse_matches_decimal_rounding(text: str) -> None:
+    """
+    Test that parsing rounds like `Decimal.quantize` with half-even rounding.
+
+    Args:
+        text (str): The parsed decimal string.
+
+    Asserts:
+        - The parsed amount equals the quantized `Decimal`.
+        - Converting back and formatting agree with the `Decimal` representation.
+    """
+    expected = Decimal(text).quantize(Decimal("0.01"), rounding=ROUND_HALF_EVEN)
+    money = Money.parse(text)
+    assert money.to_decimal() == expected
+    assert Money.from_decimal(Decimal(text)) == money
+    assert str(money) == str(expected)
+
+
+def test_money_rejects_invalid_values() -> None:
+    """
+    Test that invalid and non-finite values are rejected.
+
+    Asserts:
+        - A ValueError is raised.
+    """
+    for text in ["abc", "NaN", "Infinity", ""]:
+        with pytest.raises(ValueError):
+            Money.parse(text)
+
+
+def test_money_arithmetic_and_discount() -> None:
+    """
+    Test exact arithmetic and discount rounding.
+
+    Asserts:
+        - Addition, subtraction and multiplication by a quantity are exact.
+        - Discounts round half to even like `Decimal`.
+        - Discounts convert to and from basis points.
+    """
+    price = Money.parse("19.99")
+    assert price * 3 == 3 * price == Money(5997)
+    assert price + Money(1) - Money(100) == Money(1900)
+    assert Discount.parse("0.1") == Discount(1000)
+    assert str(Discount.parse("0.125")) == "0.1250"
+    assert Discount(1000).to_decimal() == Decimal("0.1")
+    for amount, rate in [(1999, "0.1"), (25, "0.5"), (35, "0.5"), (1, "0.3333")]:
+        expected = (Decimal(amount) * (1 - Decimal(rate))).quantize(Decimal("1"), rounding=ROUND_HALF_EVEN)
+        assert Money(amount).apply_discount(Discount.parse(rate)) == Money(int(expected))
+
+
+def test_fixed_point_converters(product_1_data: ProductDataDict, order_1_data: OrderDataDict) -> None:
+    """
+    Test that fixed-point converters store minor units and stay equal to the `Decimal` conversion.
+
+    Args:
+        product_1_data (ProductDataDict): Raw data of a product priced "1500.00".
+        order_1_data (OrderDataDict): Raw data of an order with a "0.1" discount.
+
+    Asserts:
+        - Products and orders are equal to the ones of the default converters.
+        - Minor units and basis points are stored.
+    """
+    product = ProductConverter(fixed_point=True).convert(product_1_data)
+    order = OrderConverter(fixed_point=True).convert(order_1_data)
+
+    assert product == ProductConverter().convert(product_1_data)
+    assert (product.price_minor, product.money) == (150000, Money(150000))
+    assert order == OrderConverter().convert(order_1_data)
+    assert (order.discount_basis_points, order.discount_rate) == (1000, Discount(1000))
+
+
+def test_fixed_point_service_equals_decimal_service(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that the fixed-point mode gives exactly the results of the `Decimal` path.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+
+    Asserts:
+        - Every spending metric of the service is equal in both modes.
+        - Streaming analytics give equal spending in both modes.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    repository = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo)
+    decimal_service = PurchasesSummaryService(repository=repository)
+    product_repo.converter = ProductConverter(fixed_point=True)
+    product_repo.refresh_data()
+    fixed_repository = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo)
+    fixed_service = PurchasesSummaryService(repository=fixed_repository, fixed_point=True)
+
+    assert fixed_service.calculate_avarage_spending_per_customer() == (
+        decimal_service.calculate_avarage_spending_per_customer())
+    assert fixed_service.find_highest_and_lowest_spenders() == decimal_service.find_highest_and_lowest_spenders()
+    assert fixed_service.spending_quantiles() == decimal_service.spending_quantiles()
+    for purchases in fixed_repository.purchase_summary().values():
+        assert (PurchasesSummaryService.calculate_total_spent_fixed_point(purchases).to_decimal()
+                == PurchasesSummaryService.calculate_total_spent(purchases))
+
+    results = [
+        StreamingPurchaseAnalytics(
+            customer_repo=customer_repo,
+            product_repo=product_repo,
+            order_reader=OrderJsonFileReader(),
+            order_validator=OrderDataDictValidator(),
+            order_converter=OrderConverter(fixed_point=fixed_point),
+            fixed_point=fixed_point
+        ).run(str(order_repo.file_name))
+        for fixed_point in (False, True)
+    ]
+    assert results[0].customer_spent == results[1].customer_spent
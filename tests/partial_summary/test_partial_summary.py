@@ -0,0 +1,152 @@
+from src.partial_summary import (
+    PartialPurchaseSummary,
+    PartialPurchaseSummaryRepository,
+    build_partial_summary_file,
+    merge_partial_summary_files,
+    main
+)
+from src.repository import (
+    PurchaseSummaryRepository,
+    CustomerDataRepository,
+    ProductDataRepository,
+    OrderDataRepository
+)
+from src.model import CustomerDataDict, ProductDataDict, OrderDataDict
+from src.service import PurchasesSummaryService
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import json
+import pytest
+
+
+@pytest.fixture
+def partials() -> list[PartialPurchaseSummary]:
+    """
+    Fixture providing three overlapping partial summaries.
+
+    Returns:
+        list[PartialPurchaseSummary]: The partial summaries.
+    """
+    first, second, third = PartialPurchaseSummary(), PartialPurchaseSummary(), PartialPurchaseSummary()
+    first.add(1, 101, 2)
+    first.add(1, 102, 1)
+    second.add(1, 101, 3)
+    second.add(2, 101, 1)
+    third.add(2, 102, 4)
+    return [first, second, third]
+
+
+def test_merge_is_associative_and_commutative(partials: list[PartialPurchaseSummary]) -> None:
+    """
+    Test the algebraic properties of `merge`.
+
+    Asserts:
+        - Grouping and order of merges do not change the result.
+        - The empty summary is the identity and operands are not modified.
+        - Updating an accumulator in place gives the merged summary without modifying the added summaries.
+    """
+    first, second, third = partials
+    merged = first.merge(second).merge(third)
+
+    assert merged == first.merge(second.merge(third))
+    assert merged == third.merge(first).merge(second)
+    assert merged == merged.merge(PartialPurchaseSummary())
+    assert merged.quantities == {1: {101: 5, 102: 1}, 2: {101: 1, 102: 4}}
+    assert first.quantities == {1: {101: 2, 102: 1}}
+
+    accumulator = PartialPurchaseSummary()
+    for partial in partials:
+        accumulator.update(partial)
+    assert accumulator == merged
+    assert second.quantities == {1: {101: 3}, 2: {101: 1}}
+
+
+def test_partial_summary_file_round_trip(tmp_path: Path, partials: list[PartialPurchaseSummary]) -> None:
+    """
+    Test that partial summaries survive serialization.
+
+    Asserts:
+        - A written and read summary equals the original.
+        - An unsupported version is rejected.
+    """
+    file_name = tmp_path / "partial.json"
+    partials[0].write(str(file_name))
+
+    assert PartialPurchaseSummary.read(str(file_name)) == partials[0]
+    with pytest.raises(ValueError, match="Unsupported partial summary version"):
+        PartialPurchaseSummary.from_dict({**partials[0].to_dict(), "version": 99})
+
+
+def test_merged_worker_summaries_equal_single_node_summary(
+        tmp_path: Path,
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that summaries built by several worker processes merge into the single-node result.
+
+    Asserts:
+        - The merged summary resolved by the repository equals the single-node summary.
+        - The service computes the same metrics from both repositories.
+        - The CLI merge writes the same summary.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    with open(str(order_repo.file_name), 'r', encoding='utf-8') as file:
+        orders = json.load(file)
+
+    workers = 3
+    slices, outputs = [], []
+    for index in range(workers):
+        slice_file = tmp_path / f"orders_{index}.json"
+        slice_file.write_text(json.dumps(orders[index::workers]))
+        slices.append(str(slice_file))
+        outputs.append(str(tmp_path / f"partial_{index}.json"))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(build_partial_summary_file, slices, outputs))
+
+    single_node = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo)
+    merged = PartialPurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](
+        customer_repo, product_repo, partial=merge_partial_summary_files(outputs)
+    )
+
+    assert merged.purchase_summary_by_id() == single_node.purchase_summary_by_id()
+    assert merged.purchase_summary() == single_node.purchase_summary()
+
+    merged_service = PurchasesSummaryService(repository=merged)
+    single_node_service = PurchasesSummaryService(repository=single_node)
+    assert merged_service.calculate_avarage_spending_per_customer() == \
+        single_node_service.calculate_avarage_spending_per_customer()
+    assert set(merged_service.find_most_popular_products()) == set(single_node_service.find_most_popular_products())
+    highest, lowest = merged_service.find_highest_and_lowest_spenders()
+    expected_highest, expected_lowest = single_node_service.find_highest_and_lowest_spenders()
+    assert set(highest) == set(expected_highest)
+    assert set(lowest) == set(expected_lowest)
+
+    final_file = tmp_path / "final.json"
+    main(["merge", *outputs, "-o", str(final_file)])
+    assert PartialPurchaseSummary.read(str(final_file)) == merged.partial
+
+
+def test_order_queries_on_partial_summary_fail_explicitly(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that queries which need individual orders are refused by a merged partial summary.
+
+    Asserts:
+        - The purchase summary is served.
+        - Rollups, quantity quantiles and the cube raise a `ValueError`.
+    """
+    customer_repo, product_repo, _ = generated_repositories
+    customer_id, product_id = customer_repo.get_data()[0].id, product_repo.get_data()[0].id
+    partial = PartialPurchaseSummary()
+    partial.add(customer_id, product_id, 2)
+    repository = PartialPurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](
+        customer_repo, product_repo, partial=partial
+    )
+    service = PurchasesSummaryService(repository=repository)
+
+    assert repository.purchase_summary_by_id() == {customer_id: {product_id: 2}}
+    with pytest.raises(ValueError, match="summarized on other nodes"):
+        repository.purchase_rollups()
+    with pytest.raises(ValueError, match="summarized on other nodes"):
+        service.order_quantity_quantiles()
+    with pytest.raises(ValueError, match="summarized on other nodes"):
+        service.sales_by_age_band()
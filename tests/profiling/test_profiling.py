@@ -0,0 +1,65 @@
+from src.metrics import InMemoryMetricsRegistry, get_metrics_sink, measure, set_metrics_sink
+from src.profiling import PROFILE_DIR_ENV, TRACE_MEMORY_ENV, profiling, profiling_from_env
+from pathlib import Path
+import pstats
+import pytest
+
+
+def allocate(count: int) -> list[list[int]]:
+    """
+    Allocate `count` small lists.
+    """
+    return [[index] for index in range(count)]
+
+
+def test_profiling_attributes_nested_stages(tmp_path: Path) -> None:
+    """
+    Test that every stage gets its own profile and allocation report.
+
+    Asserts:
+        - Both stages have a pstats file and an allocation report.
+        - The inner stage is only part of its own profile.
+        - The allocations of the inner stage are reported for both stages.
+        - Stage metrics still reach the previous sink, which is restored afterwards.
+    """
+    registry = InMemoryMetricsRegistry()
+    set_metrics_sink(registry)
+    try:
+        with profiling(str(tmp_path), trace_memory=True):
+            with measure("outer"):
+                with measure("inner"):
+                    kept = allocate(10_000)
+        assert get_metrics_sink() is registry
+    finally:
+        set_metrics_sink(None)
+
+    assert registry.counters["outer.calls"] == registry.counters["inner.calls"] == 1
+    for stage in ("outer", "inner"):
+        assert (tmp_path / f"{stage}.pstats").exists()
+    inner_functions = set(pstats.Stats(str(tmp_path / "inner.pstats")).get_stats_profile().func_profiles)
+    outer_functions = set(pstats.Stats(str(tmp_path / "outer.pstats")).get_stats_profile().func_profiles)
+    assert "allocate" in inner_functions and "allocate" not in outer_functions
+    for stage in ("outer", "inner"):
+        assert "test_profiling.py" in (tmp_path / f"{stage}.allocations.txt").read_text(encoding="utf-8")
+    assert len(kept) == 10_000
+
+
+def test_profiling_from_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test enabling the profiler with environment variables.
+
+    Asserts:
+        - Nothing is installed without `PIPELINE_PROFILE_DIR`.
+        - With it, the stages are profiled into the configured directory.
+    """
+    monkeypatch.delenv(PROFILE_DIR_ENV, raising=False)
+    with profiling_from_env() as profiler:
+        assert profiler is None
+
+    monkeypatch.setenv(PROFILE_DIR_ENV, str(tmp_path))
+    monkeypatch.setenv(TRACE_MEMORY_ENV, "0")
+    with profiling_from_env() as profiler:
+        assert profiler is not None and not profiler.trace_memory
+        with measure("stage"):
+            allocate(10)
+    assert [path.name for path in tmp_path.iterdir()] == ["stage.pstats"]
@@ -0,0 +1,156 @@
+from src.rejects import QuarantineWriter, RejectCollector
+from src.model import Customer, Product, Order, ProductDataDict, CustomerDataDict, OrderDataDict
+from src.validator import ProductDataDictValidator
+from src.converter import ProductConverter
+from src.repository import ProductDataRepository, PurchaseSummaryRepository
+from src.file_service import ProductJsonFileReader
+from unittest.mock import MagicMock
+from pathlib import Path
+import json
+import logging
+import pytest
+
+
+def test_reject_collector_keeps_bounded_samples() -> None:
+    """
+    Test that the collector counts all rejects but keeps only a bounded sample.
+
+    Asserts:
+        - Counts include every reject.
+        - At most `sample_size` records are sampled per reason.
+        - The summary resets the collection.
+    """
+    collector = RejectCollector(sample_size=2)
+
+    for index in range(5):
+        collector.reject({"id": index}, "bad_price")
+
+    assert collector.counts["bad_price"] == 5
+    assert collector.samples["bad_price"] == [{"id": 0}, {"id": 1}]
+    assert collector.log_summary("products.json") == {"bad_price": 5}
+    assert collector.total == 0
+    assert collector.samples == {}
+
+
+def test_quarantine_writer_streams_json_lines(tmp_path: Path) -> None:
+    """
+    Test that the quarantine writer appends one JSON line per rejected record.
+
+    Asserts:
+        - Every line holds the original fields, the failing rule and the source file.
+        - Reopening the writer appends to the existing file.
+    """
+    quarantine_file = tmp_path / "rejects.jsonl"
+    with QuarantineWriter(str(quarantine_file)) as writer:
+        writer.write({"id": 1, "price": "-1"}, "non_positive_price", "products.json")
+    with QuarantineWriter(str(quarantine_file)) as writer:
+        writer.write({"id": 2}, "missing_keys:price", "products.json")
+
+    lines = [json.loads(line) for line in quarantine_file.read_text().splitlines()]
+    assert lines == [
+        {"id": 1, "price": "-1", "_reject_rule": "non_positive_price", "_reject_source": "products.json"},
+        {"id": 2, "_reject_rule": "missing_keys:price", "_reject_source": "products.json"}
+    ]
+
+
+def test_rejected_entries_are_quarantined_and_reingested(
+        tmp_path: Path,
+        product_1_data: ProductDataDict,
+        product_2_data: ProductDataDict) -> None:
+    """
+    Test that invalid entries go to the quarantine file and can be re-ingested after correction.
+
+    Asserts:
+        - The invalid product is written to the quarantine file with its failing rule.
+        - Appending the corrected quarantine file adds the product to the cached data
+          and keeps the default file name.
+    """
+    file_name = tmp_path / "products.json"
+    quarantine_file = tmp_path / "products.rejects.jsonl"
+    file_name.write_text(json.dumps([product_1_data, {**product_2_data, "price": "-20.00"}]))
+
+    repository = ProductDataRepository(
+        file_reader=ProductJsonFileReader(),
+        validator=ProductDataDictValidator(),
+        converter=ProductConverter(),
+        file_name=str(file_name),
+        quarantine=QuarantineWriter(str(quarantine_file))
+    )
+    assert [product.id for product in repository.get_data()] == [product_1_data["id"]]
+
+    rejected = [json.loads(line) for line in quarantine_file.read_text().splitlines()]
+    assert len(rejected) == 1
+    assert rejected[0]["_reject_rule"] == "non_positive_price"
+
+    corrected_file = tmp_path / "products.corrected.jsonl"
+    corrected_file.write_text(json.dumps({**rejected[0], "price": product_2_data["price"]}) + "\n")
+    data = repository.refresh_data(str(corrected_file), append=True)
+
+    assert [product.id for product in data] == [product_1_data["id"], product_2_data["id"]]
+    assert repository.file_name == str(file_name)
+
+
+def test_data_repository_logs_single_summary(
+        tmp_path: Path,
+        product_1_data: ProductDataDict,
+        product_2_data: ProductDataDict,
+        caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test that a repository with a reject collector logs one summary instead of every invalid entry.
+
+    Asserts:
+        - Only valid products are loaded.
+        - Exactly one warning summarizes the rejects by reason.
+    """
+    file_name = tmp_path / "products.json"
+    invalid = [
+        {**product_2_data, "id": 200 + index, "price": "-1"} for index in range(10)
+    ] + [{"id": 300, "name": "No price", "category": "Books"}]
+    file_name.write_text(json.dumps([product_1_data, *invalid]))
+
+    with caplog.at_level(logging.WARNING):
+        repository = ProductDataRepository(
+            file_reader=ProductJsonFileReader(),
+            validator=ProductDataDictValidator(),
+            converter=ProductConverter(),
+            file_name=str(file_name),
+            reject_collector=RejectCollector()
+        )
+
+    assert len(repository.get_data()) == 1
+    assert len(caplog.records) == 1
+    assert "Rejected 11 entries" in caplog.text
+    assert "non_positive_price=10" in caplog.text
+    assert "missing_keys:price=1" in caplog.text
+
+
+def test_purchase_summary_aggregates_invalid_references(
+        customer_1: Customer,
+        product_1: Product,
+        order_1: Order,
+        order_3: Order,
+        caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test that orders with invalid references are summarized in a single log line.
+
+    Asserts:
+        - The summary contains only valid orders.
+        - One warning reports the number of invalid references.
+    """
+    customer_repo, product_repo, order_repo = MagicMock(), MagicMock(), MagicMock()
+    customer_repo.get_data.return_value = [customer_1]
+    product_repo.get_data.return_value = [product_1]
+    order_repo.get_data.return_value = [order_1, order_3, order_3]
+    repository = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](
+        customer_repo=customer_repo,
+        product_repo=product_repo,
+        order_repo=order_repo,
+        reject_collector=RejectCollector()
+    )
+
+    with caplog.at_level(logging.WARNING):
+        summary = repository.purchase_summary()
+
+    assert summary == {customer_1: {product_1: 2}}
+    assert len(caplog.records) == 1
+    assert "Rejected 2 entries from purchase summary: invalid_reference=2" in caplog.text
@@ -219,3 +219,25 @@ def test_no_filename_raises_value_error(
             converter=converter_mock,
             file_name=None
         )
+
+def test_refresh_data_increments_version(
+        product_data_repository: ProductDataRepository,
+        file_reader_mock: MagicMock
+) -> None:
+    """
+    Test that every refresh and append of data increments the repository version.
+
+    Args:
+        product_data_repository (ProductDataRepository): The repository instance to test.
+        file_reader_mock (MagicMock): Mock for the file reader.
+
+    Asserts:
+        - The initial load sets the version to 1.
+        - Refreshing and appending each increment the version.
+    """
+    file_reader_mock.read.return_value = []
+    assert product_data_repository.version == 1
+    product_data_repository.refresh_data()
+    assert product_data_repository.version == 2
+    product_data_repository.refresh_data("more_products.json", append=True)
+    assert product_data_repository.version == 3
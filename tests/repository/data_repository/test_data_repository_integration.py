@@ -3,8 +3,11 @@ from src.validator import ProductDataDictValidator
 from src.converter import ProductConverter
 from src.repository import ProductDataRepository
 from src.file_service import ProductJsonFileReader
+from src.rejects import QuarantineWriter
+from decimal import Decimal
 from pathlib import Path
 import json
+import pytest
 
 """
 Integration test for the ProductDataRepository with a real JSON file.
@@ -63,3 +66,79 @@ def test_product_data_repository_with_real_json_file(
     assert len(data) == 2
     assert data[0] == product_1
     assert data[1] == product_2
+
+
+def test_duplicate_ids_are_skipped_on_load(
+        tmp_path: Path,
+        product_1_data: ProductDataDict,
+        product_2_data: ProductDataDict,
+        caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test that entries with an already loaded id are skipped.
+
+    Asserts:
+        - The first occurrence of an id is kept and a warning is logged.
+        - The skipped entry is quarantined with the `duplicate_id` rule.
+    """
+    test_file = tmp_path / "products.json"
+    test_file.write_text(json.dumps([product_1_data, product_2_data, {**product_1_data, "name": "Copy"}]))
+    quarantine_file = tmp_path / "quarantine.jsonl"
+
+    with QuarantineWriter(str(quarantine_file)) as quarantine:
+        repository = ProductDataRepository(
+            file_reader=ProductJsonFileReader(),
+            validator=ProductDataDictValidator(),
+            converter=ProductConverter(),
+            file_name=str(test_file),
+            quarantine=quarantine
+        )
+
+    assert [product.name for product in repository.get_data()] == [product_1_data["name"], product_2_data["name"]]
+    assert "1 entries with duplicate ids" in caplog.text
+    [rejected] = [json.loads(line) for line in quarantine_file.read_text().splitlines()]
+    assert rejected["_reject_rule"] == "duplicate_id"
+
+
+def test_apply_changes_upserts_and_deletes_by_id(
+        tmp_path: Path,
+        product_1_data: ProductDataDict,
+        product_2_data: ProductDataDict) -> None:
+    """
+    Test applying a change set to a repository.
+
+    Asserts:
+        - Upserts of new ids are inserted, upserts of known ids replace the entry.
+        - Deletes remove the entry; deletes of unknown ids and invalid records are rejected.
+        - The id index stays consistent and the version changes.
+    """
+    base_file, changes_file = tmp_path / "products.json", tmp_path / "changes.jsonl"
+    base_file.write_text(json.dumps([product_1_data, product_2_data]))
+    changes = [
+        {"op": "upsert", **product_1_data, "price": "99.99"},
+        {"op": "upsert", **product_2_data, "id": 3, "name": "New"},
+        {"op": "delete", "id": product_2_data["id"]},
+        {"op": "delete", "id": 404},
+        {"op": "upsert", **product_2_data, "id": 4, "price": "-1"},
+        {"op": "rename", "id": 1}
+    ]
+    changes_file.write_text("\n".join(json.dumps(change) for change in changes))
+    repository = ProductDataRepository(
+        file_reader=ProductJsonFileReader(),
+        validator=ProductDataDictValidator(),
+        converter=ProductConverter(),
+        file_name=str(base_file)
+    )
+    version = repository.version
+
+    applied = repository.apply_changes(str(changes_file))
+
+    assert [product.id for product in applied.inserted] == [3]
+    assert [(previous.price, current.price) for previous, current in applied.updated] == [
+        (Decimal(product_1_data["price"]), Decimal("99.99"))
+    ]
+    assert [product.id for product in applied.deleted] == [product_2_data["id"]]
+    assert applied.rejected == 3
+    assert {product.id for product in repository.get_data()} == {product_1_data["id"], 3}
+    assert all(repository.get_by_id(product.id) is product for product in repository.get_data())
+    assert repository.get_by_id(product_2_data["id"]) is None
+    assert repository.version == version + 1
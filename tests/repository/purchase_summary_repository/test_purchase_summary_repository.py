@@ -1,4 +1,11 @@
-from src.repository import PurchaseSummaryRepository, CustomersWithPurchesdProducts
+from src.repository import (
+    PurchaseSummaryRepository,
+    CustomersWithPurchesdProducts,
+    CustomerDataRepository,
+    ProductDataRepository,
+    OrderDataRepository,
+    ProjectedOrderDataRepository
+)
 from src.model import (
     Product,
     Customer, 
@@ -8,11 +15,19 @@ from src.model import (
     ProductDataDict,
     OrderDataDict
     )
+from src.model import SUMMARY_ORDER_FIELDS
+from src.converter import ProjectedOrderConverter
+from src.file_service import OrderJsonFileReader
+from src.validator import OrderDataDictValidator
+from src.sparse_summary import SparsePurchaseSummaryRepository
 from decimal import Decimal
+from pathlib import Path
+import json
 import pytest
 from unittest.mock import MagicMock
 import logging
-from typing import cast
+from typing import Callable, cast
+from src.metrics import InMemoryMetricsRegistry, set_metrics_sink
 
 def test_initial_state_empty_cache(
         purchase_summary_repository: PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict]
@@ -157,3 +172,265 @@ def test_invalid_entry_logs_warning(
             "invalid customer or product reference" in record.message
             for record in caplog.records
         )
+
+def test_purchase_summary_by_id(
+    purchase_summary_repository: PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict],
+    customer_1: Customer,
+    customer_2: Customer,
+    product_1: Product,
+    product_2: Product
+) -> None:
+    """
+    Test that the summary keyed by ids matches the summary keyed by entities.
+
+    Args:
+        purchase_summary_repository (PurchaseSummaryRepository): The repository instance to test.
+        customer_1 (Customer): A sample customer instance.
+        customer_2 (Customer): Another sample customer instance.
+        product_1 (Product): A sample product instance.
+        product_2 (Product): Another sample product instance.
+
+    Asserts:
+        - Quantities are accumulated by customer and product ids.
+        - The entity view holds the same quantities.
+    """
+    summary_by_id = purchase_summary_repository.purchase_summary_by_id()
+    assert summary_by_id == {
+        customer_1.id: {product_1.id: 2, product_2.id: 5},
+        customer_2.id: {product_1.id: 1}
+    }
+
+    summary = purchase_summary_repository.purchase_summary()
+    assert {
+        customer.id: {product.id: quantity for product, quantity in purchases.items()}
+        for customer, purchases in summary.items()
+    } == summary_by_id
+
+
+def test_add_order_updates_summary_and_rollups(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that adding an order updates the built summaries and rollups in place.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+
+    Asserts:
+        - Summaries and rollups after `add_order` equal a rebuild from the repositories.
+        - Orders with unknown references are kept in the order repository but not summarized.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    repository = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo)
+    repository.purchase_summary()
+    rollups = repository.purchase_rollups()
+    customer, product = customer_repo.get_data()[0], product_repo.get_data()[0]
+
+    assert repository.add_order(Order(id=10_001, customer_id=customer.id, product_id=product.id, quantity=4,
+                                      discount=Decimal("0.0"), shipping_method=ShippingMethod.EXPRESS))
+    assert not repository.add_order(Order(id=10_002, customer_id=-1, product_id=product.id, quantity=1,
+                                          discount=Decimal("0.0"), shipping_method=ShippingMethod.EXPRESS))
+
+    assert repository.purchase_rollups() is rollups
+    rebuilt = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo)
+    assert repository.purchase_summary() == rebuilt.purchase_summary()
+    assert repository.purchase_summary_by_id() == rebuilt.purchase_summary_by_id()
+    assert rollups == rebuilt.purchase_rollups()
+    assert len(order_repo.get_data()) == 2002
+
+
+def test_prefiltered_summary_matches_build(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository],
+        caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test that checking the order references in bulk gives the same summary.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+        caplog (pytest.LogCaptureFixture): Fixture for capturing log messages.
+
+    Asserts:
+        - The prefiltered summary equals the summary built with per-order lookups.
+        - The dangling orders are reported in a single warning.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    expected = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo).purchase_summary_by_id()
+    repository = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo, prefilter_references=True)
+
+    with caplog.at_level("WARNING"):
+        assert repository.purchase_summary_by_id() == expected
+    warnings = [record.message for record in caplog.records if "invalid references" in record.message]
+    assert len(warnings) == 1
+    assert repository.check_integrity().invalid_orders > 0
+
+
+
+def test_projected_orders_summary_matches_full_orders(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository],
+        tmp_path: Path) -> None:
+    """
+    Test that orders loaded with the summary fields only give the same summary.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+        tmp_path (Path): A temporary directory provided by pytest.
+
+    Asserts:
+        - The summary of the projected orders equals the summary of the full orders.
+        - Entries invalid only in an undeclared field are kept.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    entries = json.loads(Path(str(order_repo.file_name)).read_text())
+    entries[0]["discount"] = "abc"
+    orders_file = tmp_path / "projected_orders.json"
+    orders_file.write_text(json.dumps(entries))
+    projected_repo = ProjectedOrderDataRepository(
+        file_reader=OrderJsonFileReader(),
+        validator=OrderDataDictValidator(required_fields=list(SUMMARY_ORDER_FIELDS)),
+        converter=ProjectedOrderConverter(SUMMARY_ORDER_FIELDS),
+        file_name=str(orders_file)
+    )
+
+    assert [order.id for order in projected_repo.get_data()] == [order.id for order in order_repo.get_data()]
+    expected = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo).purchase_summary()
+    assert PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, projected_repo).purchase_summary() == expected
+
+
+def test_mixed_queries_build_summary_and_rollups_once(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that the summary views and the rollups share one build until a refresh is forced.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+
+    Asserts:
+        - Interleaved id-keyed, entity-keyed and rollup queries build the summary and the rollups once.
+        - The version only changes on a forced refresh, which rebuilds both.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    repository = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](
+        customer_repo, product_repo, order_repo)
+    registry = InMemoryMetricsRegistry()
+    set_metrics_sink(registry)
+    try:
+        repository.purchase_rollups()
+        version = repository.version
+        summary = repository.purchase_summary()
+        repository.purchase_summary_by_id()
+        repository.purchase_rollups()
+        assert repository.version == version
+        assert (registry.counters["purchase_summary.build.calls"],
+                registry.counters["purchase_summary.build_rollups.calls"]) == (1, 1)
+
+        assert repository.purchase_summary(forced_refreshed=True) == summary
+        repository.purchase_rollups()
+    finally:
+        set_metrics_sink(None)
+
+    assert repository.version == version + 1
+    assert (registry.counters["purchase_summary.build.calls"],
+            registry.counters["purchase_summary.build_rollups.calls"]) == (2, 2)
+
+@pytest.mark.parametrize("query", ["purchase_rollups", "purchase_cube", "order_index", "add_order", "apply_changes"])
+def test_projected_orders_refuse_queries_needing_complete_orders(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository],
+        query: str) -> None:
+    """
+    Test that queries reading the discount or shipping method of orders fail explicitly on projected orders.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+        query (str): The name of the refused query.
+
+    Asserts:
+        - The summary of the projected orders is built.
+        - The query raises a ValueError naming it and leaves the order repository unchanged.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    projected_repo = ProjectedOrderDataRepository(
+        file_reader=OrderJsonFileReader(),
+        validator=OrderDataDictValidator(required_fields=list(SUMMARY_ORDER_FIELDS)),
+        converter=ProjectedOrderConverter(SUMMARY_ORDER_FIELDS),
+        file_name=order_repo.file_name
+    )
+    repository = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](
+        customer_repo, product_repo, projected_repo)
+    queries: dict[str, Callable[[], object]] = {
+        "purchase_rollups": repository.purchase_rollups,
+        "purchase_cube": repository.purchase_cube,
+        "order_index": repository.order_index,
+        "add_order": lambda: repository.add_order(order_repo.get_data()[0]),
+        "apply_changes": lambda: repository.apply_changes(orders_file=order_repo.file_name)
+    }
+
+    assert repository.purchase_summary_by_id()
+    with pytest.raises(ValueError, match=f"{query} needs complete orders"):
+        queries[query]()
+    assert len(projected_repo.get_data()) == len(order_repo.get_data())
+
+@pytest.mark.parametrize("repository_type", [PurchaseSummaryRepository, SparsePurchaseSummaryRepository])
+def test_apply_order_changes_updates_summary_incrementally(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository],
+        repository_type: type[PurchaseSummaryRepository],
+        tmp_path: Path) -> None:
+    """
+    Test that an order change set is propagated to the built summaries.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+        repository_type (type[PurchaseSummaryRepository]): The summary repository under test.
+        tmp_path (Path): A temporary directory provided by pytest.
+
+    Asserts:
+        - Updated, deleted and inserted orders give the same summaries as a rebuild.
+        - Rollups are rebuilt after orders were removed.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    repository = repository_type(customer_repo, product_repo, order_repo)
+    repository.purchase_summary()
+    repository.purchase_rollups()
+    first, second = order_repo.get_data()[:2]
+    customer, product = customer_repo.get_data()[0], product_repo.get_data()[0]
+    changes = [
+        {"op": "upsert", **first.to_dict(), "quantity": first.quantity + 3},
+        {"op": "delete", "id": second.id},
+        {"op": "upsert", **first.to_dict(), "id": 50_001, "customer_id": customer.id, "product_id": product.id},
+        {"op": "upsert", **first.to_dict(), "id": 50_002, "customer_id": -1}
+    ]
+    changes_file = tmp_path / "order_changes.jsonl"
+    changes_file.write_text("\n".join(json.dumps(change) for change in changes))
+
+    applied = repository.apply_changes(orders_file=str(changes_file))["orders"]
+
+    assert (len(applied.inserted), len(applied.updated), len(applied.deleted)) == (2, 1, 1)
+    rebuilt = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo)
+    assert repository.purchase_summary_by_id() == rebuilt.purchase_summary_by_id()
+    assert repository.purchase_summary() == rebuilt.purchase_summary()
+    assert repository.purchase_rollups() == rebuilt.purchase_rollups()
+
+
+def test_apply_product_changes_rebuilds_summary(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository],
+        tmp_path: Path) -> None:
+    """
+    Test that a product change set drops the summaries, which follow the new products on next use.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+        tmp_path (Path): A temporary directory provided by pytest.
+
+    Asserts:
+        - Orders of a deleted product are no longer summarized.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    repository = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo)
+    deleted = product_repo.get_data()[0]
+    assert any(deleted.id in purchases for purchases in repository.purchase_summary_by_id().values())
+    changes_file = tmp_path / "product_changes.jsonl"
+    changes_file.write_text(json.dumps({"op": "delete", "id": deleted.id}))
+
+    repository.apply_changes(products_file=str(changes_file))
+
+    assert not any(deleted.id in purchases for purchases in repository.purchase_summary_by_id().values())
+    assert repository.purchase_summary_by_id() == PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](
+        customer_repo, product_repo, order_repo).purchase_summary_by_id()
@@ -0,0 +1,73 @@
+from src.repository import (
+    PurchaseSummaryRepository,
+    CustomerDataRepository,
+    ProductDataRepository,
+    OrderDataRepository
+)
+from src.model import CustomerDataDict, ProductDataDict, OrderDataDict
+from src.metrics import InMemoryMetricsRegistry, set_metrics_sink
+import src.repository
+import logging
+import pytest
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_sharded_build_matches_serial_build(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository],
+        workers: int,
+        caplog: pytest.LogCaptureFixture,
+        monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that the sharded summary build gives exactly the result of the serial build.
+
+    Args:
+        generated_repositories (tuple): Customer, product and order repositories loaded from generated data.
+        workers (int): The number of worker processes.
+        caplog (pytest.LogCaptureFixture): Fixture for capturing log messages.
+        monkeypatch (pytest.MonkeyPatch): Fixture lowering the number of orders per worker.
+
+    Asserts:
+        - The summaries are equal, including the order of customers and products.
+        - The same invalid reference warnings are logged in the same order.
+    """
+    monkeypatch.setattr(src.repository, "MIN_ORDERS_PER_WORKER", 100)
+    customer_repo, product_repo, order_repo = generated_repositories
+    serial = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo)
+    sharded = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo, workers=workers)
+
+    with caplog.at_level(logging.WARNING):
+        expected = serial.purchase_summary_by_id()
+        expected_warnings = [record.getMessage() for record in caplog.records]
+        caplog.clear()
+        summary = sharded.purchase_summary_by_id()
+        warnings = [record.getMessage() for record in caplog.records]
+
+    assert summary == expected
+    assert [(customer_id, list(purchases)) for customer_id, purchases in summary.items()] == \
+        [(customer_id, list(purchases)) for customer_id, purchases in expected.items()]
+    assert warnings == expected_warnings
+    assert len(warnings) > 0
+    assert list(sharded.purchase_summary().items()) == list(serial.purchase_summary().items())
+
+
+def test_small_loads_are_built_serially(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that no worker processes are started for fewer orders than two workers need.
+
+    Args:
+        generated_repositories (tuple): Customer, product and order repositories loaded from generated data.
+
+    Asserts:
+        - The summary is built by the serial stage.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    registry = InMemoryMetricsRegistry()
+    set_metrics_sink(registry)
+    try:
+        PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo, workers=4).purchase_summary_by_id()
+    finally:
+        set_metrics_sink(None)
+
+    assert registry.counters["purchase_summary.build.calls"] == 1
+    assert "purchase_summary.build_sharded.calls" not in registry.counters
@@ -0,0 +1,38 @@
+from decimal import Decimal
+from src.model import Order, Product, ProductCategory, ShippingMethod
+from src.rollups import PurchaseRollups
+
+
+def test_rollups_from_orders(
+        order_1: Order,
+        order_2: Order,
+        order_3: Order,
+        product_1: Product,
+        product_2: Product) -> None:
+    """
+    Test that rollups aggregate units, revenue and buyers by category and shipping method.
+
+    Args:
+        order_1 (Order): A standard shipping order of product 101 by customer 1.
+        order_2 (Order): An express shipping order of product 102 by customer 1.
+        order_3 (Order): A standard shipping order of product 101 by customer 2.
+        product_1 (Product): An electronics product.
+        product_2 (Product): A clothing product.
+
+    Asserts:
+        - Category and shipping method totals match the orders.
+        - Popular products are resolved overall and within a category.
+    """
+    rollups = PurchaseRollups.from_orders([order_1, order_2, order_3], {101: product_1, 102: product_2})
+
+    electronics = rollups.categories[ProductCategory.ELECTRONICS]
+    assert (electronics.units, electronics.revenue, electronics.buyers) == (3, Decimal("4500.00"), {1, 2})
+    clothing = rollups.categories[ProductCategory.CLOTHING]
+    assert (clothing.units, clothing.revenue, clothing.buyers) == (5, Decimal("100.00"), {1})
+    standard = rollups.shipping_methods[ShippingMethod.STANDARD]
+    assert (standard.units, standard.revenue, standard.buyers) == (3, Decimal("4500.00"), {1, 2})
+    assert rollups.shipping_methods[ShippingMethod.EXPRESS].units == 5
+
+    assert rollups.popular_products() == [product_2]
+    assert rollups.popular_products(ProductCategory.ELECTRONICS) == [product_1]
+    assert rollups.popular_products(ProductCategory.BOOKS) == []
@@ -0,0 +1,53 @@
+from decimal import Decimal
+from src.filters import OrderFilter
+from src.repository import (
+    PurchaseSummaryRepository,
+    CustomerDataRepository,
+    ProductDataRepository,
+    OrderDataRepository
+)
+from src.service import PurchasesSummaryService
+from src.model import ProductCategory, ShippingMethod
+
+
+def test_filtered_queries_match_filtered_repository(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that filtered queries equal unfiltered queries over orders filtered while they are read.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+
+    Asserts:
+        - Summary, rollup, quantile and cube based queries are computed over the accepted orders.
+        - The row filter skips the rejected orders before they are converted.
+        - The highest spenders among Express orders in Electronics are found.
+        - Unfiltered queries are unchanged.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    service = PurchasesSummaryService(repository=PurchaseSummaryRepository(customer_repo, product_repo, order_repo))
+    unfiltered = service.find_highest_and_lowest_spenders()
+    order_filter = OrderFilter(
+        categories={ProductCategory.ELECTRONICS},
+        shipping_methods={ShippingMethod.EXPRESS},
+        age_range=(20, 60),
+        discount_range=(Decimal("0.0"), Decimal("0.5"))
+    )
+    filtered_order_repo = OrderDataRepository(
+        file_reader=order_repo.file_reader,
+        validator=order_repo.validator,
+        converter=order_repo.converter,
+        file_name=order_repo.file_name,
+        row_filter=order_filter.row_predicate(customer_repo.get_data(), product_repo.get_data())
+    )
+    expected = PurchasesSummaryService(
+        repository=PurchaseSummaryRepository(customer_repo, product_repo, filtered_order_repo), cache=None)
+
+    for query in ("calculate_avarage_spending_per_customer", "find_most_popular_products",
+                  "find_highest_and_lowest_spenders", "spending_quantiles", "order_quantity_quantiles",
+                  "units_by_category", "revenue_by_shipping_method", "distinct_buyers_by_category",
+                  "popular_products", "sales_by_age_band"):
+        assert getattr(service, query)(order_filter=order_filter) == getattr(expected, query)(), query
+    assert 0 < len(filtered_order_repo.get_data()) < len(order_repo.get_data())
+    assert service.find_highest_and_lowest_spenders() == unfiltered
+    assert set(service.units_by_category(order_filter=order_filter)) == {ProductCategory.ELECTRONICS}
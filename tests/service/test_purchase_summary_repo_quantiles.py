@@ -0,0 +1,70 @@
+from decimal import Decimal
+from unittest.mock import MagicMock
+from src.service import PurchasesSummaryService
+from src.model import Customer, Product, Order
+
+
+def test_spending_quantiles_with_no_purchases(
+        service: PurchasesSummaryService,
+        mock_repository: MagicMock) -> None:
+    """
+    Test spending quantiles when there are no purchases.
+
+    Args:
+        service (PurchasesSummaryService): The service instance to test.
+        mock_repository (MagicMock): A mock repository for purchase summary data.
+
+    Asserts:
+        - The result is empty.
+    """
+    mock_repository.purchase_summary.return_value = {}
+    assert service.spending_quantiles() == {}
+
+
+def test_spending_quantiles(
+        service: PurchasesSummaryService,
+        customer_1: Customer,
+        customer_2: Customer,
+        product_1: Product,
+        mock_repository: MagicMock) -> None:
+    """
+    Test exact spending quantiles of a small summary.
+
+    Args:
+        service (PurchasesSummaryService): The service instance to test.
+        customer_1 (Customer): A sample customer instance with higher spending.
+        customer_2 (Customer): A sample customer instance with lower spending.
+        product_1 (Product): A sample product instance.
+        mock_repository (MagicMock): A mock repository for purchase summary data.
+
+    Asserts:
+        - Quantiles are the total spending of a customer, using the nearest-rank method.
+    """
+    mock_repository.purchase_summary.return_value = {
+        customer_1: {product_1: 3},
+        customer_2: {product_1: 1}
+    }
+    result = service.spending_quantiles([0.0, 0.5, 0.99])
+    assert result == {0.0: Decimal("1500.00"), 0.5: Decimal("1500.00"), 0.99: Decimal("4500.00")}
+
+
+def test_order_quantity_quantiles_skip_invalid_references(
+        service: PurchasesSummaryService,
+        order_1: Order,
+        order_2: Order,
+        mock_repository: MagicMock) -> None:
+    """
+    Test order quantity quantiles of the orders included in the summary.
+
+    Args:
+        service (PurchasesSummaryService): The service instance to test.
+        order_1 (Order): A sample order of product 101.
+        order_2 (Order): A sample order of product 102.
+        mock_repository (MagicMock): A mock repository for purchase summary data.
+
+    Asserts:
+        - Orders of products missing from the summary are not counted.
+    """
+    mock_repository.purchase_summary_by_id.return_value = {1: {101: 2}}
+    mock_repository.order_repo.get_data.return_value = [order_1, order_2]
+    assert service.order_quantity_quantiles() == {0.5: 2, 0.9: 2, 0.99: 2}
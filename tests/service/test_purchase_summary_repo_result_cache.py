@@ -0,0 +1,92 @@
+from unittest.mock import patch
+from src.repository import (
+    PurchaseSummaryRepository,
+    CustomerDataRepository,
+    ProductDataRepository,
+    OrderDataRepository
+)
+from src.model import CustomerDataDict, ProductDataDict, OrderDataDict
+from src.service import PurchasesSummaryService
+from src.cache import ResultCache
+
+
+def test_results_are_cached_until_data_changes(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that service results are reused until a repository or the summary is refreshed.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+
+    Asserts:
+        - Without a cache every call returns a fresh result.
+        - A repeated call is a cache hit and does not read the summary again.
+        - Refreshing the order repository or forcing a summary rebuild causes a miss.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    repository = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo)
+    cache = ResultCache()
+    service = PurchasesSummaryService(repository=repository, cache=cache)
+
+    expected = service.find_highest_and_lowest_spenders()
+    assert PurchasesSummaryService(repository=repository).find_highest_and_lowest_spenders() is not expected
+    with patch.object(repository, "purchase_summary", wraps=repository.purchase_summary) as summary:
+        assert service.find_highest_and_lowest_spenders() is expected
+        summary.assert_not_called()
+    assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+
+    order_repo.refresh_data()
+    assert service.find_highest_and_lowest_spenders() is not expected
+    repository.purchase_summary(forced_refreshed=True)
+    assert service.find_highest_and_lowest_spenders() == expected
+    assert cache.stats().misses == 3
+
+
+def test_iterable_arguments_key_cached_results(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that quantiles passed as a generator key the cache like the same quantiles in a tuple.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+
+    Asserts:
+        - Generator, list and tuple quantiles hit the same cache entry and give every quantile.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    cache = ResultCache()
+    service = PurchasesSummaryService(
+        repository=PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](
+            customer_repo, product_repo, order_repo),
+        cache=cache)
+
+    expected = service.spending_quantiles(quantile for quantile in (0.5, 0.9))
+    assert set(expected) == {0.5, 0.9}
+    assert service.spending_quantiles([0.5, 0.9]) is expected
+    assert service.spending_quantiles((0.5, 0.9)) is expected
+    assert (cache.stats().hits, cache.stats().misses) == (2, 1)
+
+
+def test_interleaved_summary_and_rollup_queries_hit_the_cache(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that queries backed by the summary and by the rollups keep each other's results valid.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+
+    Asserts:
+        - Repeating an interleaved sequence of summary and rollup queries is answered from the cache.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    cache = ResultCache()
+    service = PurchasesSummaryService(
+        repository=PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](
+            customer_repo, product_repo, order_repo),
+        cache=cache)
+    queries = [service.units_by_category, service.find_highest_and_lowest_spenders, service.revenue_by_shipping_method,
+               service.calculate_avarage_spending_per_customer, service.find_most_popular_products]
+
+    first = [query() for query in queries]
+    assert [query() for query in queries] == first
+    assert (cache.stats().hits, cache.stats().misses) == (5, 5)
@@ -0,0 +1,84 @@
+from decimal import Decimal
+from src.filters import OrderFilter
+from src.repository import (
+    PurchaseSummaryRepository,
+    CustomerDataRepository,
+    ProductDataRepository,
+    OrderDataRepository
+)
+from src.service import PurchasesSummaryService
+from src.model import ProductCategory, ShippingMethod
+
+
+def test_rollup_methods_match_summary(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that rollup answers match a walk over the purchase summary.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+
+    Asserts:
+        - Units, revenue and distinct buyers by category match the purchase summary.
+        - Revenue by shipping method adds up to the total spending of all customers.
+        - Popular products overall match `find_most_popular_products`.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    service = PurchasesSummaryService(
+        repository=PurchaseSummaryRepository(customer_repo, product_repo, order_repo)
+    )
+    units: dict[ProductCategory, int] = {}
+    revenue: dict[ProductCategory, Decimal] = {}
+    buyers: dict[ProductCategory, set[int]] = {}
+    category_products: dict[ProductCategory, dict[int, int]] = {}
+    for customer, purchases in service.repository.purchase_summary().items():
+        for product, quantity in purchases.items():
+            units[product.category] = units.get(product.category, 0) + quantity
+            revenue[product.category] = revenue.get(product.category, Decimal("0.0")) + product.total_price(quantity)
+            buyers.setdefault(product.category, set()).add(customer.id)
+            products = category_products.setdefault(product.category, {})
+            products[product.id] = products.get(product.id, 0) + quantity
+    total_spent = sum((service.calculate_total_spent(purchases)
+                       for purchases in service.repository.purchase_summary().values()), Decimal("0.0"))
+
+    assert service.units_by_category() == units
+    assert service.revenue_by_category() == revenue
+    assert service.distinct_buyers_by_category() == {category: len(ids) for category, ids in buyers.items()}
+    assert sum(service.revenue_by_shipping_method().values()) == total_spent
+    assert sum(service.units_by_shipping_method().values()) == sum(units.values())
+    assert max(service.distinct_buyers_by_shipping_method().values()) <= len(customer_repo.get_data())
+    assert set(service.popular_products()) == set(service.find_most_popular_products())
+    for category, products in category_products.items():
+        assert {product.id for product in service.popular_products(category=category)} == {
+            product_id for product_id, quantity in products.items() if quantity == max(products.values())
+        }
+
+
+def test_filtered_spenders_use_order_index(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that filtered service queries aggregate only the matching orders.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+
+    Asserts:
+        - The highest spenders among Express orders in Electronics are computed from the filtered summary.
+        - Unfiltered queries are unchanged.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    service = PurchasesSummaryService(
+        repository=PurchaseSummaryRepository(customer_repo, product_repo, order_repo)
+    )
+    order_filter = OrderFilter(categories=[ProductCategory.ELECTRONICS], shipping_methods=[ShippingMethod.EXPRESS])
+    filtered = service.repository.filtered_purchase_summary(order_filter)
+    totals = {customer: service.calculate_total_spent(purchases) for customer, purchases in filtered.items()}
+
+    highest, lowest = service.find_highest_and_lowest_spenders(order_filter=order_filter)
+
+    assert {customer: totals[customer] for customer in highest} == {
+        customer: total for customer, total in totals.items() if total == max(totals.values())}
+    assert all(totals[customer] == min(totals.values()) for customer in lowest)
+    assert all(product.category is ProductCategory.ELECTRONICS for product in service.find_most_popular_products(
+        order_filter=OrderFilter(categories=[ProductCategory.ELECTRONICS])))
+    assert service.find_highest_and_lowest_spenders() != (highest, lowest)
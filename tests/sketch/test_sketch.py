@@ -0,0 +1,217 @@
+from bisect import bisect_right
+from collections import Counter
+import random
+
+import pytest
+
+from src.sketch import CountMinSketch, HyperLogLog, QuantileSketch, SpaceSaving, hash64
+
+
+@pytest.fixture
+def skewed_stream() -> list[int]:
+    """
+    Fixture providing a Zipf-like stream of 20 000 keys out of 1 000.
+    """
+    rng = random.Random(7)
+    keys = list(range(1, 1001))
+    return rng.choices(keys, weights=[1 / key ** 1.2 for key in keys], k=20_000)
+
+
+def test_hash64_is_deterministic() -> None:
+    """
+    Test that integer hashes only depend on the key and the seed.
+
+    Asserts:
+        - The same key and seed give the same 64-bit value.
+        - Different seeds give different values.
+    """
+    assert hash64(42) == hash64(42)
+    assert hash64(42, 1) != hash64(42, 2)
+    assert 0 <= hash64(-1) < 1 << 64
+
+
+def test_count_min_sketch_error_bound(skewed_stream: list[int]) -> None:
+    """
+    Test that Count-Min estimates stay within the configured error bound.
+
+    Asserts:
+        - No estimate is below the exact count.
+        - No estimate exceeds the exact count by more than `epsilon * total`.
+    """
+    sketch = CountMinSketch(epsilon=0.005, delta=0.01)
+    for key in skewed_stream:
+        sketch.add(key)
+    exact = Counter(skewed_stream)
+
+    for key in range(1, 1001):
+        assert exact[key] <= sketch.estimate(key) <= exact[key] + sketch.epsilon * sketch.total
+
+
+def test_count_min_sketch_merge(skewed_stream: list[int]) -> None:
+    """
+    Test that merging sketches of two halves equals the sketch of the whole stream.
+
+    Asserts:
+        - Every estimate of the merged sketch equals the single-pass estimate.
+        - Sketches of different dimensions are not merged.
+    """
+    whole, first, second = CountMinSketch(0.01), CountMinSketch(0.01), CountMinSketch(0.01)
+    for position, key in enumerate(skewed_stream):
+        whole.add(key)
+        (first if position % 2 else second).add(key)
+
+    merged = first.merge(second)
+
+    assert merged.total == whole.total
+    assert all(merged.estimate(key) == whole.estimate(key) for key in range(1, 1001))
+    with pytest.raises(ValueError):
+        whole.merge(CountMinSketch(0.1))
+
+
+def test_space_saving_finds_heavy_hitters(skewed_stream: list[int]) -> None:
+    """
+    Test that Space-Saving monitors every key above `total / capacity` and bounds its error.
+
+    Asserts:
+        - All heavy hitters are monitored.
+        - Counts overestimate by at most the recorded error.
+        - The top key is the exact top key.
+    """
+    summary = SpaceSaving[int](capacity=50)
+    for key in skewed_stream:
+        summary.add(key)
+    exact = Counter(skewed_stream)
+
+    heavy = {key for key, count in exact.items() if count > len(skewed_stream) / summary.capacity}
+    assert heavy <= summary.counters.keys()
+    for key, count in summary.counters.items():
+        assert exact[key] <= count <= exact[key] + summary.errors[key]
+    assert summary.top(1)[0][0] == exact.most_common(1)[0][0]
+
+
+def test_space_saving_merge(skewed_stream: list[int]) -> None:
+    """
+    Test that merged summaries still monitor the heavy hitters of both halves.
+
+    Asserts:
+        - The merged summary holds at most `capacity` keys.
+        - All heavy hitters of the whole stream are monitored with bounded error.
+    """
+    first, second = SpaceSaving[int](capacity=50), SpaceSaving[int](capacity=50)
+    for position, key in enumerate(skewed_stream):
+        (first if position % 2 else second).add(key)
+    exact = Counter(skewed_stream)
+
+    merged = first.merge(second)
+
+    assert len(merged.counters) <= 50
+    assert merged.total == len(skewed_stream)
+    heavy = {key for key, count in exact.items() if count > len(skewed_stream) / 50}
+    assert heavy <= merged.counters.keys()
+    for key in heavy:
+        assert exact[key] <= merged.counters[key] <= exact[key] + merged.errors[key]
+
+
+
+def test_space_saving_evicts_smallest_current_counter() -> None:
+    """
+    Test that eviction uses the current counts, not the counts recorded when keys were added.
+
+    Asserts:
+        - A key incremented after it was added is kept over a smaller key.
+        - The replacing key inherits the evicted count as its error.
+    """
+    summary = SpaceSaving[str](capacity=2)
+    for key in ["a", "b", "a", "a", "c"]:
+        summary.add(key)
+
+    assert summary.counters == {"a": 3, "c": 2}
+    assert summary.errors == {"a": 0, "c": 1}
+    summary.add("d")
+    assert summary.counters == {"a": 3, "d": 3}
+    assert summary.errors == {"a": 0, "d": 2}
+
+@pytest.mark.parametrize("distinct", [10, 1_000, 50_000])
+def test_hyper_log_log_count(distinct: int) -> None:
+    """
+    Test that HyperLogLog estimates are within three standard errors.
+
+    Asserts:
+        - Repeated keys do not change the estimate.
+        - The estimate is within 3 * 1.04 / sqrt(m) of the exact count.
+    """
+    estimator = HyperLogLog.for_error(0.02)
+    for key in range(distinct):
+        estimator.add(key)
+        estimator.add(key)
+
+    assert abs(estimator.count() - distinct) <= 3 * 0.02 * distinct + 1
+
+
+def test_hyper_log_log_merge() -> None:
+    """
+    Test that merging estimators gives the estimate of the union.
+
+    Asserts:
+        - The merged estimate equals the estimate built from the union.
+        - Estimators of different precisions are not merged.
+    """
+    first, second, union = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+    for key in range(3000):
+        first.add(key)
+        union.add(key)
+    for key in range(2000, 6000):
+        second.add(key)
+        union.add(key)
+
+    assert first.merge(second).count() == union.count()
+    with pytest.raises(ValueError):
+        first.merge(HyperLogLog(11))
+
+
+def test_quantile_sketch_is_exact_for_small_data() -> None:
+    """
+    Test that quantiles are exact while fewer than `exact_limit` values were added.
+
+    Asserts:
+        - The sketch reports that it is exact.
+        - Quantiles match the nearest-rank percentiles of the values.
+    """
+    sketch: QuantileSketch[int] = QuantileSketch(exact_limit=1000)
+    for value in range(500, 0, -1):
+        sketch.add(value)
+
+    assert sketch.is_exact
+    assert sketch.quantiles([0.0, 0.5, 0.9, 0.99, 1.0]) == {0.0: 1, 0.5: 250, 0.9: 450, 0.99: 495, 1.0: 500}
+    with pytest.raises(ValueError):
+        QuantileSketch().quantile(0.5)
+    with pytest.raises(ValueError):
+        sketch.quantile(1.5)
+
+
+def test_quantile_sketch_rank_error() -> None:
+    """
+    Test that estimated quantiles of a large skewed stream are within 2% in rank.
+
+    Asserts:
+        - The sketch compacts and keeps far fewer values than were added.
+        - The rank of every estimated quantile, and of the estimates merged from two halves,
+          is within 0.02 of the requested quantile.
+    """
+    rng = random.Random(11)
+    values = [round(rng.lognormvariate(3, 1), 2) for _ in range(50_000)]
+    whole, first, second = QuantileSketch[float](), QuantileSketch[float](), QuantileSketch[float]()
+    for position, value in enumerate(values):
+        whole.add(value)
+        (first if position % 2 else second).add(value)
+    merged = first.merge(second)
+    ordered = sorted(values)
+
+    assert not whole.is_exact
+    assert sum(map(len, whole._levels)) < 1000
+    for sketch in (whole, merged):
+        assert sketch.count == len(values)
+        for q, estimate in sketch.quantiles([0.5, 0.9, 0.99]).items():
+            assert abs(bisect_right(ordered, estimate) / len(values) - q) <= 0.02
+    with pytest.raises(ValueError):
+        whole.merge(QuantileSketch(k=100))
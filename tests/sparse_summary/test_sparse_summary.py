@@ -0,0 +1,123 @@
+from src.sparse_summary import PurchaseMatrix, PurchaseMatrixSummary, SparsePurchaseSummaryRepository
+from src.repository import (
+    PurchaseSummaryRepository,
+    CustomerDataRepository,
+    ProductDataRepository,
+    OrderDataRepository
+)
+from src.model import CustomerDataDict, ProductDataDict, OrderDataDict
+from src.metrics import InMemoryMetricsRegistry, set_metrics_sink
+from collections import defaultdict
+from dataclasses import replace
+import logging
+import pytest
+
+
+def test_purchase_matrix_from_triples() -> None:
+    """
+    Test building the CSR matrix from triples with duplicate entries.
+
+    Asserts:
+        - Duplicate customer-product triples are summed.
+        - Row and column slices return quantities keyed by ids.
+        - Customers without purchases are left out of the summary.
+    """
+    matrix = PurchaseMatrix.from_triples(
+        [1, 2, 3],
+        [101, 102],
+        [(2, 102, 1), (1, 101, 2), (1, 102, 5), (1, 101, 3)]
+    )
+
+    assert matrix.shape == (3, 2)
+    assert matrix.nnz == 3
+    assert list(matrix.indptr) == [0, 2, 3, 3]
+    assert matrix.row(1) == {101: 5, 102: 5}
+    assert matrix.row(3) == {}
+    assert matrix.row(99) == {}
+    assert matrix.column(102) == {1: 5, 2: 1}
+    assert matrix.product_totals() == {101: 5, 102: 6}
+    assert matrix.to_summary_by_id() == {1: {101: 5, 102: 5}, 2: {102: 1}}
+
+    view = PurchaseMatrixSummary(matrix)
+    assert view == matrix.to_summary_by_id()
+    assert (len(view), list(view), 3 in view, 99 in view) == (2, [1, 2], False, False)
+    with pytest.raises(KeyError):
+        view[3]
+
+
+def test_sparse_repository_matches_dict_repository(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository],
+        caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test that the sparse backend produces the same summary as the dictionary backend.
+
+    Asserts:
+        - The id and entity summaries are equal.
+        - Per-customer and per-product slices agree with the summary.
+        - Orders with invalid references are reported by both backends.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    expected = PurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo)
+    sparse = SparsePurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](customer_repo, product_repo, order_repo)
+
+    with caplog.at_level(logging.WARNING):
+        summary_by_id = expected.purchase_summary_by_id()
+        expected_warnings = len(caplog.records)
+        caplog.clear()
+        assert sparse.purchase_summary_by_id() == summary_by_id
+        assert len(caplog.records) == expected_warnings > 0
+
+    assert sparse.purchase_summary() == expected.purchase_summary()
+
+    buyers: dict[int, dict[int, int]] = defaultdict(dict)
+    for customer_id, purchases in summary_by_id.items():
+        assert sparse.customer_purchases(customer_id) == purchases
+        for product_id, quantity in purchases.items():
+            buyers[product_id][customer_id] = quantity
+    for product_id, quantities in buyers.items():
+        assert sparse.product_buyers(product_id) == quantities
+
+
+def test_sparse_repository_answers_summaries_from_one_matrix(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that the sparse backend keeps no dictionary summary beside its matrix.
+
+    Args:
+        generated_repositories: Customer, product and order repositories of a generated dataset.
+
+    Asserts:
+        - Summary, slice and rollup queries share one matrix build and keep the version.
+        - The summary keyed by ids is a view of the cached matrix.
+        - An added order rebuilds the matrix once on next use, a forced refresh rebuilds it again.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    sparse = SparsePurchaseSummaryRepository[CustomerDataDict, ProductDataDict, OrderDataDict](
+        customer_repo, product_repo, order_repo)
+    registry = InMemoryMetricsRegistry()
+    set_metrics_sink(registry)
+    try:
+        summary_by_id = sparse.purchase_summary_by_id()
+        version = sparse.version
+        sparse.purchase_summary()
+        sparse.purchase_rollups()
+        sparse.customer_purchases(next(iter(summary_by_id)))
+        assert isinstance(summary_by_id, PurchaseMatrixSummary) and summary_by_id.matrix is sparse.purchase_matrix()
+        assert sparse._summary_by_id == {}
+        assert (sparse.version, registry.counters["purchase_summary.build_matrix.calls"]) == (version, 1)
+
+        orders = order_repo.get_data()
+        valid = next(order for order in orders if order.product_id in summary_by_id.get(order.customer_id, {}))
+        order = replace(valid, id=max(order.id for order in orders) + 1)
+        assert sparse.add_order(order)
+        summary = sparse.purchase_summary_by_id()
+        sparse.purchase_rollups()
+        assert registry.counters["purchase_summary.build_matrix.calls"] == 2
+        assert registry.counters["purchase_summary.build_rollups.calls"] == 1
+        assert summary[order.customer_id][order.product_id] == summary_by_id[order.customer_id][order.product_id] + order.quantity
+
+        sparse.purchase_summary_by_id(forced_refreshed=True)
+    finally:
+        set_metrics_sink(None)
+
+    assert (sparse.version, registry.counters["purchase_summary.build_matrix.calls"]) == (version + 2, 3)
@@ -0,0 +1,129 @@
+from src.model import ProductCategory
+from src.streaming import ApproximatePurchaseAnalytics, PurchaseSketches, StreamingPurchaseAnalytics
+from src.repository import (
+    PurchaseSummaryRepository,
+    CustomerDataRepository,
+    ProductDataRepository,
+    OrderDataRepository
+)
+from src.service import PurchasesSummaryService
+from src.file_service import OrderJsonFileReader
+from src.validator import OrderDataDictValidator
+from src.converter import OrderConverter
+from unittest.mock import MagicMock
+
+
+def test_streaming_analytics_matches_service(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that one-pass streaming analytics gives the same metrics as the service.
+
+    Asserts:
+        - Every service metric, including the spending and quantity quantiles, is reproduced
+          from the streaming aggregates.
+        - Orders with invalid references are counted and skipped.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    service = PurchasesSummaryService(
+        repository=PurchaseSummaryRepository(customer_repo, product_repo, order_repo)
+    )
+    analytics = StreamingPurchaseAnalytics(
+        customer_repo=customer_repo,
+        product_repo=product_repo,
+        order_reader=OrderJsonFileReader(),
+        order_validator=OrderDataDictValidator(),
+        order_converter=OrderConverter()
+    )
+
+    result = analytics.run(str(order_repo.file_name))
+
+    assert result.orders == len(order_repo.get_data())
+    assert result.dangling_orders > 0
+    assert result.calculate_avarage_spending_per_customer() == service.calculate_avarage_spending_per_customer()
+    assert set(result.find_most_popular_products()) == set(service.find_most_popular_products())
+    assert result.find_highest_and_lowest_spenders() == service.find_highest_and_lowest_spenders()
+    assert result.spending_quantiles() == service.spending_quantiles()
+    assert result.order_quantity_quantiles() == service.order_quantity_quantiles()
+
+
+def test_streaming_analytics_does_not_load_order_repository(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that orders are consumed from the reader stream and never read as a whole.
+
+    Asserts:
+        - `read` of the order reader is never called.
+        - Invalid orders are counted.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    reader = MagicMock()
+    reader.stream.return_value = iter([
+        {"id": 1, "customer_id": 1, "product_id": 1, "quantity": 2, "discount": "0.1", "shipping_method": "Standard"},
+        {"id": 2, "customer_id": 1, "product_id": 1, "quantity": 2, "discount": "7", "shipping_method": "Standard"}
+    ])
+    analytics = StreamingPurchaseAnalytics(
+        customer_repo=customer_repo,
+        product_repo=product_repo,
+        order_reader=reader,
+        order_validator=OrderDataDictValidator(),
+        order_converter=OrderConverter()
+    )
+
+    result = analytics.run("orders.json")
+
+    reader.read.assert_not_called()
+    assert result.orders == 2
+    assert result.invalid_orders == 1
+    assert result.customer_quantities == {1: 2}
+
+
+def test_approximate_analytics_close_to_exact(
+        generated_repositories: tuple[CustomerDataRepository, ProductDataRepository, OrderDataRepository]) -> None:
+    """
+    Test that sketched popularity and distinct counts are close to the exact values.
+
+    Asserts:
+        - The most popular product matches the service and its quantity is within the error bound.
+        - Distinct customers per product and per category are within three standard errors.
+        - Sketches of two slices merge into the sketches of the whole stream.
+    """
+    customer_repo, product_repo, order_repo = generated_repositories
+    service = PurchasesSummaryService(
+        repository=PurchaseSummaryRepository(customer_repo, product_repo, order_repo)
+    )
+    analytics = ApproximatePurchaseAnalytics(
+        product_repo=product_repo,
+        order_reader=OrderJsonFileReader(),
+        order_validator=OrderDataDictValidator(),
+        order_converter=OrderConverter(),
+        epsilon=0.01
+    )
+
+    sketches = analytics.run(str(order_repo.file_name))
+
+    products = {product.id: product for product in product_repo.get_data()}
+    quantities: dict[int, int] = {}
+    product_buyers: dict[int, set[int]] = {}
+    category_buyers: dict[ProductCategory, set[int]] = {}
+    for order in order_repo.get_data():
+        if order.product_id in products:
+            quantities[order.product_id] = quantities.get(order.product_id, 0) + order.quantity
+            product_buyers.setdefault(order.product_id, set()).add(order.customer_id)
+            category_buyers.setdefault(products[order.product_id].category, set()).add(order.customer_id)
+
+    top_id, top_quantity = sketches.top_products(1)[0]
+    assert products[top_id] in service.find_most_popular_products()
+    assert quantities[top_id] <= top_quantity <= quantities[top_id] + 0.01 * sketches.product_quantities.total
+    for product_id, buyers in product_buyers.items():
+        assert abs(sketches.distinct_customers(product_id) - len(buyers)) <= 3 * 0.02 * len(buyers) + 1
+    for category, count in sketches.distinct_customers_by_category().items():
+        assert abs(count - len(category_buyers[category])) <= 3 * 0.02 * len(category_buyers[category]) + 1
+
+    halves = PurchaseSketches(epsilon=0.01), PurchaseSketches(epsilon=0.01)
+    for position, order in enumerate(order_repo.get_data()):
+        if order.product_id in products:
+            halves[position % 2].add(order.customer_id, order.product_id,
+                                     products[order.product_id].category, order.quantity)
+    merged = halves[0].merge(halves[1])
+    assert merged.top_products(1)[0][0] == top_id
+    assert merged.distinct_customers_by_category() == sketches.distinct_customers_by_category()
@@ -8,6 +8,9 @@ from src.model import (
 from decimal import Decimal
 from enum import Enum
 from email_validator import EmailNotValidError
+from pathlib import Path
+import subprocess
+import sys
 
 @pytest.mark.parametrize(
     "value, expected",
@@ -296,3 +299,50 @@ def test_has_required_keys_with_object(data, keys, expected):
     """
     validator = Validator()
     assert validator.has_required_keys(data, keys) == expected
+
+@pytest.mark.parametrize("validator, data, expected", [
+    (ProductDataDictValidator(), {"id": 1, "name": "AA", "category": "Books", "price": "1.12"}, None),
+    (ProductDataDictValidator(), {"id": 2, "name": "BB", "category": "Books", "price": "abc"}, "non_positive_price"),
+    (ProductDataDictValidator(), {"id": 3, "name": "CC"}, "missing_keys:category,price"),
+    (ProductDataDictValidator(), {"id": 4, "name": "DD", "category": "Books", "price": "NaN"}, "non_positive_price"),
+    (ProductDataDictValidator(), {"id": 5, "name": "EE", "category": "Books", "price": "-inf"}, "non_positive_price"),
+    (CustomerDataDictValidator(), {"id": 1, "first_name": "J", "last_name": "JJ", "age": 86, "email": "j@gmail.com"},
+     "age_out_of_range"),
+    (OrderDataDictValidator(required_fields=["discount"]), {"discount": "1.5"}, "discount_out_of_range"),
+    (OrderDataDictValidator(required_fields=["discount"]), {"discount": "abc"}, "discount_out_of_range"),
+    (OrderDataDictValidator(required_fields=["discount"]), {"discount": "NaN"}, "discount_out_of_range"),
+    (OrderDataDictValidator(required_fields=["discount"]), {"discount": "inf"}, "discount_out_of_range"),
+    (OrderDataDictValidator(required_fields=["discount"]), {"discount": "0.5"}, None)
+])
+def test_rejection_reason(validator: Validator, data: dict, expected: str | None,
+                          caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test the `rejection_reason` method of the data validators.
+
+    Args:
+        validator (Validator): The validator to test.
+        data (dict): The data to validate.
+        expected (str | None): The expected failing rule.
+
+    Asserts:
+        - The returned rule matches the expected value and agrees with `validate`.
+        - Nothing is logged.
+    """
+    assert validator.rejection_reason(data) == expected
+    assert not caplog.records
+    assert validator.validate(data) == (expected is None)
+
+
+def test_import_does_not_load_email_validator() -> None:
+    """
+    Test that importing `src.validator` defers the `email_validator` import to first use.
+
+    Asserts:
+        - A fresh interpreter importing `src.validator` has not loaded `email_validator`.
+    """
+    root = Path(__file__).resolve().parents[2]
+    completed = subprocess.run(
+        [sys.executable, "-c", "import sys, src.validator; print('email_validator' in sys.modules)"],
+        cwd=root, capture_output=True, text=True, check=True
+    )
+    assert completed.stdout.strip() == "False"